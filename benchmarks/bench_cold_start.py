@@ -0,0 +1,96 @@
+"""
+Benchmark cold-start time: package import plus client construction in a fresh interpreter.
+
+Each run starts a new Python process that imports the REST and stream clients,
+builds an APIClient from a pre-seeded token file and a headless StreamClient,
+and reports how long each step took and which heavy optional modules
+(tkinter, pandas, tqdm, aiohttp) were loaded along the way.
+
+Usage:
+    python benchmarks/bench_cold_start.py [--runs 5] [--budget-ms 400] [--save]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from datetime import datetime, timedelta
+
+from harness import add_common_arguments, finish
+
+HEAVY_MODULES = ("tkinter", "pandas", "tqdm", "aiohttp", "numpy")
+
+CHILD = """
+import json, sys, time
+started = time.perf_counter()
+from pythonic_schwab_api.api_client import APIClient
+from pythonic_schwab_api.stream_client import StreamClient
+from pythonic_schwab_api.token_store import JSONFileTokenStore
+imported = time.perf_counter()
+client = APIClient("BENCH", token_store=JSONFileTokenStore(sys.argv[1]))
+StreamClient(client)
+constructed = time.perf_counter()
+client.close()
+print(json.dumps({
+    "import_ms": (imported - started) * 1000,
+    "construct_ms": (constructed - imported) * 1000,
+    "heavy_modules": [name for name in sys.argv[2].split(",") if name in sys.modules]
+}))
+"""
+
+
+def seed_token(path):
+    """Write a token file that stays valid for the duration of the benchmark."""
+    token = {"access_token": "bench", "refresh_token": "bench", "expires_in": 1800,
+             "expires_at": (datetime.now() + timedelta(seconds=1800)).isoformat()}
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(token, f)
+
+
+def run(runs=5):
+    """
+    Measure cold start in ``runs`` fresh interpreters.
+
+    Returns:
+        dict: Median import, construction and total times in milliseconds, and
+        the heavy modules that were imported.
+    """
+    samples = []
+    with tempfile.TemporaryDirectory() as directory:
+        token_path = os.path.join(directory, "token.json")
+        seed_token(token_path)
+        for _ in range(runs):
+            output = subprocess.run([sys.executable, "-c", CHILD, token_path, ",".join(HEAVY_MODULES)],
+                                    capture_output=True, text=True, check=True, cwd=directory,
+                                    env={**os.environ, "PYTHONPATH": os.pathsep.join(sys.path)})
+            samples.append(json.loads(output.stdout.strip().splitlines()[-1]))
+    import_ms = statistics.median(sample["import_ms"] for sample in samples)
+    construct_ms = statistics.median(sample["construct_ms"] for sample in samples)
+    return {
+        "import_ms": import_ms,
+        "construct_ms": construct_ms,
+        "total_ms": import_ms + construct_ms,
+        "heavy_modules": sorted({name for sample in samples for name in sample["heavy_modules"]})
+    }
+
+
+def main():
+    """Parse arguments, run the benchmark and exit non-zero if the budget is exceeded."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=400.0)
+    args = add_common_arguments(parser).parse_args()
+    results = run(args.runs)
+    print(f"import: {results['import_ms']:.1f} ms | construct: {results['construct_ms']:.1f} ms | "
+          f"total: {results['total_ms']:.1f} ms (budget {args.budget_ms:.0f} ms)")
+    print(f"heavy modules loaded: {', '.join(results['heavy_modules']) or 'none'}")
+    finish("cold_start", results, args)
+    if results["total_ms"] > args.budget_ms or results["heavy_modules"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""
+Benchmark JSON decode time of the available codec backends on option chain payloads.
+
+Builds the mock server's synthetic /chains response and times decoding its
+raw bytes with every installed backend from pythonic_schwab_api.json_codec.
+
+Usage:
+    python benchmarks/bench_json_codec.py [--expirations 40] [--strikes 150] [--repeat 5] [--save]
+"""
+
+import argparse
+import json
+
+from harness import add_common_arguments, best_time, finish
+from pythonic_schwab_api.json_codec import available_backends, get_codec
+from pythonic_schwab_api.mock_server import synthetic_chain
+
+
+def run(expirations=40, strikes=150, repeat=5):
+    """
+    Time decoding and encoding a synthetic chain with every installed backend.
+
+    Returns:
+        dict: Payload size and per-backend decode/encode times in milliseconds.
+    """
+    chain = synthetic_chain(expirations=expirations, strikes=strikes)
+    payload = json.dumps(chain).encode()
+    results = {"payload_bytes": len(payload), "backends": {}}
+    for name in available_backends():
+        codec = get_codec(name)
+        results["backends"][name] = {
+            "decode_ms": best_time(lambda codec=codec: codec.loads(payload), repeat) * 1000,
+            "encode_ms": best_time(lambda codec=codec: codec.dumps(chain), repeat) * 1000
+        }
+    return results
+
+
+def main():
+    """Parse arguments, run the benchmark and print a summary table."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--expirations", type=int, default=40)
+    parser.add_argument("--strikes", type=int, default=150)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = add_common_arguments(parser).parse_args()
+    results = run(args.expirations, args.strikes, args.repeat)
+    baseline = results["backends"]["json"]["decode_ms"]
+    print(f"Payload: {results['payload_bytes'] / 1e6:.1f} MB")
+    print(f"{'backend':<10}{'decode ms':>12}{'encode ms':>12}{'speedup':>10}")
+    for name, timing in results["backends"].items():
+        print(f"{name:<10}{timing['decode_ms']:>12.1f}{timing['encode_ms']:>12.1f}"
+              f"{baseline / timing['decode_ms']:>9.1f}x")
+    finish("json_codec", results, args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Benchmark option chain handling: parse time and memory.
+
+Times decoding a synthetic /chains payload with the client's JSON codec and
+records the peak memory the decoded chain takes, does the same for the
+columnar OptionChain built from the raw bytes and parsed incrementally from
+64 KB chunks as a streamed response would be, then times fetching the same
+chain end to end from the mock server through make_request (which includes
+the server generating and encoding it).
+
+Usage:
+    python benchmarks/bench_option_chain.py [--expirations 40] [--strikes 150] [--repeat 5] [--save]
+"""
+
+import argparse
+import json
+
+from harness import add_common_arguments, finish, measure, mock_client, peak_memory, summarize
+from pythonic_schwab_api.mock_server import synthetic_chain
+from pythonic_schwab_api.option_chain import STREAM_CHUNK_SIZE, OptionChain
+
+
+def run(expirations=40, strikes=150, repeat=5):
+    """
+    Measure chain decode and fetch times and decode memory, as dicts and as an OptionChain.
+
+    Args:
+        expirations (int, optional): Expiration dates in the chain.
+        strikes (int, optional): Strikes per expiration.
+        repeat (int, optional): Timed repetitions.
+
+    Returns:
+        dict: Payload size, contract count, decode/columnar/fetch timings in milliseconds and peak memory.
+    """
+    with mock_client() as (_, client):
+        payload = json.dumps(synthetic_chain(expirations=expirations, strikes=strikes)).encode()
+        codec = client.json_codec
+        chain, peak = peak_memory(lambda: codec.loads(payload))
+
+        def columnar():
+            return len(OptionChain.from_bytes(payload, codec))
+
+        _, columnar_peak = peak_memory(columnar)
+
+        def streamed():
+            chunks = (payload[i:i + STREAM_CHUNK_SIZE] for i in range(0, len(payload), STREAM_CHUNK_SIZE))
+            return len(OptionChain.from_stream(chunks))
+
+        _, streamed_peak = peak_memory(streamed)
+        url = f"{client.config.market_data_base_url}/chains"
+        params = {"symbol": "SPX", "strikeCount": strikes, "expirations": expirations}
+        return {
+            "codec": codec.name,
+            "payload_bytes": len(payload),
+            "contracts": chain["numberOfContracts"],
+            "decode_ms": summarize(measure(lambda: codec.loads(payload), repeat)),
+            "decode_peak_bytes": peak,
+            "columnar_ms": summarize(measure(columnar, repeat)),
+            "columnar_peak_bytes": columnar_peak,
+            "streamed_ms": summarize(measure(streamed, repeat)),
+            "streamed_peak_bytes": streamed_peak,
+            "columnar_bytes": OptionChain.from_response(chain).nbytes,
+            "fetch_ms": summarize(measure(lambda: client.make_request(url, params=params), repeat))
+        }
+
+
+def main():
+    """Parse arguments, run the benchmark and print a summary."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--expirations", type=int, default=40)
+    parser.add_argument("--strikes", type=int, default=150)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = add_common_arguments(parser).parse_args()
+    results = run(args.expirations, args.strikes, args.repeat)
+    print(f"{results['contracts']} contracts, {results['payload_bytes'] / 1e6:.1f} MB payload ({results['codec']})")
+    print(f"decode {results['decode_ms']['best']:.1f} ms (median {results['decode_ms']['median']:.1f}) | "
+          f"peak memory {results['decode_peak_bytes'] / 1e6:.1f} MB | "
+          f"fetch {results['fetch_ms']['best']:.1f} ms (median {results['fetch_ms']['median']:.1f})")
+    print(f"columnar {results['columnar_ms']['best']:.1f} ms | peak memory "
+          f"{results['columnar_peak_bytes'] / 1e6:.1f} MB | retained {results['columnar_bytes'] / 1e6:.1f} MB")
+    print(f"streamed {results['streamed_ms']['best']:.1f} ms | peak memory "
+          f"{results['streamed_peak_bytes'] / 1e6:.1f} MB")
+    finish("option_chain", results, args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+Benchmark the REST client: per-request overhead and requests/sec by concurrency.
+
+Overhead is the time make_request adds on top of a bare requests.Session GET
+of the same URL against the mock server with no injected latency. Throughput
+is measured with the mock server adding a fixed latency per response, for
+APIClient driven from a thread pool and for AsyncAPIClient driven by
+asyncio.gather, at each concurrency level.
+
+Usage:
+    python benchmarks/bench_rest.py [--requests 500] [--latency 0.005] [--concurrency 1 4 16 64] [--save]
+"""
+
+import argparse
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from harness import add_common_arguments, finish, mock_client, print_table
+from pythonic_schwab_api.async_api_client import AsyncAPIClient
+
+
+def client_overhead(client, n):
+    """Return the mean seconds make_request adds over a bare GET, and both per-request times."""
+    url = f"{client.config.market_data_base_url}/quotes"
+    headers = {"Authorization": f"Bearer {client.token_info['access_token']}"}
+    with requests.Session() as session:
+        session.get(url, params={"symbols": "WARM"}, headers=headers)
+        start = time.perf_counter()
+        for index in range(n):
+            session.get(url, params={"symbols": f"S{index}"}, headers=headers).json()
+        bare = (time.perf_counter() - start) / n
+    client.make_request(url, params={"symbols": "WARM"})
+    start = time.perf_counter()
+    for index in range(n):
+        client.make_request(url, params={"symbols": f"S{index}"})
+    wrapped = (time.perf_counter() - start) / n
+    return {"bare_us": bare * 1e6, "client_us": wrapped * 1e6, "overhead_us": (wrapped - bare) * 1e6}
+
+
+def sync_throughput(client, n, concurrency):
+    """Return requests/sec for n distinct quote requests issued from ``concurrency`` threads."""
+    url = f"{client.config.market_data_base_url}/quotes"
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        start = time.perf_counter()
+        list(pool.map(lambda index: client.make_request(url, params={"symbols": f"S{index}"}), range(n)))
+        return n / (time.perf_counter() - start)
+
+
+async def async_throughput(client, n, concurrency):
+    """Return requests/sec for n distinct quote requests with at most ``concurrency`` in flight."""
+    url = f"{client.config.market_data_base_url}/quotes"
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(index):
+        async with semaphore:
+            return await client.make_request(url, params={"symbols": f"S{index}"})
+
+    await client.make_request(url, params={"symbols": "WARM"})
+    start = time.perf_counter()
+    await asyncio.gather(*(one(index) for index in range(n)))
+    elapsed = time.perf_counter() - start
+    await client.close()
+    return n / elapsed
+
+
+def run(count=500, latency=0.005, concurrency=(1, 4, 16, 64)):
+    """
+    Measure client overhead and throughput against the mock server.
+
+    Args:
+        count (int, optional): Requests per measurement.
+        latency (float, optional): Mock server latency per response during the throughput runs, seconds.
+        concurrency (tuple, optional): Concurrency levels to measure.
+
+    Returns:
+        dict: Overhead in microseconds and requests/sec per client and concurrency level.
+    """
+    results = {"latency_s": latency, "throughput": []}
+    with mock_client() as (server, client):
+        results["overhead"] = client_overhead(client, count)
+        server.latency = latency
+        for level in concurrency:
+            results["throughput"].append({"client": "sync", "concurrency": level,
+                                          "rps": sync_throughput(client, count, level)})
+    for level in concurrency:
+        with mock_client(AsyncAPIClient, latency=latency) as (_, client):
+            client.max_connections = max(level, 1)
+            rps = asyncio.run(async_throughput(client, count, level))
+        results["throughput"].append({"client": "async", "concurrency": level, "rps": rps})
+    return results
+
+
+def main():
+    """Parse arguments, run the benchmark and print a summary."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", dest="count", type=int, default=500)
+    parser.add_argument("--latency", type=float, default=0.005, help="Mock server latency per response, seconds")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16, 64])
+    args = add_common_arguments(parser).parse_args()
+    results = run(args.count, args.latency, tuple(args.concurrency))
+    overhead = results["overhead"]
+    print(f"bare GET {overhead['bare_us']:.0f} us | make_request {overhead['client_us']:.0f} us | "
+          f"overhead {overhead['overhead_us']:.0f} us per request")
+    print(f"throughput with {results['latency_s'] * 1000:.1f} ms server latency:")
+    print_table(results["throughput"], [("client", "client", ""), ("concurrency", "concurrency", "d"),
+                                        ("rps", "requests/s", ".0f")])
+    finish("rest", results, args)
+
+
+if __name__ == "__main__":
+    main()
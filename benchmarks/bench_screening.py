@@ -0,0 +1,64 @@
+"""
+Benchmark quote screening on large universes.
+
+Builds a /quotes response for a synthetic universe (5,000 symbols by default)
+and times algo_example_script.find_trades_from_quotes on it, the
+quote-to-DataFrame path used by the example algorithm, along with the peak
+memory it allocates and the time spent building the columnar QuoteSnapshot.
+
+Usage:
+    python benchmarks/bench_screening.py [--symbols 5000] [--repeat 3] [--save]
+"""
+
+import argparse
+
+from harness import add_common_arguments, finish, measure, peak_memory, summarize
+from pythonic_schwab_api.algo_example_script import find_trades_from_quotes
+from pythonic_schwab_api.mock_server import synthetic_quote
+from pythonic_schwab_api.quote_snapshot import QuoteSnapshot
+
+
+def synthetic_universe(symbols):
+    """Return a /quotes response for ``symbols`` synthetic symbols."""
+    return {f"S{index:05d}": synthetic_quote(f"S{index:05d}") for index in range(symbols)}
+
+
+def run(symbols=5000, repeat=3):
+    """
+    Measure screening time and memory.
+
+    Args:
+        symbols (int, optional): Universe size.
+        repeat (int, optional): Timed repetitions.
+
+    Returns:
+        dict: Screening and snapshot build times in milliseconds, peak memory and the number of matches.
+    """
+    quotes = synthetic_universe(symbols)
+    find_trades_from_quotes(quotes)  # warm up the pandas import
+    matches, peak = peak_memory(lambda: find_trades_from_quotes(quotes))
+    return {
+        "symbols": symbols,
+        "matches": 0 if matches is None else len(matches),
+        "screen_ms": summarize(measure(lambda: find_trades_from_quotes(quotes), repeat)),
+        "snapshot_ms": summarize(measure(lambda: QuoteSnapshot.from_quotes(quotes), repeat)),
+        "peak_bytes": peak
+    }
+
+
+def main():
+    """Parse arguments, run the benchmark and print a summary."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--symbols", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = add_common_arguments(parser).parse_args()
+    results = run(args.symbols, args.repeat)
+    print(f"{results['symbols']} symbols: {results['screen_ms']['best']:.1f} ms "
+          f"(median {results['screen_ms']['median']:.1f}), snapshot build {results['snapshot_ms']['best']:.1f} ms | "
+          f"peak memory {results['peak_bytes'] / 1e6:.1f} MB | "
+          f"{results['matches']} matches")
+    finish("screening", results, args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""
+Benchmark stream message handling: messages/sec decoded and dispatched.
+
+The offline run decodes pre-encoded LEVELONE_EQUITIES data frames with the
+client's JSON codec and passes them to StreamClient.handle_message, with its
+console output discarded. The live run subscribes to the mock server's
+websocket streamer and counts the frames and quote updates received and
+dispatched in a fixed time window.
+
+Usage:
+    python benchmarks/bench_stream.py [--messages 5000] [--keys 100] [--seconds 3] [--save]
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import time
+
+import websockets
+
+from harness import add_common_arguments, finish, mock_client
+from pythonic_schwab_api.mock_server import level_one_content, synthetic_quote
+from pythonic_schwab_api.stream_client import StreamClient
+
+
+def synthetic_frames(messages, keys):
+    """Return ``messages`` encoded data frames, each carrying updates for ``keys`` symbols."""
+    symbols = [f"S{index:04d}" for index in range(keys)]
+    frames = []
+    for tick in range(messages):
+        content = [level_one_content(synthetic_quote(symbol, tick)) for symbol in symbols]
+        frames.append(json.dumps({"data": [{"service": "LEVELONE_EQUITIES", "timestamp": tick,
+                                            "command": "SUBS", "content": content}]}))
+    return frames
+
+
+def offline_dispatch(stream, frames):
+    """Return the seconds taken to decode and dispatch every frame."""
+    async def dispatch():
+        loads = stream.json_codec.loads
+        start = time.perf_counter()
+        for frame in frames:
+            await stream.handle_message(loads(frame))
+        return time.perf_counter() - start
+    with contextlib.redirect_stdout(io.StringIO()):
+        return asyncio.run(dispatch())
+
+
+async def live_dispatch(stream, url, keys, seconds):
+    """Subscribe to ``keys`` symbols on the streamer and return (frames, updates) dispatched in ``seconds``."""
+    frames = updates = 0
+    async with websockets.connect(url, max_size=None) as websocket:
+        await websocket.send(stream.json_codec.dumps({"requests": [{
+            "service": "LEVELONE_EQUITIES", "command": "SUBS", "requestid": "1",
+            "parameters": {"keys": ",".join(f"S{index:04d}" for index in range(keys)), "fields": "0,1,2,3"}}]}))
+        deadline = time.perf_counter() + seconds
+        while (remaining := deadline - time.perf_counter()) > 0:
+            try:
+                message = stream.json_codec.loads(await asyncio.wait_for(websocket.recv(), remaining))
+            except asyncio.TimeoutError:
+                break
+            await stream.handle_message(message)
+            for data in message.get("data", []):
+                frames += 1
+                updates += len(data["content"])
+    return frames, updates
+
+
+def run(messages=5000, keys=100, seconds=3.0):
+    """
+    Measure offline and live stream dispatch rates.
+
+    Args:
+        messages (int, optional): Frames decoded in the offline run.
+        keys (int, optional): Symbols per frame.
+        seconds (float, optional): Length of the live run.
+
+    Returns:
+        dict: Frames/sec and quote updates/sec for both runs.
+    """
+    frames = synthetic_frames(messages, keys)
+    with mock_client(stream_interval=0.001) as (server, client):
+        stream = StreamClient(client)
+        elapsed = offline_dispatch(stream, frames)
+        with contextlib.redirect_stdout(io.StringIO()):
+            live_frames, live_updates = asyncio.run(live_dispatch(stream, server.stream_url, keys, seconds))
+    return {
+        "codec": client.json_codec.name,
+        "keys": keys,
+        "offline": {"frames": messages, "frame_bytes": len(frames[0]), "frames_per_s": messages / elapsed,
+                    "updates_per_s": messages * keys / elapsed},
+        "live": {"frames": live_frames, "frames_per_s": live_frames / seconds,
+                 "updates_per_s": live_updates / seconds}
+    }
+
+
+def main():
+    """Parse arguments, run the benchmark and print a summary."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--messages", type=int, default=5000)
+    parser.add_argument("--keys", type=int, default=100)
+    parser.add_argument("--seconds", type=float, default=3.0)
+    args = add_common_arguments(parser).parse_args()
+    results = run(args.messages, args.keys, args.seconds)
+    for mode in ("offline", "live"):
+        stats = results[mode]
+        print(f"{mode:<8} {stats['frames_per_s']:>10.0f} frames/s {stats['updates_per_s']:>12.0f} updates/s "
+              f"({results['keys']} keys per frame, {results['codec']})")
+    finish("stream", results, args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,187 @@
+"""
+Shared helpers for the benchmark scripts.
+
+Every benchmark exposes ``run(**options) -> dict`` and a ``main()`` built on
+this module: timings are taken with best_time()/measure(), memory with
+peak_memory(), clients are pointed at a local MockSchwabServer with
+mock_client(), and ``--save`` stores the results in
+benchmarks/results/<git revision>.json so runs can be compared across commits
+(see run_all.py --compare).
+"""
+
+import contextlib
+import datetime
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from pythonic_schwab_api import config
+from pythonic_schwab_api.mock_server import MockSchwabServer
+from pythonic_schwab_api.rate_limiter import RateLimiter
+from pythonic_schwab_api.token_store import JSONFileTokenStore
+
+RESULTS_DIR = Path(__file__).resolve().with_name("results")
+REPO_DIR = Path(__file__).resolve().parent.parent
+
+
+def best_time(func, repeat):
+    """Return the fastest of ``repeat`` timed calls of func, in seconds."""
+    return min(measure(func, repeat))
+
+
+def measure(func, repeat):
+    """Return the durations of ``repeat`` timed calls of func, in seconds."""
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        durations.append(time.perf_counter() - start)
+    return durations
+
+
+def summarize(durations, scale=1000):
+    """Return best, median and mean of a list of durations, scaled (milliseconds by default)."""
+    return {"best": min(durations) * scale, "median": statistics.median(durations) * scale,
+            "mean": statistics.fmean(durations) * scale}
+
+
+def peak_memory(func):
+    """
+    Call func while tracing allocations.
+
+    Returns:
+        tuple: (func's result, peak bytes allocated during the call).
+    """
+    tracemalloc.start()
+    try:
+        result = func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return result, peak
+
+
+def git_revision():
+    """Return the short revision of the working tree, suffixed with '-dirty' if it has local changes."""
+    try:
+        revision = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_DIR,
+                                  capture_output=True, text=True, check=True).stdout.strip()
+        dirty = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=REPO_DIR,
+                               capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+    return f"{revision}-dirty" if dirty else revision
+
+
+def environment():
+    """Describe the machine and interpreter the results were taken on."""
+    return {"revision": git_revision(), "python": platform.python_version(),
+            "platform": platform.platform(), "machine": platform.machine(), "cpus": os.cpu_count(),
+            "timestamp": datetime.datetime.now().isoformat(timespec="seconds")}
+
+
+def load_results(revision, results_dir=RESULTS_DIR):
+    """
+    Load the results stored for a revision.
+
+    Returns:
+        dict: Results keyed by benchmark name, plus an 'environment' entry; empty if none were stored.
+    """
+    path = Path(results_dir) / f"{revision}.json"
+    if not path.exists():
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_results(name, results, results_dir=RESULTS_DIR):
+    """
+    Store a benchmark's results under the current revision, merging with earlier runs of other benchmarks.
+
+    Returns:
+        Path: The results file.
+    """
+    env = environment()
+    stored = load_results(env["revision"], results_dir)
+    stored["environment"] = env
+    stored[name] = results
+    path = Path(results_dir) / f"{env['revision']}.json"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(stored, f, indent=2, sort_keys=True)
+    return path
+
+
+def add_common_arguments(parser):
+    """Add the --save option shared by every benchmark script."""
+    parser.add_argument("--save", action="store_true",
+                        help=f"Store the results in {RESULTS_DIR.name}/<git revision>.json")
+    return parser
+
+
+def finish(name, results, args):
+    """Save the results if --save was given."""
+    if args.save:
+        print(f"Results saved to {save_results(name, results)}")
+
+
+@contextlib.contextmanager
+def mock_client(client_class=None, **server_options):
+    """
+    Start a MockSchwabServer and yield a client wired to it.
+
+    The client uses sandbox URLs, a throwaway token store and an effectively
+    unlimited rate limit, so the benchmark measures the client rather than
+    the throttle.
+
+    Args:
+        client_class (type, optional): APIClient or a subclass. Defaults to APIClient.
+        **server_options: Passed to MockSchwabServer (latency, error_rates, ...).
+
+    Yields:
+        tuple: (MockSchwabServer, client).
+    """
+    if client_class is None:
+        from pythonic_schwab_api.api_client import APIClient  # pylint: disable=import-outside-toplevel
+        client_class = APIClient
+    sandbox = config.SANDBOX
+    config.SANDBOX = True
+    server = MockSchwabServer(**server_options)
+    server.start()
+    try:
+        with tempfile.TemporaryDirectory() as directory:
+            token = server.issue_token()
+            store = JSONFileTokenStore(os.path.join(directory, "token.json"))
+            store.save(token)
+            client = client_class("BENCH", token_store=store, token=token)
+            client.config.rate_limit = {"requests": 10 ** 9, "period": 1}
+            client.config.endpoint_rate_limits = {}
+            client.rate_limiter = RateLimiter(client.config)
+            try:
+                yield server, client
+            finally:
+                closed = client.close()
+                if closed is not None:  # AsyncAPIClient.close() is a coroutine
+                    import asyncio  # pylint: disable=import-outside-toplevel
+                    asyncio.run(closed)
+    finally:
+        server.stop()
+        config.SANDBOX = sandbox
+
+
+def print_table(rows, columns):
+    """Print rows (dicts) as a fixed-width table with the given (key, header, format) columns."""
+    print("".join(f"{header:>14}" for _, header, _ in columns))
+    for row in rows:
+        print("".join(f"{format(row[key], spec):>14}" for key, _, spec in columns))
+
+
+if __name__ == "__main__":
+    sys.exit("harness.py is imported by the benchmark scripts; run one of them or run_all.py.")
@@ -0,0 +1,77 @@
+"""
+Run the benchmark suite, store the results per commit and compare against another commit.
+
+Results are written to benchmarks/results/<git revision>.json. With
+--compare REV, every numeric result is printed next to the value stored for
+REV with the ratio between them (for rates, above 1.0 is better; for times
+and sizes, below 1.0 is better).
+
+Usage:
+    python benchmarks/run_all.py [--quick] [--only rest stream ...] [--compare REV]
+"""
+
+import argparse
+import importlib
+
+from harness import environment, load_results, save_results
+
+BENCHMARKS = {
+    "cold_start": ("bench_cold_start", {"runs": 5}, {"runs": 2}),
+    "json_codec": ("bench_json_codec", {}, {"expirations": 10, "repeat": 2}),
+    "rest": ("bench_rest", {}, {"count": 100, "concurrency": (1, 16)}),
+    "stream": ("bench_stream", {}, {"messages": 500, "seconds": 1.0}),
+    "option_chain": ("bench_option_chain", {}, {"expirations": 10, "repeat": 2}),
+    "screening": ("bench_screening", {}, {"symbols": 1000, "repeat": 1})
+}
+
+
+def flatten(results, prefix=""):
+    """Flatten nested results into {'a.b.c': number}, indexing lists by position."""
+    flat = {}
+    items = results.items() if isinstance(results, dict) else enumerate(results)
+    for key, value in items:
+        name = f"{prefix}{key}"
+        if isinstance(value, (dict, list)):
+            flat.update(flatten(value, f"{name}."))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            flat[name] = value
+    return flat
+
+
+def compare(current, baseline):
+    """Print every numeric result next to its baseline value and the ratio between them."""
+    for name in current:
+        if name == "environment" or name not in baseline:
+            continue
+        before = flatten(baseline[name])
+        for key, value in flatten(current[name]).items():
+            if key in before and before[key]:
+                metric = f"{name}.{key}"
+                print(f"{metric:<60} {before[key]:>14.3f} {value:>14.3f} {value / before[key]:>8.2f}x")
+
+
+def main():
+    """Run the selected benchmarks, save their results and optionally compare them."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--quick", action="store_true", help="Use small sizes for a fast smoke run")
+    parser.add_argument("--only", nargs="+", choices=sorted(BENCHMARKS), help="Benchmarks to run")
+    parser.add_argument("--compare", metavar="REV", help="Revision whose stored results to compare against")
+    args = parser.parse_args()
+    current = {"environment": environment()}
+    for name in args.only or BENCHMARKS:
+        module_name, options, quick_options = BENCHMARKS[name]
+        print(f"running {name}...")
+        current[name] = importlib.import_module(module_name).run(**(quick_options if args.quick else options))
+        path = save_results(name, current[name])
+    print(f"Results saved to {path}")
+    if args.compare:
+        baseline = load_results(args.compare)
+        if not baseline:
+            print(f"No stored results for {args.compare}")
+            return
+        print(f"{'metric':<60} {args.compare:>14} {current['environment']['revision']:>14} {'ratio':>9}")
+        compare(current, baseline)
+
+
+if __name__ == "__main__":
+    main()
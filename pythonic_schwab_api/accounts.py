@@ -17,11 +17,18 @@ Usage example:
         start_date=datetime.datetime(2023, 1, 1), 
         end_date=datetime.datetime(2023, 1, 31)
         )
+    for account_hash, transaction in accounts.iter_transactions(datetime.datetime(2019, 1, 1),
+                                                                datetime.datetime.now()):
+        ...
 """
+import asyncio
 import datetime
 import logging
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from requests.exceptions import RequestException, HTTPError, Timeout
 
+MIN_SPLIT_WINDOW = datetime.timedelta(minutes=1)  # Shortest window split further when a response is full
+
 
 class Accounts:
     """
@@ -34,6 +41,8 @@ class Accounts:
         - get_account: Retrieve detailed information for a specific account using its hash.
         - get_account_transactions: Retrieve transactions for a specific account
         over a specified date range.
+        - iter_transactions: Stream deduplicated transactions of any date range
+        for several accounts, fetching compliant windows concurrently.
     """
     def __init__(self, client):
         """
@@ -43,7 +52,7 @@ class Accounts:
         """
         self.client = client
         self.logger = logging.getLogger(__name__)
-        self.base_url = client.config.ACCOUNTS_BASE_URL
+        self.base_url = client.config.accounts_base_url
 
     def get_account_numbers(self):
         """
@@ -52,7 +61,6 @@ class Accounts:
         :return: A list of account numbers or None if the request fails.
         """
         try:
-            print(f'{self.base_url}/accountNumbers')
             return self.client.make_request(f'{self.base_url}/accountNumbers')
         except (RequestException, HTTPError, ConnectionError, Timeout) as e:
             self.logger.error("Failed to get account numbers: %s", e)
@@ -106,15 +114,199 @@ class Accounts:
                 isinstance(end_date, datetime.datetime)):
             self.logger.error("Invalid date format. Dates must be datetime objects")
             return None
+        try:
+            return self._fetch_window(account_hash, start_date, end_date, types, symbol)
+        except (RequestException, HTTPError, ConnectionError, Timeout) as e:
+            self.logger.error("Failed to get transactions for account %s: %s", account_hash, e)
+            return None
+
+    def _fetch_window(self, account_hash, start_date, end_date, types=None, symbol=None):
+        """Request the transactions of one account and date range, raising on failure."""
         params = {
             'startDate': start_date.isoformat(),
             'endDate': end_date.isoformat(),
             'types': types,
             'symbol': symbol
         }
+        return self.client.make_request(f'{self.base_url}/{account_hash}/transactions', params=params)
+
+    def _sync_tasks(self, start_date, end_date, account_hashes):
+        """Split a date range into (account hash, start, end) windows no longer than the API allows."""
+        if not (isinstance(start_date, datetime.datetime) and
+                isinstance(end_date, datetime.datetime)):
+            raise ValueError("Invalid date format. Dates must be datetime objects")
+        window = datetime.timedelta(days=self.client.config.transaction_sync['window_days'])
+        windows = []
+        start = start_date
+        while start < end_date:
+            windows.append((start, min(start + window, end_date)))
+            start = windows[-1][1]
+        return [(account_hash, start, end) for account_hash in account_hashes
+                for start, end in windows or [(start_date, end_date)]]
+
+    def _settle_window(self, task, transactions):
+        """
+        Return (transactions, tasks to fetch instead) for a fetched window.
+
+        A response holding max_results transactions may have been cut off, so
+        its window is split in two and both halves are fetched again.
+        """
+        account_hash, start, end = task
+        transactions = transactions or []
+        if len(transactions) >= self.client.config.transaction_sync['max_results']:
+            if end - start > MIN_SPLIT_WINDOW:
+                middle = start + (end - start) / 2
+                self.logger.debug("Transactions of %s from %s to %s hit the result cap, splitting",
+                                  account_hash, start, end)
+                return [], [(account_hash, start, middle), (account_hash, middle, end)]
+            self.logger.warning("Transactions of %s from %s to %s may be truncated", account_hash, start, end)
+        return transactions, []
+
+    @staticmethod
+    def _unseen(seen, account_hash, transactions):
+        """Yield (account hash, transaction) for transactions whose activity ID was not yielded yet."""
+        for transaction in transactions:
+            key = (account_hash, transaction.get('activityId'))
+            if key[1] is None or key not in seen:
+                seen.add(key)
+                yield account_hash, transaction
+
+    def iter_transactions(self, start_date, end_date, account_hashes=None, types=None, symbol=None):
+        """
+        Stream the transactions of one or more accounts over any date range.
+
+        The range is split into windows of at most config.transaction_sync['window_days'],
+        which are fetched concurrently for every account within the rate limit. A
+        window whose response is full is split and refetched, and transactions
+        seen in overlapping windows are yielded once, by activity ID.
+
+        :param start_date: The start date for the transaction retrieval (datetime object).
+        :param end_date: The end date for the transaction retrieval (datetime object).
+        :param account_hashes: Optional; The account hashes to sync. Defaults to every linked account.
+        :param types: Optional; A list of transaction types to filter.
+        :param symbol: Optional; A specific symbol to filter transactions.
+        :return: A generator of (account hash, transaction) tuples, in the order their windows complete.
+        """
+        if account_hashes is None:
+            account_hashes = [account['hashValue'] for account in self.get_account_numbers() or []]
+        tasks = self._sync_tasks(start_date, end_date, account_hashes)
+        seen = set()
+        with ThreadPoolExecutor(max_workers=self.client.config.transaction_sync['max_workers']) as pool:
+            pending = {pool.submit(self._fetch_window, *task, types, symbol): task for task in tasks}
+            try:
+                while pending:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        task = pending.pop(future)
+                        transactions, retry = self._settle_window(task, future.result())
+                        for sub_task in retry:
+                            pending[pool.submit(self._fetch_window, *sub_task, types, symbol)] = sub_task
+                        yield from self._unseen(seen, task[0], transactions)
+            finally:
+                for future in pending:  # stop queued windows if the caller stops iterating early
+                    future.cancel()
+
+
+class AsyncAccounts(Accounts):
+    """
+    Asynchronous variant of Accounts for use with an AsyncAPIClient.
+
+    Every request method is a coroutine with the same arguments and return
+    values as its Accounts counterpart.
+    """
+    # pylint: disable=invalid-overridden-method  # coroutine overrides are what makes this the async variant
+    async def get_account_numbers(self):
+        """
+        Retrieve account numbers associated with the user's profile.
+
+        :return: A list of account numbers or None if the request fails.
+        """
         try:
-            return self.client.make_request(f'{self.base_url}/{account_hash}/transactions',
-                                            params=params)
-        except (RequestException, HTTPError, ConnectionError, Timeout) as e:
+            return await self.client.make_request(f'{self.base_url}/accountNumbers')
+        except self.client.request_errors as e:
+            self.logger.error("Failed to get account numbers: %s", e)
+            return None
+
+    async def get_all_accounts(self, fields=None):
+        """
+        Retrieve detailed information for all linked accounts,
+        optionally filtering the fields.
+
+        :param fields: Optional; A list of fields to filter the account information.
+        :return: A list of account details or None if the request fails.
+        """
+        params = {'fields': fields} if fields else {}
+        try:
+            return await self.client.make_request(f'{self.base_url}', params=params)
+        except self.client.request_errors as e:
+            self.logger.error("Failed to get all accounts: %s", e)
+            return None
+
+    async def get_account(self, account_hash, fields=None):
+        """
+        Retrieve detailed information for a specific account using its hash.
+
+        :param account_hash: The hash of the account to retrieve.
+        :param fields: Optional; A list of fields to filter the account information.
+        :return: Account details or None if the request fails.
+        """
+        if not account_hash:
+            self.logger.error("Account hash is required for getting account details")
+            return None
+        params = {'fields': fields} if fields else {}
+        try:
+            return await self.client.make_request(f'{self.base_url}/{account_hash}', params=params)
+        except self.client.request_errors as e:
+            self.logger.error("Failed to get account %s: %s", account_hash, e)
+            return None
+
+    async def get_account_transactions(self, account_hash, start_date, end_date, types=None, symbol=None):
+        """
+        Retrieve transactions for a specific account over a specified date range.
+
+        :param account_hash: The hash of the account to retrieve transactions for.
+        :param start_date: The start date for the transaction retrieval (datetime object).
+        :param end_date: The end date for the transaction retrieval (datetime object).
+        :param types: Optional; A list of transaction types to filter.
+        :param symbol: Optional; A specific symbol to filter transactions.
+        :return: A list of transactions or None if the request fails.
+        """
+        if not (isinstance(start_date, datetime.datetime) and
+                isinstance(end_date, datetime.datetime)):
+            self.logger.error("Invalid date format. Dates must be datetime objects")
+            return None
+        try:
+            return await self._fetch_window(account_hash, start_date, end_date, types, symbol)
+        except self.client.request_errors as e:
             self.logger.error("Failed to get transactions for account %s: %s", account_hash, e)
             return None
+
+    async def iter_transactions(self, start_date, end_date, account_hashes=None, types=None, symbol=None):
+        """
+        Stream the transactions of one or more accounts over any date range. See Accounts.iter_transactions.
+
+        :return: An async generator of (account hash, transaction) tuples, in the order their windows complete.
+        """
+        if account_hashes is None:
+            account_hashes = [account['hashValue'] for account in await self.get_account_numbers() or []]
+        tasks = self._sync_tasks(start_date, end_date, account_hashes)
+        semaphore = asyncio.Semaphore(self.client.config.transaction_sync['max_workers'])
+        seen = set()
+
+        async def fetch(task):
+            async with semaphore:
+                return task, await self._fetch_window(*task, types, symbol)
+
+        pending = {asyncio.ensure_future(fetch(task)) for task in tasks}
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for future in done:
+                    task, response = future.result()
+                    transactions, retry = self._settle_window(task, response)
+                    pending.update(asyncio.ensure_future(fetch(sub_task)) for sub_task in retry)
+                    for item in self._unseen(seen, task[0], transactions):
+                        yield item
+        finally:
+            for future in pending:
+                future.cancel()
@@ -7,13 +7,12 @@ a real brokerage account and just 'letterrip.'
 
 This module demonstrates a simple trading algorithm using the Schwab API.
 It includes functions to place trades, check account status, and manage orders.
+pandas, numpy and tqdm are imported inside the functions that use them.
 """
 
 import json
 from datetime import datetime, timedelta
 import urllib.parse as urll
-import pandas as pd
-from tqdm import tqdm
 
 from pythonic_schwab_api.accounts import Accounts
 from pythonic_schwab_api.api_client import APIClient
@@ -33,6 +32,7 @@ def actually_do_some_trading(orders_api, account_hash, valid_quotes):
     Returns:
         list: List of tickers that were traded.
     """
+    from tqdm import tqdm  # pylint: disable=import-outside-toplevel
     traded_tickers = []
     for ticker, row in tqdm(valid_quotes.iterrows(),
                             total=valid_quotes.shape[0],
@@ -80,10 +80,11 @@ def find_trades_from_quotes(quotes):
     """
     Filters quotes to find valid trades based on predefined criteria.
 
+    The criteria are evaluated as vectorized expressions over a columnar
+    QuoteSnapshot, so large universes are screened without a Python loop.
+
     Args:
-        orders_api (Orders): The Orders API instance.
-        quotes (dict): Dictionary of quotes.
-        account_hash (str): The account hash.
+        quotes (dict or QuoteSnapshot): Dictionary of quotes, or a snapshot from Quotes.get_snapshot.
 
     Returns:
         pd.DataFrame: DataFrame containing valid quotes for trading.
@@ -91,31 +92,32 @@ def find_trades_from_quotes(quotes):
     if not quotes or len(quotes) == 0:
         print("No quotes found.")
         return
-    # Convert quotes to DataFrame
-    quotes_df = pd.DataFrame.from_dict(quotes, orient='index')
-    quotes_df.index = quotes_df.index.map(urll.unquote)
-
-    # Extract relevant quote data
-    quotes_df = quotes_df['quote'].apply(pd.Series)
-
-    # Filter out quotes with missing data
-    quotes_df = quotes_df.dropna(subset=['askPrice', 'askSize', 'bidPrice', 'bidSize', 'lastPrice'])
-
-    if 'regular' not in quotes_df.columns:
-        return
-
-    valid_quotes = quotes_df[
-        (quotes_df['lastPrice'] >= 0.005) &
-        (quotes_df['lastPrice'] <= 0.515) &
-        ((quotes_df['askPrice'] - quotes_df['bidPrice']) >= 0.06) &
-        (quotes_df['regular']['regularMarketLastPrice'] / (quotes_df['askPrice'] - quotes_df['bidPrice']) <= 10) &
-        (quotes_df['askSize'] <= 100) &
-        (quotes_df['bidSize'] <= 100) &
-        ((quotes_df['lastPrice'] - quotes_df['bidPrice']) >= 0) &
-        ((quotes_df['lastPrice'] - quotes_df['askPrice']) >= 0) &
-        ((quotes_df['lastPrice'] - quotes_df['bidPrice']) <= 0.7 * (quotes_df['askPrice'] - quotes_df['bidPrice'])) &
-        ((quotes_df['lastPrice'] - quotes_df['askPrice']) <= 0.7 * (quotes_df['askPrice'] - quotes_df['bidPrice']))
-    ]
+    from pythonic_schwab_api.quote_snapshot import QuoteSnapshot  # pylint: disable=import-outside-toplevel
+    import numpy as np  # pylint: disable=import-outside-toplevel
+    snapshot = quotes if isinstance(quotes, QuoteSnapshot) else QuoteSnapshot.from_quotes(quotes)
+
+    bid = snapshot['bidPrice']
+    ask = snapshot['askPrice']
+    last = snapshot['lastPrice']
+    spread = ask - bid
+
+    # NaN (missing) fields compare False, which filters out quotes with missing data
+    with np.errstate(divide='ignore', invalid='ignore'):
+        valid = (
+            (last >= 0.005) &
+            (last <= 0.515) &
+            (spread >= 0.06) &
+            (snapshot['regularMarketLastPrice'] / spread <= 10) &
+            (snapshot['askSize'] <= 100) &
+            (snapshot['bidSize'] <= 100) &
+            ((last - bid) >= 0) &
+            ((last - ask) >= 0) &
+            ((last - bid) <= 0.7 * spread) &
+            ((last - ask) <= 0.7 * spread)
+        )
+
+    valid_quotes = snapshot.select(valid).to_pandas()
+    valid_quotes.index = valid_quotes.index.map(urll.unquote)
     return valid_quotes
 
 
@@ -3,10 +3,9 @@ This module provides the APIClient class for interacting with the Schwab API.
 It handles authentication, token management, and making authenticated requests.
 """
 
-import random
 import re
-from time import sleep
-import webbrowser
+import threading
+import time
 import base64
 import json
 from datetime import datetime, timedelta
@@ -15,6 +14,63 @@ import requests
 
 from pythonic_schwab_api.config import APIConfig
 from pythonic_schwab_api.color_print import ColorPrint
+from pythonic_schwab_api.exceptions import AuthenticationRequiredError
+from pythonic_schwab_api.json_codec import get_codec
+from pythonic_schwab_api.metrics import RequestMetrics
+from pythonic_schwab_api.rate_limiter import RateLimiter
+from pythonic_schwab_api.request_coalescer import RequestCoalescer
+from pythonic_schwab_api.response_cache import ResponseCache, request_key
+from pythonic_schwab_api.session import SchwabSession
+from pythonic_schwab_api.token_store import create_token_store
+
+
+class TokenRefresher(threading.Thread):
+    """
+    Background thread that renews the access token before it expires.
+
+    The thread sleeps until ``token_refresh_threshold_seconds`` before the
+    client's token deadline, refreshes the token and goes back to sleep, so
+    requests never have to wait on the OAuth round-trip. While sleeping it
+    polls the token store so tokens refreshed by other processes are picked up.
+
+    Attributes:
+        client (APIClient): The client whose token is kept fresh.
+        stop_event (threading.Event): Set to stop the thread.
+    """
+    retry_interval = 30  # Seconds to wait before retrying a failed refresh
+
+    def __init__(self, client):
+        """
+        Initialize the TokenRefresher for a client.
+
+        Args:
+            client (APIClient): The client whose token is kept fresh.
+        """
+        super().__init__(daemon=True, name=f"TokenRefresher-{client.initials}")
+        self.client = client
+        self.stop_event = threading.Event()
+
+    def run(self):
+        """Refresh the token shortly before each expiry until stopped."""
+        threshold = self.client.config.token_refresh_threshold_seconds
+        poll_interval = self.client.config.token_store.get('poll_interval', 5)
+        while not self.stop_event.is_set():
+            try:
+                self.client.sync_token_from_store()
+                token_info = self.client.token_info
+                wait = self.client.token_deadline - threshold - time.monotonic()
+                if wait > 0:
+                    self.stop_event.wait(min(wait, poll_interval))
+                    continue
+                self.client.refresh_access_token(stale_token=token_info and token_info.get('access_token'))
+            except Exception as e:
+                self.client.logger.error("Background token refresh failed: %s", e)
+            if self.client.token_deadline - threshold <= time.monotonic():
+                self.stop_event.wait(self.retry_interval)
+
+    def stop(self):
+        """Stop the thread."""
+        self.stop_event.set()
 
 
 class APIClient:
@@ -25,27 +81,135 @@ class APIClient:
         initials (str): User initials for identifying token files.
         account_numbers (list): List of account numbers associated with the user.
         config (APIConfig): Configuration object for API settings.
-        session (requests.Session): HTTP session for making requests.
+        session (SchwabSession): Pooled HTTP session with per-family timeouts and retries.
+        token_store (TokenStore): Store the tokens are shared through, across processes.
+        token_version (object): Store version of the token currently held.
+        order_url_pattern (re.Pattern): Matches order placement URLs, whose 201 responses carry the order ID.
+        json_codec (JSONCodec): Codec used to decode responses.
+        rate_limiter (RateLimiter): Process-wide limiter shared by clients of the same app.
+        metrics (RequestMetrics): Per-endpoint request metrics, or None if disabled.
+        response_cache (ResponseCache): Cache for slow-changing GET responses, or None if disabled.
+        request_coalescer (RequestCoalescer): Shares in-flight identical GETs, or None if disabled.
         token_info (dict): Information about the current authentication token.
+        token_deadline (float): time.monotonic() value at which the access token expires.
+        token_refresher (TokenRefresher): Background refresher, or None if disabled.
+        token_lock (threading.Lock): Serializes token refreshes across threads.
+        interactive (bool): Whether the manual authorization flow may prompt the user.
+        authenticated (bool): Whether a valid token has been established.
+        request_errors (tuple): Exception types raised by the transport on request failures.
+        retry_errors (tuple): Transport exception types worth retrying (connection errors and timeouts).
     """
+    request_errors = (requests.RequestException,)
+    retry_errors = (requests.ConnectionError, requests.Timeout)
 
-    def __init__(self, initials):
+    def __init__(self, initials, token_store=None, lazy_auth=False, interactive=True, token=None):
         """
         Initialize the APIClient with user initials.
 
         Args:
             initials (str): User initials for identifying token files.
+            token_store (TokenStore, optional): Store to share tokens through.
+                Defaults to the store described by APIConfig.token_store.
+            lazy_auth (bool, optional): Defer loading and validating the token until
+                the first request. Defaults to False.
+            interactive (bool, optional): Allow the manual authorization flow to open a
+                browser and prompt on stdin. If False, AuthenticationRequiredError is
+                raised instead. Defaults to True.
+            token (dict, optional): Pre-fetched token data (e.g. another client's
+                token_info) to use instead of loading it from the token store.
         """
         self.initials = initials
         self.account_numbers = None
         self.config = APIConfig(self.initials)
-        self.session = requests.Session()
+        self.order_url_pattern = re.compile(re.escape(self.config.orders_base_url) + r"/.*/orders")
+        self.session = SchwabSession(self.config)
+        self.json_codec = get_codec(self.config.json_backend)
+        self.rate_limiter = RateLimiter.shared(self.config)
+        self.metrics = RequestMetrics(self.config) if self.config.metrics_enabled else None
+        self.response_cache = ResponseCache.from_config(self.config)
+        self.request_coalescer = RequestCoalescer() if self.config.coalesce_requests else None
         self.setup_logging()
-        self.token_info = self.load_token()
+        self.token_refresher = None
+        self.token_lock = threading.Lock()
+        self.token_store = token_store or create_token_store(self.config)
+        self.token_version = None
+        self.interactive = interactive
+        self.authenticated = False
+        self.auth_lock = threading.Lock()
+        self.token_info = token
+        if not lazy_auth:
+            self.authenticate()
+
+    def authenticate(self):
+        """
+        Establish a valid token, refreshing or reauthorizing if necessary.
+
+        Runs once per client; requests call it on first use when the client
+        was built with lazy_auth.
+
+        Raises:
+            AuthenticationRequiredError: If the client is non-interactive and no
+                valid token could be loaded or refreshed.
+        """
+        with self.auth_lock:
+            if self.authenticated:
+                return
+            if not self.token_info:
+                self.token_info = self.load_token()
 
-        # Validate and refresh token or reauthorize if necessary
-        if not self.token_info or not self.ensure_valid_token():
-            self.manual_authorization_flow()
+            # Validate and refresh token or reauthorize if necessary
+            try:
+                valid = bool(self.token_info) and self.ensure_valid_token()
+            except requests.RequestException as e:
+                if self.interactive:
+                    raise
+                raise AuthenticationRequiredError(f"Token refresh failed: {e}") from e
+            if not valid:
+                self.reauthorize()
+            if self.config.background_token_refresh:
+                self.start_token_refresher()
+            self.authenticated = True
+
+    def reauthorize(self):
+        """
+        Obtain new tokens through the manual authorization flow.
+
+        Raises:
+            AuthenticationRequiredError: If the client is non-interactive.
+        """
+        if not self.interactive:
+            raise AuthenticationRequiredError(
+                f"No valid token for initials {self.initials}; run an interactive client to authorize.")
+        self.manual_authorization_flow()
+
+    @property
+    def token_info(self):
+        """dict: Information about the current authentication token."""
+        return self._token_info
+
+    @token_info.setter
+    def token_info(self, token_data):
+        # The deadline is published before the token so a reader never pairs a new
+        # token with the old deadline and triggers a redundant refresh.
+        deadline = 0.0
+        if token_data and 'expires_at' in token_data:
+            remaining = (datetime.fromisoformat(token_data['expires_at']) - datetime.now()).total_seconds()
+            deadline = time.monotonic() + remaining
+        self.token_deadline = deadline
+        self._token_info = token_data
+
+    def start_token_refresher(self):
+        """Start renewing the access token in the background before it expires."""
+        if self.token_refresher is None or not self.token_refresher.is_alive():
+            self.token_refresher = TokenRefresher(self)
+            self.token_refresher.start()
+
+    def close(self):
+        """Stop the background token refresher and close the HTTP session."""
+        if self.token_refresher is not None:
+            self.token_refresher.stop()
+            self.token_refresher = None
+        self.session.close()
 
     def setup_logging(self):
         """Set up logging configuration."""
@@ -60,13 +224,14 @@ class APIClient:
                 return True
             if 'refresh_token' in self.token_info:
                 self.logger.info("Access token expired. Attempting to refresh.")
-                if self.refresh_access_token():
+                if self.refresh_access_token(stale_token=self.token_info.get('access_token')):
                     return True
         self.logger.warning("Token invalid and could not be refreshed.")
         return False
 
     def manual_authorization_flow(self):
         """Handle the manual steps required to get the authorization code from the user."""
+        import webbrowser  # pylint: disable=import-outside-toplevel
         self.logger.info("Starting manual authorization flow.")
         auth_url = f"{self.config.api_base_url}/v1/oauth/authorize?client_id={self.config.app_key}&redirect_uri={self.config.callback_url}&response_type=code"
         webbrowser.open(auth_url)
@@ -101,116 +266,258 @@ class APIClient:
         self.logger.error("Failed to obtain tokens.")
         response.raise_for_status()
 
-    def refresh_access_token(self):
-        """Use the refresh token to obtain a new access token and validate it."""
-        data = {
-            'grant_type': 'refresh_token',
-            'refresh_token': self.token_info['refresh_token']
-        }
-        if not self.post_token_request(data):
-            self.logger.error("Failed to refresh access token.")
-            self.manual_authorization_flow()
-        self.token_info = self.load_token()
-        return self.validate_token()
+    def refresh_access_token(self, stale_token=None):
+        """
+        Use the refresh token to obtain a new access token and validate it.
+
+        Refreshes are single-flight: concurrent callers wait for the refresh in
+        progress, and a caller whose stale token has already been replaced reuses
+        the new token instead of refreshing again.
+
+        Args:
+            stale_token (str, optional): The access token the caller found to be invalid.
+                If None, the refresh is unconditional.
+
+        Returns:
+            bool: True if the client holds a valid token afterwards.
+        """
+        with self.token_lock:
+            with self.token_store.lock():
+                self.sync_token_from_store()
+                current = self.token_info
+                if stale_token is not None and current and current.get('access_token') != stale_token:
+                    self.logger.debug("Token already refreshed by another caller.")
+                    return self.validate_token()
+                refreshed = False
+                if current and current.get('refresh_token'):
+                    data = {
+                        'grant_type': 'refresh_token',
+                        'refresh_token': current['refresh_token']
+                    }
+                    refreshed = self.post_token_request(data)
+                else:
+                    self.logger.error("No refresh token stored.")
+            if not refreshed:
+                # Outside the store lock: the manual flow may wait on the user for minutes
+                self.logger.error("Failed to refresh access token.")
+                self.reauthorize()
+            return self.validate_token()
 
     def save_token(self, token_data):
         """Save token data securely."""
         token_data['expires_at'] = (datetime.now() + timedelta(seconds=token_data['expires_in'])).isoformat()
-        with open(f'schwab_token_data_{self.initials}.json', 'w', encoding='utf-8') as f:
-            json.dump(token_data, f)
+        self.token_store.save(token_data)
+        self.token_version = self.token_store.version()
+        self.token_info = token_data
         self.logger.info("Token data saved successfully.")
 
     def load_token(self):
         """Load token data."""
         try:
-            with open(f'schwab_token_data_{self.initials}.json', 'r', encoding='utf-8') as f:
-                token_data = json.load(f)
-                return token_data
-        except FileNotFoundError as e:
+            self.token_version = self.token_store.version()
+            token_data = self.token_store.load()
+            if token_data is None:
+                self.logger.warning("Loading token failed: no token stored.")
+            return token_data
+        except OSError as e:
             self.logger.warning("Loading token failed: %s", e)
         except json.JSONDecodeError as e:
             self.logger.warning("Error decoding token file: %s", e)
         return None
 
+    def sync_token_from_store(self):
+        """
+        Pick up a token written to the store by another process.
+
+        Returns:
+            bool: True if a newer token was loaded.
+        """
+        if self.token_store.version() == self.token_version:
+            return False
+        token_data = self.load_token()
+        if token_data and token_data != self.token_info:
+            self.logger.info("Loaded token refreshed by another process.")
+            self.token_info = token_data
+            return True
+        return False
+
     def validate_token(self, force=False):
         """Validate the current token."""
-        if self.token_info and datetime.now() < datetime.fromisoformat(self.token_info['expires_at']):
-            print(f"Token expires in {(datetime.fromisoformat(self.token_info['expires_at']) - datetime.now()).seconds} seconds")
+        if time.monotonic() < self.token_deadline:
             return True
         if force:
-            print("Token expired or invalid.")
+            self.logger.info("Token expired or invalid, validating with a request.")
             params = {'symbol': 'AAPL'}
             response = self.make_request(endpoint=f"{self.config.market_data_base_url}/chains", params=params,
                                         validating=True)
-            print(response)
+            self.logger.debug("Validation request returned %s", "data" if response else "no data")
             if response:
                 self.logger.info("Token validated successfully.")
                 return True
         self.logger.warning("Token validation failed.")
         return False
 
-    def make_request(self, endpoint, method="GET", **kwargs):
+    def build_url(self, endpoint):
+        """Return the fully qualified URL for an endpoint."""
+        if self.config.api_base_url not in endpoint:
+            return f"{self.config.api_base_url}{endpoint}"
+        return endpoint
+
+    def order_result(self, location):
         """
-        Make authenticated HTTP requests.
+        Build the result of a successful order placement from its location header.
 
         Args:
-            endpoint (str): The API endpoint.
-            method (str, optional): The HTTP method. Defaults to "GET".
-            **kwargs: Additional parameters for the request.
+            location (str): The location header of the 201 response.
 
         Returns:
-            dict: The JSON response from the API if available, else None.
+            dict: The order ID and success flag, or None if the header is missing.
+        """
+        if location:
+            order_id = location.split('/')[-1]
+            self.logger.debug("Order placed successfully. Order ID: %s", order_id)
+            return {"order_id": order_id, "success": True}
+        self.logger.error("201 response without a location header.")
+        return None
 
-        Raises:
-            HTTPError: If the request fails.
+    def send_request(self, url, method="GET", **kwargs):
         """
-        sleep(0.5 + random.randint(0, 1000) / 1000)
+        Send an authenticated request, refreshing the token once on a 401.
+
+        Args:
+            url (str): The fully qualified request URL.
+            method (str, optional): The HTTP method. Defaults to "GET".
+            **kwargs: Additional parameters for the request.
 
+        Returns:
+            requests.Response: The raw response.
+        """
+        if not self.authenticated:
+            self.authenticate()
         if 'validating' not in kwargs:
+            token_info = self.token_info
             if not self.validate_token():
                 self.logger.info("Token expired or invalid, re-authenticating.")
-                self.refresh_access_token()
+                self.refresh_access_token(stale_token=token_info and token_info.get('access_token'))
         kwargs.pop('validating', None)
 
-        if self.config.api_base_url not in endpoint:
-            url = f"{self.config.api_base_url}{endpoint}"
-        else:
-            url = endpoint
-
         self.logger.debug("Making request to %s with method %s and kwargs %s", url, method, kwargs)
 
-        headers = {'Authorization': f'Bearer {self.token_info["access_token"]}'}
-
-        response = self.session.request(method, url, headers=headers, **kwargs)
+        access_token = self.token_info["access_token"]
+        response = self.exchange(method, url, access_token, **kwargs)
 
         if response.status_code == 401:
             self.logger.warning("Token expired during request. Refreshing token...")
-            self.refresh_access_token()
-            headers = {'Authorization': f'Bearer {self.token_info["access_token"]}'}
-            response = self.session.request(method, url, headers=headers, **kwargs)
-
-        if response.status_code != 200:
-            order_pattern = r"https://api\.schwabapi\.com/trader/v1/accounts/.*/orders"
-            if response.status_code == 201 and re.match(order_pattern, url):
-                location = response.headers.get('location')
-                if location:
-                    order_id = location.split('/')[-1]
-                    self.logger.debug("Order placed successfully. Order ID: %s", order_id)
-                    return {"order_id": order_id, "success": True}
-                self.logger.error("201 response without a location header.")
-                return None
+            self.refresh_access_token(stale_token=access_token)
+            response = self.exchange(method, url, self.token_info["access_token"], **kwargs)
+        return response
+
+    def exchange(self, method, url, access_token, **kwargs):
+        """
+        Send one request within the rate limit, recording metrics when enabled.
+
+        Args:
+            method (str): The HTTP method.
+            url (str): The fully qualified request URL.
+            access_token (str): The bearer token to authenticate with.
+            **kwargs: Additional parameters for the request.
+
+        Returns:
+            requests.Response: The raw response.
+        """
+        queued = self.rate_limiter.acquire(url)
+        headers = {'Authorization': f'Bearer {access_token}'}
+        if self.metrics is None:
+            return self.session.request(method, url, headers=headers, **kwargs)
+        started = time.perf_counter()
+        response = self.session.request(method, url, headers=headers, **kwargs)
+        wire = time.perf_counter() - started
+        retries = response.raw.retries.history if getattr(response.raw, 'retries', None) else ()
+        nbytes = int(response.headers.get('content-length', 0)) if kwargs.get('stream') else len(response.content)
+        self.metrics.record_request(method, url, response.status_code, len(retries), nbytes, queued, wire)
+        return response
+
+    def decode_response(self, url, response, method="GET"):
+        """
+        Turn a response into make_request's return value.
+
+        Args:
+            url (str): The fully qualified request URL.
+            response (requests.Response): The response to decode.
+            method (str, optional): The HTTP method, for metrics. Defaults to "GET".
+
+        Returns:
+            dict: The parsed JSON, the order ID for a placed order, or None if empty.
+
+        Raises:
+            HTTPError: If the response has an error status.
+        """
+        if response.status_code == 201 and self.order_url_pattern.match(url):
+            return self.order_result(response.headers.get('location'))
 
         response.raise_for_status()
 
         if response.content:
             try:
-                return response.json()
+                if self.metrics is None:
+                    return self.json_codec.loads(response.content)
+                started = time.perf_counter()
+                result = self.json_codec.loads(response.content)
+                self.metrics.record_decode(method, url, time.perf_counter() - started)
+                return result
             except json.JSONDecodeError as e:
                 self.logger.error("Error decoding JSON response: %s", e)
                 raise requests.exceptions.JSONDecodeError(e.msg, e.doc, e.pos)
         self.logger.debug("Empty response content")
         return None
 
+    def make_request(self, endpoint, method="GET", **kwargs):
+        """
+        Make authenticated HTTP requests.
+
+        GET requests to endpoints with a TTL in the response cache are served
+        from the cache when it is enabled, and identical GET requests issued
+        concurrently share a single round-trip when coalescing is enabled.
+
+        Args:
+            endpoint (str): The API endpoint.
+            method (str, optional): The HTTP method. Defaults to "GET".
+            **kwargs: Additional parameters for the request. Pass raw_response=True to
+                get the requests.Response back undecoded (bypassing the cache and
+                coalescing); combined with stream=True the body is left unread.
+
+        Returns:
+            dict: The JSON response from the API if available, else None.
+
+        Raises:
+            HTTPError: If the request fails.
+        """
+        raw_response = kwargs.pop('raw_response', False)
+        url = self.build_url(endpoint)
+        if raw_response:
+            response = self.send_request(url, method, **kwargs)
+            response.raise_for_status()
+            return response
+        shareable = method.upper() == 'GET' and set(kwargs) <= {'params'}
+        key = request_key(method, url, kwargs.get('params')) if shareable else None
+
+        ttl = self.response_cache.ttl_for(url) if shareable and self.response_cache is not None else 0
+        if ttl:
+            found, cached = self.response_cache.get(key)
+            if found:
+                return cached
+
+        def fetch():
+            response = self.send_request(url, method, **kwargs)
+            result = self.decode_response(url, response, method)
+            if ttl and result is not None:
+                self.response_cache.put(key, result, ttl, len(response.content))
+            return result
+
+        if shareable and self.request_coalescer is not None:
+            return self.request_coalescer.do(key, fetch)
+        return fetch()
+
     def get_user_preferences(self):
         """Retrieve user preferences."""
         try:
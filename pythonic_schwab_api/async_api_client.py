@@ -0,0 +1,311 @@
+"""
+This module provides the AsyncAPIClient class, an asyncio counterpart of APIClient.
+
+It shares APIClient's authentication and token handling but issues requests
+through a pooled aiohttp session with keep-alive, so REST calls can run
+concurrently on the same event loop as the StreamClient.
+"""
+
+import asyncio
+import functools
+import json
+import time
+import aiohttp
+import requests
+from urllib3.util.retry import Retry
+
+from pythonic_schwab_api.api_client import APIClient
+from pythonic_schwab_api.rate_limiter import endpoint_family
+from pythonic_schwab_api.request_coalescer import AsyncRequestCoalescer
+from pythonic_schwab_api.response_cache import request_key
+from pythonic_schwab_api.session import ENDPOINT_FAMILIES, RETRY_STATUSES
+
+
+def encode_params(params):
+    """
+    Encode query parameters the way requests does, for use with aiohttp.
+
+    None values are dropped, lists and tuples become repeated keys and all
+    other values are converted to strings.
+
+    Args:
+        params (dict): The query parameters.
+
+    Returns:
+        list: A list of (key, value) string pairs.
+    """
+    encoded = []
+    for key, value in params.items():
+        if value is None:
+            continue
+        if isinstance(value, (list, tuple)):
+            encoded.extend((key, str(item)) for item in value)
+        else:
+            encoded.append((key, str(value)))
+    return encoded
+
+
+class AsyncAPIClient(APIClient):
+    """
+    AsyncAPIClient handles authenticated, non-blocking interaction with the Schwab API.
+
+    Token loading, validation and refresh follow APIClient; the rare OAuth
+    round-trip runs in the default executor so it never blocks the event loop.
+    Timeouts and retries follow APIConfig.endpoint_settings, like APIClient.
+
+    Attributes:
+        max_connections (int): Maximum number of pooled connections.
+        family_settings (dict): Connection settings per endpoint family.
+        request_coalescer (AsyncRequestCoalescer): Shares in-flight identical GETs, or None if disabled.
+        http (aiohttp.ClientSession): Pooled HTTP session, created on first use.
+    """
+    # pylint: disable=invalid-overridden-method  # coroutine overrides are what makes this the async variant
+    request_errors = (aiohttp.ClientError, asyncio.TimeoutError)
+    retry_errors = (aiohttp.ClientConnectionError, asyncio.TimeoutError)
+
+    def __init__(self, initials, max_connections=100, **kwargs):
+        """
+        Initialize the AsyncAPIClient with user initials.
+
+        Args:
+            initials (str): User initials for identifying token files.
+            max_connections (int, optional): Size of the connection pool. Defaults to 100.
+            **kwargs: token_store, lazy_auth, interactive and token, as for APIClient.
+        """
+        super().__init__(initials, **kwargs)
+        self.max_connections = max_connections
+        self.family_settings = {family: self.config.endpoint_settings(family) for family in ENDPOINT_FAMILIES}
+        self.http = None
+        if self.request_coalescer is not None:
+            self.request_coalescer = AsyncRequestCoalescer()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    def validate_token(self, force=False):
+        """
+        Validate the current token against its expiry time.
+
+        Inherited synchronous code calls this, so it cannot await a request;
+        the forced check of APIClient.validate_token, which sends one, is not
+        available. Expired tokens are refreshed by the next request instead.
+
+        Args:
+            force (bool, optional): Not supported; must be False.
+
+        Returns:
+            bool: True if the token has not expired yet.
+
+        Raises:
+            ValueError: If force is True.
+        """
+        if force:
+            raise ValueError("AsyncAPIClient cannot force a token validation request; await a request instead")
+        return super().validate_token()
+
+    def get_http_session(self):
+        """Return the pooled aiohttp session, creating it on first use."""
+        if self.http is None or self.http.closed:
+            connector = aiohttp.TCPConnector(limit=self.max_connections)
+            self.http = aiohttp.ClientSession(connector=connector)
+        return self.http
+
+    async def close(self):
+        """Close the pooled HTTP session and stop the background token refresher."""
+        if self.http is not None and not self.http.closed:
+            await self.http.close()
+        self.http = None
+        super().close()
+
+    async def run_blocking(self, func, *args, **kwargs):
+        """Run a blocking callable in the default executor."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, functools.partial(func, *args, **kwargs))
+
+    @staticmethod
+    def retry_delay(retry_strategy, attempt, headers=None):
+        """
+        Return how long to wait before a retry, honoring a numeric Retry-After header.
+
+        Args:
+            retry_strategy (dict): The retry strategy with its backoff_factor.
+            attempt (int): Zero-based number of the attempt that failed.
+            headers (Mapping, optional): Headers of the failed response.
+
+        Returns:
+            float: Seconds to wait.
+        """
+        retry_after = headers.get('Retry-After') if headers else None
+        if retry_after and retry_after.isdigit():
+            return float(retry_after)
+        return retry_strategy.get('backoff_factor', 1) * 2 ** attempt
+
+    async def send(self, method, url, access_token, allow_unauthorized=False, **kwargs):
+        """
+        Send one authenticated request after waiting for rate limit budget.
+
+        Connection errors, timeouts and 429/5xx responses are retried with
+        backoff for idempotent methods, per the endpoint family's retry strategy.
+
+        Args:
+            method (str): The HTTP method.
+            url (str): The fully qualified request URL.
+            access_token (str): The bearer token to authenticate with.
+            allow_unauthorized (bool, optional): Return 401 responses instead of raising.
+            **kwargs: Additional parameters for the request.
+
+        Returns:
+            tuple: The status code, response headers and body bytes.
+        """
+        settings = self.family_settings[endpoint_family(url, self.config)]
+        retry_strategy = settings['retry_strategy'] or {}
+        retries = retry_strategy.get('total', 0) if method.upper() in Retry.DEFAULT_ALLOWED_METHODS else 0
+        kwargs.setdefault('timeout', aiohttp.ClientTimeout(total=settings['timeout']))
+        headers = {'Authorization': f'Bearer {access_token}'}
+        attempt = 0
+        queued = 0.0
+        while True:
+            delay = self.rate_limiter.reserve(url)
+            if delay:
+                queued += delay
+                await asyncio.sleep(delay)
+            started = time.perf_counter()
+            try:
+                async with self.get_http_session().request(method, url, headers=headers, **kwargs) as response:
+                    body = await response.read()
+                    if response.status not in RETRY_STATUSES or attempt >= retries:
+                        if self.metrics is not None:
+                            self.metrics.record_request(method, url, response.status, attempt, len(body),
+                                                        queued, time.perf_counter() - started)
+                        if not (response.status == 401 and allow_unauthorized):
+                            response.raise_for_status()
+                        return response.status, response.headers, body
+                    self.logger.warning("Retrying %s after status %s", url, response.status)
+                    backoff = self.retry_delay(retry_strategy, attempt, response.headers)
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+                if attempt >= retries:
+                    raise
+                self.logger.warning("Retrying %s after error: %s", url, e)
+                backoff = self.retry_delay(retry_strategy, attempt)
+            await asyncio.sleep(backoff)
+            attempt += 1
+
+    def decode_body(self, url, status, headers, body, method="GET"):
+        """
+        Turn a response body into make_request's return value.
+
+        Args:
+            url (str): The fully qualified request URL.
+            status (int): The response status code.
+            headers (Mapping): The response headers.
+            body (bytes): The response body.
+            method (str, optional): The HTTP method, for metrics. Defaults to "GET".
+
+        Returns:
+            dict: The parsed JSON, the order ID for a placed order, or None if empty.
+        """
+        if status == 201 and self.order_url_pattern.match(url):
+            return self.order_result(headers.get('location'))
+
+        if body:
+            try:
+                if self.metrics is None:
+                    return self.json_codec.loads(body)
+                started = time.perf_counter()
+                result = self.json_codec.loads(body)
+                self.metrics.record_decode(method, url, time.perf_counter() - started)
+                return result
+            except json.JSONDecodeError as e:
+                self.logger.error("Error decoding JSON response: %s", e)
+                raise requests.exceptions.JSONDecodeError(e.msg, e.doc, e.pos)
+        self.logger.debug("Empty response content")
+        return None
+
+    async def send_request(self, url, method="GET", **kwargs):
+        """
+        Send an authenticated request, refreshing the token once on a 401.
+
+        Args:
+            url (str): The fully qualified request URL.
+            method (str, optional): The HTTP method. Defaults to "GET".
+            **kwargs: Additional parameters for the request.
+
+        Returns:
+            tuple: The status code, response headers and body bytes.
+        """
+        if not self.authenticated:
+            await self.run_blocking(self.authenticate)
+        if 'validating' not in kwargs:
+            token_info = self.token_info
+            if not self.validate_token():
+                self.logger.info("Token expired or invalid, re-authenticating.")
+                await self.run_blocking(self.refresh_access_token,
+                                        stale_token=token_info and token_info.get('access_token'))
+        kwargs.pop('validating', None)
+        if kwargs.get('params') is not None:
+            kwargs['params'] = encode_params(kwargs['params'])
+
+        self.logger.debug("Making request to %s with method %s and kwargs %s", url, method, kwargs)
+
+        access_token = self.token_info["access_token"]
+        status, headers, body = await self.send(method, url, access_token, allow_unauthorized=True, **kwargs)
+
+        if status == 401:
+            self.logger.warning("Token expired during request. Refreshing token...")
+            await self.run_blocking(self.refresh_access_token, stale_token=access_token)
+            status, headers, body = await self.send(method, url, self.token_info["access_token"], **kwargs)
+        return status, headers, body
+
+    async def make_request(self, endpoint, method="GET", **kwargs):
+        """
+        Make authenticated HTTP requests without blocking the event loop.
+
+        Caching and coalescing of GET requests behave as in APIClient.make_request.
+
+        Args:
+            endpoint (str): The API endpoint.
+            method (str, optional): The HTTP method. Defaults to "GET".
+            **kwargs: Additional parameters for the request. Pass raw_response=True to
+                get the undecoded body bytes back, bypassing the cache and coalescing.
+
+        Returns:
+            dict: The JSON response from the API if available, else None.
+
+        Raises:
+            ClientResponseError: If the request fails.
+        """
+        raw_response = kwargs.pop('raw_response', False)
+        url = self.build_url(endpoint)
+        if raw_response:
+            _, _, body = await self.send_request(url, method, **kwargs)
+            return body
+        shareable = method.upper() == 'GET' and set(kwargs) <= {'params'}
+        key = request_key(method, url, kwargs.get('params')) if shareable else None
+
+        ttl = self.response_cache.ttl_for(url) if shareable and self.response_cache is not None else 0
+        if ttl:
+            found, cached = self.response_cache.get(key)
+            if found:
+                return cached
+
+        async def fetch():
+            status, headers, body = await self.send_request(url, method, **kwargs)
+            result = self.decode_body(url, status, headers, body, method)
+            if ttl and result is not None:
+                self.response_cache.put(key, result, ttl, len(body))
+            return result
+
+        if shareable and self.request_coalescer is not None:
+            return await self.request_coalescer.do(key, fetch)
+        return await fetch()
+
+    async def get_user_preferences(self):
+        """Retrieve user preferences."""
+        try:
+            return await self.make_request(f"{self.config.trader_base_url}/userPreference")
+        except self.request_errors as e:
+            self.logger.error("Failed to get user preferences: %s", e)
+            return None
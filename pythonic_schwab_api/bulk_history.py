@@ -0,0 +1,329 @@
+"""
+This module provides BulkPriceHistory, a concurrent multi-symbol price history downloader.
+
+Symbols are fetched through PriceHistory by a bounded pool of workers (threads
+for APIClient, tasks for AsyncAPIClient) that all draw from the client's rate
+limiter, so a large universe runs at the pace the API allows. Transient
+failures (connection errors, timeouts, 429 and 5xx) are retried by the
+client's transport per the marketdata retry_strategy; only when that is
+disabled does BulkPriceHistory retry them itself, with exponential backoff,
+so attempts never multiply across the two layers. Results are yielded as
+they complete, and progress and throughput are reported through a callback
+or a tqdm bar.
+With a CandleStore the candles are written to disk as they arrive.
+
+Usage example:
+    bulk = BulkPriceHistory(client, store=CandleStore("candles"), show_progress=True)
+    for result in bulk.iter(symbols, startDate=datetime(2020, 1, 1), periodType="year",
+                            frequencyType="daily", frequency=1):
+        if result.error:
+            print(result.symbol, result.error)
+"""
+
+import asyncio
+import datetime
+import time
+from collections import namedtuple
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from pythonic_schwab_api.market_data import AsyncPriceHistory, PriceHistory
+
+HistoryResult = namedtuple('HistoryResult', ['symbol', 'response', 'error', 'attempts'])
+HistoryResult.__doc__ = """
+Outcome of one symbol's download.
+
+Attributes:
+    symbol (str): The symbol.
+    response (dict): The /pricehistory response, or None if every attempt failed.
+    error (Exception): The last error if every attempt failed, else None.
+    attempts (int): Number of requests made.
+"""
+
+
+class BulkProgress:
+    """
+    Progress and throughput of a bulk download.
+
+    Attributes:
+        total (int): Symbols scheduled.
+        completed (int): Symbols finished, successfully or not.
+        failed (int): Symbols whose every attempt failed.
+        retries (int): Retried attempts.
+        candles (int): Candles received.
+        started (float): time.monotonic() when the download started.
+    """
+
+    def __init__(self, total):
+        self.total = total
+        self.completed = 0
+        self.failed = 0
+        self.retries = 0
+        self.candles = 0
+        self.started = time.monotonic()
+
+    def __str__(self):
+        return (f"{self.completed}/{self.total} symbols ({self.failed} failed, {self.retries} retries), "
+                f"{self.symbols_per_second:.1f} symbols/s, {self.candles_per_second:.0f} candles/s, "
+                f"ETA {self.eta:.0f}s")
+
+    @property
+    def elapsed(self):
+        """float: Seconds since the download started."""
+        return time.monotonic() - self.started
+
+    @property
+    def symbols_per_second(self):
+        """float: Symbols completed per second."""
+        return self.completed / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def candles_per_second(self):
+        """float: Candles received per second."""
+        return self.candles / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def eta(self):
+        """float: Estimated seconds until every symbol is completed."""
+        rate = self.symbols_per_second
+        return (self.total - self.completed) / rate if rate else float('inf')
+
+    def record(self, result):
+        """Account for one finished symbol."""
+        self.completed += 1
+        self.retries += result.attempts - 1
+        if result.error is not None:
+            self.failed += 1
+        elif result.response:
+            self.candles += len(result.response.get('candles') or [])
+
+
+class BulkHistoryResult(dict):
+    """
+    /pricehistory responses keyed by symbol.
+
+    Attributes:
+        errors (dict): Last exception per symbol whose every attempt failed.
+        progress (BulkProgress): Final progress and throughput of the download.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.errors = {}
+        self.progress = None
+
+
+def epoch_ms(value):
+    """Convert a datetime or date to epoch milliseconds; other values are returned unchanged."""
+    if isinstance(value, datetime.datetime):
+        return int(value.timestamp() * 1000)
+    if isinstance(value, datetime.date):
+        return int(datetime.datetime.combine(value, datetime.time()).timestamp() * 1000)
+    return value
+
+
+class BulkPriceHistory:
+    """
+    Downloads price history for many symbols concurrently.
+
+    Attributes:
+        client (APIClient): The client requests are made through; an AsyncAPIClient enables aiter().
+        history (PriceHistory): PriceHistory (or AsyncPriceHistory) bound to the client and store.
+        max_workers (int): Symbols in flight at once.
+        retries (int): Attempts per symbol after the first one fails.
+        backoff_factor (float): Seconds before the first retry, doubled for each further retry.
+        on_progress (callable): Called with the BulkProgress after every completed symbol.
+        show_progress (bool): Display a tqdm progress bar.
+        progress (BulkProgress): Progress of the current or last download.
+    """
+
+    def __init__(self, client, store=None, max_workers=None, retries=None, backoff_factor=None,
+                 on_progress=None, show_progress=False):
+        """
+        Initialize the BulkPriceHistory.
+
+        Args:
+            client (APIClient): The client to make requests through.
+            store (CandleStore, optional): Store to write candles to as they arrive. Requests
+                must then give a startDate.
+            max_workers (int, optional): Symbols in flight at once. Defaults to config.bulk_history.
+            retries (int, optional): Attempts per symbol after the first. Defaults to 0 if the marketdata
+                retry_strategy already retries requests, else to config.bulk_history['retries'].
+            backoff_factor (float, optional): Seconds before the first retry. Defaults to config.bulk_history.
+            on_progress (callable, optional): Called with a BulkProgress after every completed symbol.
+            show_progress (bool, optional): Display a tqdm progress bar. Defaults to False.
+        """
+        settings = client.config.bulk_history
+        self.client = client
+        history_class = AsyncPriceHistory if asyncio.iscoroutinefunction(client.make_request) else PriceHistory
+        self.history = history_class(client, store)
+        self.max_workers = max_workers or settings['max_workers']
+        if retries is None:
+            # The session already retries transient failures when marketdata has a retry strategy
+            transport = client.config.endpoint_settings('marketdata')['retry_strategy'] or {}
+            retries = 0 if transport.get('total') else settings['retries']
+        self.retries = retries
+        self.backoff_factor = settings['backoff_factor'] if backoff_factor is None else backoff_factor
+        self.on_progress = on_progress
+        self.show_progress = show_progress
+        self.progress = None
+
+    def _params(self, params):
+        """Normalize shared request parameters, converting datetimes to epoch milliseconds."""
+        params = {name: epoch_ms(value) for name, value in params.items()}
+        if self.history.store is not None and params.get('startDate') is None:
+            raise ValueError("Writing to a CandleStore requires a startDate")
+        return params
+
+    def _retryable(self, error):
+        """Return whether a failed attempt is worth retrying: connection errors, timeouts, 429 and 5xx."""
+        status = getattr(error, 'status', None) or getattr(getattr(error, 'response', None), 'status_code', None)
+        if status is not None:
+            return status == 429 or status >= 500
+        return isinstance(error, self.client.retry_errors)
+
+    def _failed(self, symbol, error, attempts):
+        """Log a symbol whose download gave up and return its failed HistoryResult."""
+        self.client.logger.warning("Price history for %s failed after %d attempts: %s", symbol, attempts, error)
+        return HistoryResult(symbol, None, error, attempts)
+
+    def _fetch(self, symbol, params):
+        """Fetch one symbol, retrying transient failures with exponential backoff."""
+        attempt = 0
+        while True:
+            try:
+                return HistoryResult(symbol, self.history.by_symbol(symbol, **params), None, attempt + 1)
+            except self.client.request_errors as e:
+                if attempt == self.retries or not self._retryable(e):
+                    return self._failed(symbol, e, attempt + 1)
+            time.sleep(self.backoff_factor * 2 ** attempt)
+            attempt += 1
+
+    async def _afetch(self, symbol, params):
+        """Fetch one symbol asynchronously, retrying transient failures with exponential backoff."""
+        attempt = 0
+        while True:
+            try:
+                return HistoryResult(symbol, await self.history.by_symbol(symbol, **params), None, attempt + 1)
+            except self.client.request_errors as e:
+                if attempt == self.retries or not self._retryable(e):
+                    return self._failed(symbol, e, attempt + 1)
+            await asyncio.sleep(self.backoff_factor * 2 ** attempt)
+            attempt += 1
+
+    def _reporter(self, total):
+        """Return (progress, report callable, close callable) for a download of ``total`` symbols."""
+        progress = self.progress = BulkProgress(total)
+        progress_bar = None
+        if self.show_progress:
+            from tqdm import tqdm  # pylint: disable=import-outside-toplevel
+            progress_bar = tqdm(total=total, desc="Price history", unit="symbol")
+
+        def report(result):
+            progress.record(result)
+            if progress_bar is not None:
+                progress_bar.update(1)
+                progress_bar.set_postfix(failed=progress.failed, candles_s=f"{progress.candles_per_second:.0f}")
+            if self.on_progress is not None:
+                self.on_progress(progress)
+
+        def close():
+            if progress_bar is not None:
+                progress_bar.close()
+            self.client.logger.info("Price history download finished: %s", progress)
+
+        return progress, report, close
+
+    def iter(self, symbols, **params):
+        """
+        Download price history for each symbol, yielding results as they complete.
+
+        At most max_workers requests are in flight and at most twice that many
+        results are held before being yielded, so memory stays bounded.
+
+        Args:
+            symbols (iterable): The symbols.
+            **params: PriceHistory.by_symbol parameters shared by every symbol; startDate and
+                endDate may be datetimes.
+
+        Yields:
+            HistoryResult: One result per symbol, in completion order.
+        """
+        symbols = list(dict.fromkeys(symbols))
+        params = self._params(params)
+        _, report, close = self._reporter(len(symbols))
+        pending = set()
+        try:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+                try:
+                    for symbol in symbols:
+                        pending.add(pool.submit(self._fetch, symbol, params))
+                        if len(pending) >= self.max_workers * 2:
+                            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                            for future in done:
+                                report(future.result())
+                                yield future.result()
+                    while pending:
+                        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            report(future.result())
+                            yield future.result()
+                finally:
+                    for future in pending:  # stop queued work if the caller stops iterating early
+                        future.cancel()
+        finally:
+            close()
+
+    async def aiter(self, symbols, **params):
+        """
+        Download price history for each symbol with an AsyncAPIClient, yielding results as they complete.
+
+        Args:
+            symbols (iterable): The symbols.
+            **params: PriceHistory.by_symbol parameters shared by every symbol.
+
+        Yields:
+            HistoryResult: One result per symbol, in completion order.
+        """
+        if not isinstance(self.history, AsyncPriceHistory):
+            raise TypeError("aiter() requires an AsyncAPIClient; use iter() with APIClient")
+        symbols = list(dict.fromkeys(symbols))
+        params = self._params(params)
+        _, report, close = self._reporter(len(symbols))
+        pending = set()
+        try:
+            for symbol in symbols:
+                pending.add(asyncio.ensure_future(self._afetch(symbol, params)))
+                if len(pending) >= self.max_workers:
+                    done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                    for task in done:
+                        report(task.result())
+                        yield task.result()
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    report(task.result())
+                    yield task.result()
+        finally:
+            for task in pending:
+                task.cancel()
+            close()
+
+    def download(self, symbols, **params):
+        """
+        Download price history for every symbol and collect the responses.
+
+        Args:
+            symbols (iterable): The symbols.
+            **params: PriceHistory.by_symbol parameters shared by every symbol.
+
+        Returns:
+            BulkHistoryResult: Responses keyed by symbol, with errors for symbols that failed.
+        """
+        results = BulkHistoryResult()
+        for result in self.iter(symbols, **params):
+            if result.error is not None:
+                results.errors[result.symbol] = result.error
+            else:
+                results[result.symbol] = result.response
+        results.progress = self.progress
+        return results
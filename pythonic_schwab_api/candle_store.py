@@ -0,0 +1,260 @@
+"""
+This module provides CandleStore, a persistent on-disk cache of price history candles.
+
+Candles are stored per symbol and frequency as a flat binary file of fixed
+size records (see CANDLE_DTYPE) sorted by time, read back through
+numpy.memmap, next to a small JSON file recording which time ranges have
+been fetched. PriceHistory consults the store first and only requests the
+ranges it does not cover yet; new candles are appended, or, if they overlap
+stored ones, replace stored candles from the first new timestamp onwards in
+a file swapped in atomically.
+
+Layout:
+    <root>/<frequencyType>-<frequency>[-ext]/<SYMBOL>.candles
+    <root>/<frequencyType>-<frequency>[-ext]/<SYMBOL>.json
+"""
+
+import json
+import os
+import tempfile
+import threading
+import time
+import urllib.parse as urll
+
+import numpy as np
+
+CANDLE_DTYPE = np.dtype([
+    ('datetime', '<i8'),  # Candle start, epoch milliseconds
+    ('open', '<f8'),
+    ('high', '<f8'),
+    ('low', '<f8'),
+    ('close', '<f8'),
+    ('volume', '<i8')
+])
+# Length of one bar in milliseconds per frequencyType unit
+BAR_MS = {'minute': 60000, 'daily': 86400000, 'weekly': 7 * 86400000, 'monthly': 31 * 86400000}
+
+
+def frequency_key(frequency_type, frequency=1, extended_hours=False):
+    """Return the store key for a candle frequency, e.g. 'minute-5' or 'daily-1'."""
+    return f"{frequency_type}-{frequency}{'-ext' if extended_hours else ''}"
+
+
+def merge_ranges(ranges):
+    """Merge overlapping or adjacent inclusive (start, end) ranges."""
+    merged = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1] + 1:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+    return merged
+
+
+def missing_ranges(coverage, start, end):
+    """Return the inclusive sub-ranges of (start, end) not covered by the merged coverage ranges."""
+    gaps = []
+    cursor = start
+    for covered_start, covered_end in coverage:
+        if covered_end < cursor:
+            continue
+        if covered_start > end:
+            break
+        if covered_start > cursor:
+            gaps.append((cursor, covered_start - 1))
+        cursor = max(cursor, covered_end + 1)
+    if cursor <= end:
+        gaps.append((cursor, end))
+    return gaps
+
+
+def to_records(candles):
+    """Convert API candle dicts to a CANDLE_DTYPE array sorted by time."""
+    records = np.array([(c['datetime'], c['open'], c['high'], c['low'], c['close'], c.get('volume', 0))
+                        for c in candles], dtype=CANDLE_DTYPE)
+    return np.sort(records, order='datetime', kind='stable')
+
+
+def to_candles(records):
+    """Convert a CANDLE_DTYPE array back to API candle dicts."""
+    return [{'open': row[1], 'high': row[2], 'low': row[3], 'close': row[4], 'volume': row[5], 'datetime': row[0]}
+            for row in records.tolist()]
+
+
+class CandleStore:
+    """
+    A persistent candle cache rooted at a directory.
+
+    Attributes:
+        root (str): Directory holding one subdirectory per frequency key.
+    """
+
+    def __init__(self, root):
+        """
+        Initialize the CandleStore.
+
+        Args:
+            root (str): Directory to store candles in; created if missing.
+        """
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+        self._locks = {}
+        self._locks_lock = threading.Lock()
+
+    def _paths(self, symbol, key):
+        directory = os.path.join(self.root, key)
+        name = urll.quote(symbol, safe='')
+        return os.path.join(directory, f"{name}.candles"), os.path.join(directory, f"{name}.json")
+
+    def _lock(self, symbol, key):
+        with self._locks_lock:
+            return self._locks.setdefault((symbol, key), threading.Lock())
+
+    def _metadata(self, meta_path):
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {'rows': 0, 'coverage': []}
+
+    @staticmethod
+    def _replace(path, data, mode='wb'):
+        """Atomically replace path with data."""
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+        try:
+            with os.fdopen(fd, mode) as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+
+    @staticmethod
+    def _append(path, rows, records):
+        """Append records after the first rows of a data file, dropping bytes left by an interrupted write."""
+        size = rows * CANDLE_DTYPE.itemsize
+        if os.path.exists(path) and os.path.getsize(path) > size:
+            os.truncate(path, size)
+        with open(path, 'ab') as f:
+            f.write(records.tobytes())
+            f.flush()
+            os.fsync(f.fileno())
+
+    def coverage(self, symbol, key):
+        """
+        Return the time ranges already fetched for a symbol.
+
+        Args:
+            symbol (str): The symbol.
+            key (str): The frequency key, see frequency_key().
+
+        Returns:
+            list: Merged inclusive [start, end] ranges in epoch milliseconds.
+        """
+        return self._metadata(self._paths(symbol, key)[1])['coverage']
+
+    def missing(self, symbol, key, start, end):
+        """
+        Return the parts of a time range that have not been fetched yet.
+
+        Args:
+            symbol (str): The symbol.
+            key (str): The frequency key.
+            start (int): Range start, epoch milliseconds (inclusive).
+            end (int): Range end, epoch milliseconds (inclusive).
+
+        Returns:
+            list: Inclusive (start, end) ranges to fetch.
+        """
+        return missing_ranges(self.coverage(symbol, key), start, end)
+
+    def read(self, symbol, key, start=None, end=None):
+        """
+        Read candles from disk.
+
+        Args:
+            symbol (str): The symbol.
+            key (str): The frequency key.
+            start (int, optional): Earliest candle time, epoch milliseconds (inclusive).
+            end (int, optional): Latest candle time, epoch milliseconds (inclusive).
+
+        Returns:
+            np.ndarray: A read-only memory-mapped CANDLE_DTYPE array sorted by time. Later writes
+                replace the file rather than modify it, so the array keeps its contents.
+        """
+        data_path, meta_path = self._paths(symbol, key)
+        rows = self._metadata(meta_path)['rows']
+        if not rows:
+            return np.empty(0, dtype=CANDLE_DTYPE)
+        records = np.memmap(data_path, dtype=CANDLE_DTYPE, mode='r', shape=(rows,))
+        times = records['datetime']
+        low = 0 if start is None else np.searchsorted(times, start, side='left')
+        high = rows if end is None else np.searchsorted(times, end, side='right')
+        return records[low:high]
+
+    def write(self, symbol, key, candles, start=None, end=None):
+        """
+        Store fetched candles and mark a time range as covered.
+
+        Candles newer than every stored candle are appended. Otherwise stored
+        candles at or after the first new candle are replaced: the data file is
+        written to a temporary file and renamed over the old one, so arrays
+        returned by read() earlier keep their contents and never lose their
+        backing pages.
+
+        Args:
+            symbol (str): The symbol.
+            key (str): The frequency key.
+            candles (list or np.ndarray): API candle dicts or a CANDLE_DTYPE array.
+            start (int, optional): Start of the range to mark as covered, epoch milliseconds (inclusive).
+            end (int, optional): End of the range to mark as covered, epoch milliseconds (inclusive).
+        """
+        if isinstance(candles, np.ndarray):
+            new = np.sort(candles.astype(CANDLE_DTYPE, copy=False), order='datetime', kind='stable')
+        else:
+            new = to_records(candles)
+        data_path, meta_path = self._paths(symbol, key)
+        os.makedirs(os.path.dirname(data_path), exist_ok=True)
+        with self._lock(symbol, key):
+            meta = self._metadata(meta_path)
+            rows = meta['rows']
+            coverage = meta['coverage']
+            if len(new):
+                first = int(new['datetime'][0])
+                position = int(np.searchsorted(self.read(symbol, key)['datetime'], first, side='left'))
+                if position < rows:
+                    tail = np.fromfile(data_path, dtype=CANDLE_DTYPE, count=rows - position,
+                                       offset=position * CANDLE_DTYPE.itemsize)
+                    merged = np.concatenate([new, tail])  # new rows first so they win on duplicates
+                    new = merged[np.unique(merged['datetime'], return_index=True)[1]]
+                    # Record the truncated state first, so an interrupted write leaves it consistent
+                    interim = [[s, min(e, first - 1)] for s, e in coverage if s < first]
+                    self._replace(meta_path, json.dumps({'rows': position, 'coverage': interim}), mode='w')
+                    # Replace the file rather than rewrite it in place: arrays already mapped by
+                    # read() keep the old file, and the file never shrinks under a reader
+                    head = np.fromfile(data_path, dtype=CANDLE_DTYPE, count=position) if position else new[:0]
+                    self._replace(data_path, head.tobytes() + new.tobytes())
+                else:
+                    self._append(data_path, rows, new)
+                rows = position + len(new)
+            if start is not None and end is not None and end >= start:
+                coverage = merge_ranges(coverage + [[start, end]])
+            meta = {'rows': rows, 'coverage': coverage, 'updated': int(time.time() * 1000)}
+            self._replace(meta_path, json.dumps(meta), mode='w')
+
+    def symbols(self, key):
+        """
+        List the symbols stored for a frequency key.
+
+        Args:
+            key (str): The frequency key.
+
+        Returns:
+            list: Symbols with stored candles.
+        """
+        directory = os.path.join(self.root, key)
+        if not os.path.isdir(directory):
+            return []
+        return sorted(urll.unquote(name[:-len('.json')]) for name in os.listdir(directory) if name.endswith('.json'))
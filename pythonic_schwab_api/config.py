@@ -2,16 +2,23 @@
 Configuration module for Schwab API.
 
 This module loads environment variables and sets up the API configuration
-based on whether the sandbox mode is enabled or not.
+based on whether the sandbox mode is enabled or not. The .env file is read
+when the first APIConfig is created rather than at import time.
 """
 
+import functools
 import os
-from dotenv import load_dotenv
 
-load_dotenv()
 SANDBOX = False
 
 
+@functools.lru_cache(maxsize=None)
+def load_environment():
+    """Load variables from the .env file into the environment, once per process."""
+    from dotenv import load_dotenv  # pylint: disable=import-outside-toplevel
+    load_dotenv()
+
+
 class APIConfig:
     """
     Initializes the APIConfig object with the provided initials.
@@ -20,6 +27,7 @@ class APIConfig:
         initials (str): The initials used for configuration.
     """
     def __init__(self, initials):
+        load_environment()
         self.initials = initials
         if SANDBOX:
             self.api_base_url = "http://localhost:4020"
@@ -40,7 +48,75 @@ class APIConfig:
             'total': 3,  # Total number of retries to allow
             'backoff_factor': 1  # Factor by which the delay between retries will increase
         }
+        self.connection_pool = {
+            'pool_connections': 10,  # Number of host connection pools to cache per endpoint family
+            'pool_maxsize': 32  # Maximum number of connections kept open per host
+        }
+        # Optional per-family overrides of the settings above, keyed by 'trader', 'marketdata' or 'orders',
+        # e.g. {'marketdata': {'pool_maxsize': 64, 'timeout': 10}, 'orders': {'retry_strategy': None}}
+        self.endpoint_connection_settings = {}
+        self.rate_limit = {
+            'requests': 120,  # Requests allowed per period for the whole app (None disables limiting)
+            'period': 60  # Length of the rate limit period in seconds
+        }
+        self.endpoint_rate_limits = {}  # Optional per-family limits, e.g. {'orders': {'requests': 120, 'period': 60}}
+        self.response_cache = {
+            'enabled': False,  # Opt in to caching slow-changing GET responses in memory
+            'max_entries': 1024,  # Maximum number of cached responses
+            'max_bytes': 32 * 1024 * 1024,  # Maximum total size of cached response bodies
+            'ttls': {  # Seconds to cache responses for, keyed by regex matched against the request URL
+                r'/markets(/[^/]+)?$': 3600,
+                r'/instruments(/[^/]+)?$': 86400,
+                r'/userPreference$': 3600
+            }
+        }
+        self.quote_batching = {
+            'chunk_size': 500,  # Maximum symbols per /quotes request; longer lists are split into chunks
+            'max_workers': 8  # Chunks fetched concurrently, still paced by the rate limiter
+        }
+        self.quote_polling = {
+            'intervals': {  # Seconds between QuotePoller polls, by the market's session when a calendar is given
+                'regular': 2,
+                'extended': 10,
+                'closed': 300
+            }
+        }
+        self.bulk_history = {
+            'max_workers': 8,  # Symbols fetched concurrently by BulkPriceHistory, still paced by the rate limiter
+            'retries': 3,  # Attempts per symbol after the first one fails, used only if the marketdata retry_strategy is disabled
+            'backoff_factor': 1  # Seconds before the first retry, doubled for each further retry
+        }
+        self.transaction_sync = {
+            'window_days': 365,  # Longest date range per transactions request (the API allows one year)
+            'max_results': 3000,  # Transactions the API returns at most per request; full windows are split
+            'max_workers': 8  # Windows fetched concurrently by Accounts.iter_transactions, still rate limited
+        }
+        self.transaction_ledger = {
+            'path': 'schwab_ledger.db',  # SQLite database TransactionLedger stores transactions in
+            'initial_days': 730,  # Days of history fetched the first time an account is synced
+            'overlap_days': 3  # Days before the watermark fetched again, for activity posted late
+        }
+        self.market_calendar = {
+            'days': 14,  # Days of session hours MarketCalendar prefetches, including today
+            'path': None,  # JSON file MarketCalendar persists sessions to (None keeps them in memory)
+            'max_workers': 4  # Dates fetched concurrently, still paced by the rate limiter
+        }
+        self.instrument_index = {
+            'path': 'schwab_instruments.db',  # SQLite database InstrumentIndex stores instruments in
+            'ttl': 7 * 86400,  # Seconds before a stored instrument, or an unknown symbol/CUSIP, is fetched again
+            'batch_size': 200,  # Symbols per symbol-search request in bulk loads
+            'max_workers': 8  # Requests made concurrently in bulk loads, still paced by the rate limiter
+        }
+        self.json_backend = 'auto'  # 'auto', 'orjson', 'simdjson', 'ujson' or 'json'
+        self.metrics_enabled = False  # Record per-endpoint request counts, retries, bytes and latency
+        self.coalesce_requests = False  # Let identical concurrent GET requests share one round-trip; callers then share one result dict and must not mutate it
         self.token_refresh_threshold_seconds = 300  # seconds before token expiration to attempt refresh
+        self.background_token_refresh = True  # Renew the access token in a background thread before it expires
+        self.token_store = {
+            'backend': 'json',  # 'json' for a locked JSON file, 'sqlite' for a SQLite database
+            'path': None,  # Defaults to schwab_token_data_{initials}.json or schwab_tokens.db
+            'poll_interval': 5  # Seconds between checks for tokens refreshed by other processes
+        }
         self.debug_mode = False
         self.logging_config = {
             'level': 'INFO',
@@ -49,3 +125,17 @@ class APIConfig:
         self.app_key = os.getenv(f'SCHWAB_APP_KEY_{self.initials}')
         self.app_secret = os.getenv(f'SCHWAB_APP_SECRET_{self.initials}')
         self.callback_url = os.getenv('CALLBACK_URL')
+
+    def endpoint_settings(self, family):
+        """
+        Return the connection settings for an endpoint family.
+
+        Parameters:
+            family (str): The endpoint family ('trader', 'marketdata' or 'orders').
+
+        Returns:
+            dict: The timeout, retry_strategy, pool_connections and pool_maxsize to use.
+        """
+        settings = {'timeout': self.request_timeout, 'retry_strategy': self.retry_strategy, **self.connection_pool}
+        settings.update(self.endpoint_connection_settings.get(family, {}))
+        return settings
@@ -0,0 +1,16 @@
+"""
+This module defines the exceptions raised by the Schwab API client.
+"""
+
+
+class SchwabAPIError(Exception):
+    """Base class for errors raised by this package."""
+
+
+class AuthenticationRequiredError(SchwabAPIError):
+    """
+    Raised by a non-interactive client when no valid token is available.
+
+    Interactive clients run the manual authorization flow instead; this error
+    lets workers that cannot open a browser or read stdin fail fast.
+    """
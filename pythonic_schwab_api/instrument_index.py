@@ -0,0 +1,350 @@
+"""
+This module provides InstrumentIndex, a persistent local index of instruments backed by SQLite.
+
+Instruments are looked up by symbol or CUSIP in a local SQLite database and
+only fetched through Instruments when missing or older than the configured
+TTL. Bulk loads batch symbols into comma-separated symbol-search requests
+and fan CUSIP lookups out over a thread pool, all paced by the client's rate
+limiter. CUSIPs the API does not know are remembered for the TTL as well, so
+reconciliation jobs do not ask for them again. Descriptions can be searched
+by prefix through an index, or fuzzily with difflib.
+
+Usage example:
+    index = InstrumentIndex(client, path="instruments.db")
+    symbols = index.resolve_cusips(cusips)  # {cusip: symbol}
+    index.search("APPLE")
+    index.fuzzy_search("aple inc")
+"""
+
+import contextlib
+import difflib
+import json
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from pythonic_schwab_api.market_data import Instruments
+
+SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS instruments (symbol TEXT PRIMARY KEY, cusip TEXT, description TEXT, "
+    "search TEXT, exchange TEXT, asset_type TEXT, data TEXT NOT NULL, fetched REAL NOT NULL)",
+    "CREATE INDEX IF NOT EXISTS instruments_cusip ON instruments (cusip)",
+    "CREATE INDEX IF NOT EXISTS instruments_search ON instruments (search)",
+    "CREATE TABLE IF NOT EXISTS misses (key TEXT PRIMARY KEY, fetched REAL NOT NULL)"
+)
+PREFIX_END = '\U0010ffff'  # Sorts after every character, closing a prefix range
+
+
+class InstrumentIndex:
+    """
+    Local symbol/CUSIP/description index of instruments.
+
+    Attributes:
+        client (APIClient): The client instruments are fetched through.
+        instruments (Instruments): Instruments bound to the client.
+        path (str): Path of the SQLite database.
+        ttl (float): Seconds before a stored instrument or miss is fetched again.
+        batch_size (int): Symbols per symbol-search request in bulk loads.
+        max_workers (int): Requests made concurrently in bulk loads.
+    """
+
+    def __init__(self, client, path=None, ttl=None, batch_size=None, max_workers=None):
+        """
+        Initialize the InstrumentIndex and create its tables if needed.
+
+        Args:
+            client (APIClient): The client to fetch instruments through.
+            path (str, optional): Path of the SQLite database. Defaults to config.instrument_index['path'].
+            ttl (float, optional): Seconds stored entries stay fresh. Defaults to config.instrument_index['ttl'].
+            batch_size (int, optional): Symbols per bulk request. Defaults to config.instrument_index.
+            max_workers (int, optional): Concurrent bulk requests. Defaults to config.instrument_index.
+        """
+        settings = client.config.instrument_index
+        self.client = client
+        self.instruments = Instruments(client)
+        self.path = path or settings['path']
+        self.ttl = settings['ttl'] if ttl is None else ttl
+        self.batch_size = batch_size or settings['batch_size']
+        self.max_workers = max_workers or settings['max_workers']
+        self._local = threading.local()
+        self._descriptions = None
+        with self._transaction() as conn:
+            for statement in SCHEMA:
+                conn.execute(statement)
+
+    def _connection(self):
+        """Return this thread's connection to the database."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = self._local.conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.row_factory = sqlite3.Row
+        return conn
+
+    @contextlib.contextmanager
+    def _transaction(self):
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    def close(self):
+        """Close this thread's connection to the database."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    def __len__(self):
+        return self._connection().execute("SELECT COUNT(*) FROM instruments").fetchone()[0]
+
+    def _fresh(self, fetched):
+        return fetched is not None and time.time() - fetched < self.ttl
+
+    def store(self, instruments):
+        """
+        Store instruments, replacing stored entries with the same symbol.
+
+        Args:
+            instruments (list): Instrument dicts as found in an /instruments response.
+        """
+        now = time.time()
+        rows = [(item['symbol'], item.get('cusip'), item.get('description'), (item.get('description') or '').upper(),
+                 item.get('exchange'), item.get('assetType'), json.dumps(item), now)
+                for item in instruments if item.get('symbol')]
+        if not rows:
+            return
+        with self._transaction() as conn:
+            conn.executemany("INSERT OR REPLACE INTO instruments VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows)
+            conn.executemany("DELETE FROM misses WHERE key = ?", [(row[0],) for row in rows if row[0]] +
+                             [(row[1],) for row in rows if row[1]])
+        self._descriptions = None
+
+    def _store_misses(self, keys):
+        if keys:
+            now = time.time()
+            with self._transaction() as conn:
+                conn.executemany("INSERT OR REPLACE INTO misses VALUES (?, ?)", [(key, now) for key in keys])
+
+    def _lookup(self, column, values):
+        """Return {value: (instrument, fetched)} for stored rows matching column."""
+        found = {}
+        values = list(values)
+        conn = self._connection()
+        for start in range(0, len(values), 500):  # stay under SQLite's bound parameter limit
+            chunk = values[start:start + 500]
+            placeholders = ','.join('?' * len(chunk))
+            for row in conn.execute(f"SELECT {column}, data, fetched FROM instruments "
+                                    f"WHERE {column} IN ({placeholders})", chunk):
+                found[row[0]] = (json.loads(row['data']), row['fetched'])
+        return found
+
+    def _missed(self, keys):
+        """Return the keys recorded as unknown to the API within the TTL."""
+        conn = self._connection()
+        missed = set()
+        keys = list(keys)
+        for start in range(0, len(keys), 500):
+            chunk = keys[start:start + 500]
+            rows = conn.execute(f"SELECT key, fetched FROM misses WHERE key IN ({','.join('?' * len(chunk))})", chunk)
+            missed.update(key for key, fetched in rows if self._fresh(fetched))
+        return missed
+
+    def _fetch_symbols(self, batch):
+        response = self.instruments.by_symbol(','.join(batch), 'symbol-search') or {}
+        return response.get('instruments') or []
+
+    def _fetch_cusip(self, cusip):
+        try:
+            response = self.instruments.by_cusip(cusip) or {}
+        except self.client.request_errors as e:
+            if getattr(getattr(e, 'response', None), 'status_code', None) == 404:
+                return None
+            raise
+        instruments = response.get('instruments') or []
+        return instruments[0] if instruments else None
+
+    def load_symbols(self, symbols, force=False):
+        """
+        Make sure instruments for symbols are stored, fetching missing or stale ones in batches.
+
+        Args:
+            symbols (iterable): The symbols.
+            force (bool, optional): Refetch even fresh entries.
+
+        Returns:
+            dict: Instrument dicts keyed by symbol, for the symbols the API knows.
+        """
+        symbols = list(dict.fromkeys(symbols))
+        found = {} if force else self._lookup('symbol', symbols)
+        result = {symbol: item for symbol, (item, fetched) in found.items() if self._fresh(fetched)}
+        wanted = [symbol for symbol in symbols if symbol not in result]
+        if not force:
+            missed = self._missed(wanted)
+            wanted = [symbol for symbol in wanted if symbol not in missed]
+        if not wanted:
+            return result
+        batches = [wanted[start:start + self.batch_size] for start in range(0, len(wanted), self.batch_size)]
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(batches))) as pool:
+            fetched = [item for items in pool.map(self._fetch_symbols, batches) for item in items
+                       if item.get('symbol')]
+        self.store(fetched)
+        requested = set(wanted)
+        result.update((item['symbol'], item) for item in fetched if item['symbol'] in requested)
+        self._store_misses([symbol for symbol in wanted if symbol not in result])
+        self.client.logger.debug("Loaded %d of %d requested instruments", len(fetched), len(wanted))
+        return result
+
+    def load_cusips(self, cusips, force=False):
+        """
+        Make sure instruments for CUSIPs are stored, fetching missing or stale ones concurrently.
+
+        Args:
+            cusips (iterable): The CUSIPs.
+            force (bool, optional): Refetch even fresh entries.
+
+        Returns:
+            dict: Instrument dicts keyed by CUSIP, for the CUSIPs the API knows.
+        """
+        cusips = list(dict.fromkeys(cusips))
+        found = {} if force else self._lookup('cusip', cusips)
+        result = {cusip: item for cusip, (item, fetched) in found.items() if self._fresh(fetched)}
+        wanted = [cusip for cusip in cusips if cusip not in result]
+        if not force:
+            missed = self._missed(wanted)
+            wanted = [cusip for cusip in wanted if cusip not in missed]
+        if not wanted:
+            return result
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(wanted))) as pool:
+            fetched = dict(zip(wanted, pool.map(self._fetch_cusip, wanted)))
+        self.store([item for item in fetched.values() if item])
+        result.update((cusip, item) for cusip, item in fetched.items() if item)
+        self._store_misses([cusip for cusip, item in fetched.items() if not item])
+        return result
+
+    def by_symbol(self, symbol):
+        """
+        Get an instrument by symbol, fetching it if it is not stored or stale.
+
+        Args:
+            symbol (str): The symbol.
+
+        Returns:
+            dict: The instrument, or None if the API does not know the symbol.
+        """
+        return self.load_symbols([symbol]).get(symbol)
+
+    def by_cusip(self, cusip):
+        """
+        Get an instrument by CUSIP, fetching it if it is not stored or stale.
+
+        Args:
+            cusip (str): The CUSIP.
+
+        Returns:
+            dict: The instrument, or None if the API does not know the CUSIP.
+        """
+        return self.load_cusips([cusip]).get(cusip)
+
+    def resolve_cusips(self, cusips):
+        """
+        Map CUSIPs to symbols, fetching only those not stored yet.
+
+        Args:
+            cusips (iterable): The CUSIPs.
+
+        Returns:
+            dict: Symbols keyed by CUSIP, for the CUSIPs the API knows.
+        """
+        return {cusip: item['symbol'] for cusip, item in self.load_cusips(cusips).items()}
+
+    def resolve_symbols(self, symbols):
+        """
+        Map symbols to CUSIPs, fetching only those not stored yet.
+
+        Args:
+            symbols (iterable): The symbols.
+
+        Returns:
+            dict: CUSIPs keyed by symbol, for the symbols the API knows and that have a CUSIP.
+        """
+        return {symbol: item['cusip'] for symbol, item in self.load_symbols(symbols).items() if item.get('cusip')}
+
+    def load_search(self, term, projection='desc-search'):
+        """
+        Store every instrument matching an API search, e.g. to seed the index.
+
+        Args:
+            term (str): The search term or regex.
+            projection (str, optional): 'desc-search', 'desc-regex', 'symbol-regex' or 'symbol-search'.
+
+        Returns:
+            int: Number of instruments stored.
+        """
+        instruments = (self.instruments.by_symbol(term, projection) or {}).get('instruments') or []
+        self.store(instruments)
+        return len(instruments)
+
+    def search(self, prefix, limit=20):
+        """
+        Find stored instruments whose symbol or description starts with a prefix (case-insensitive).
+
+        Args:
+            prefix (str): The prefix.
+            limit (int, optional): Maximum number of results.
+
+        Returns:
+            list: Instrument dicts, symbol matches first.
+        """
+        prefix = prefix.upper()
+        bounds = (prefix, prefix + PREFIX_END)
+        conn = self._connection()
+        rows = conn.execute("SELECT symbol, data FROM instruments WHERE symbol BETWEEN ? AND ? "
+                            "ORDER BY symbol LIMIT ?", (*bounds, limit)).fetchall()
+        rows += conn.execute("SELECT symbol, data FROM instruments WHERE search BETWEEN ? AND ? "
+                             "ORDER BY search LIMIT ?", (*bounds, limit)).fetchall()
+        results = {}
+        for symbol, data in rows:
+            results.setdefault(symbol, data)
+        return [json.loads(data) for data in list(results.values())[:limit]]
+
+    def fuzzy_search(self, text, limit=10, cutoff=0.6):
+        """
+        Find stored instruments whose description is similar to a text.
+
+        Args:
+            text (str): The text to match, e.g. a misspelled company name.
+            limit (int, optional): Maximum number of results.
+            cutoff (float, optional): Minimum difflib similarity ratio between 0 and 1.
+
+        Returns:
+            list: Instrument dicts, best matches first.
+        """
+        if self._descriptions is None:
+            descriptions = {}
+            for symbol, search in self._connection().execute("SELECT symbol, search FROM instruments"):
+                descriptions.setdefault(search or '', []).append(symbol)
+            self._descriptions = descriptions
+        matches = difflib.get_close_matches(text.upper(), list(self._descriptions), n=limit, cutoff=cutoff)
+        symbols = [symbol for match in matches for symbol in self._descriptions[match]][:limit]
+        found = self._lookup('symbol', symbols)
+        return [found[symbol][0] for symbol in symbols if symbol in found]
+
+    def refresh_stale(self):
+        """
+        Refetch every stored instrument older than the TTL.
+
+        Returns:
+            int: Number of instruments refetched.
+        """
+        cutoff = time.time() - self.ttl
+        stale = [row[0] for row in self._connection().execute(
+            "SELECT symbol FROM instruments WHERE fetched <= ?", (cutoff,))]
+        if stale:
+            self.load_symbols(stale, force=True)
+        return len(stale)
@@ -0,0 +1,114 @@
+"""
+This module provides the JSON codec used by the REST and stream clients.
+
+A codec decodes directly from response bytes and encodes to str. The fastest
+installed backend is picked automatically (orjson, then pysimdjson, then
+ujson, falling back to the standard library), or one can be chosen through
+APIConfig.json_backend. Every backend raises json.JSONDecodeError on bad input.
+"""
+
+import importlib
+import json
+
+AUTO_BACKENDS = ('orjson', 'simdjson', 'ujson', 'json')
+
+
+class JSONCodec:
+    """
+    A named pair of JSON decode/encode functions.
+
+    Attributes:
+        name (str): The backend name.
+    """
+
+    def __init__(self, name, loads, dumps):
+        """
+        Initialize the JSONCodec.
+
+        Args:
+            name (str): The backend name.
+            loads (callable): Decodes bytes or str into Python objects.
+            dumps (callable): Encodes Python objects into str.
+        """
+        self.name = name
+        self._loads = loads
+        self.dumps = dumps
+
+    def __repr__(self):
+        return f"JSONCodec({self.name!r})"
+
+    def loads(self, data):
+        """
+        Decode JSON from bytes or str.
+
+        Args:
+            data (bytes or str): The JSON document.
+
+        Returns:
+            The decoded Python object.
+
+        Raises:
+            json.JSONDecodeError: If the document is not valid JSON.
+        """
+        try:
+            return self._loads(data)
+        except json.JSONDecodeError:
+            raise
+        except ValueError as e:
+            doc = data.decode('utf-8', 'replace') if isinstance(data, (bytes, bytearray)) else data
+            raise json.JSONDecodeError(str(e), doc, 0) from e
+
+
+def _build(name):
+    """Build the codec for a backend, raising ImportError if it is not installed."""
+    if name == 'json':
+        return JSONCodec('json', json.loads, json.dumps)
+    module = importlib.import_module(name)
+    if name == 'orjson':
+        return JSONCodec('orjson', module.loads, lambda obj: module.dumps(obj).decode())
+    if name == 'simdjson':
+        return JSONCodec('simdjson', module.loads, json.dumps)
+    if name == 'ujson':
+        return JSONCodec('ujson', module.loads, module.dumps)
+    raise ValueError(f"Unknown JSON backend: {name}")
+
+
+def get_codec(backend='auto'):
+    """
+    Return a JSON codec.
+
+    Args:
+        backend (str, optional): 'orjson', 'simdjson', 'ujson', 'json', or 'auto'
+            for the fastest installed one. Defaults to 'auto'.
+
+    Returns:
+        JSONCodec: The codec.
+
+    Raises:
+        ImportError: If the requested backend is not installed.
+    """
+    if backend != 'auto':
+        return _build(backend)
+    for name in AUTO_BACKENDS:
+        try:
+            return _build(name)
+        except ImportError:
+            continue
+    return _build('json')
+
+
+def available_backends():
+    """
+    List the JSON backends installed in this environment.
+
+    Returns:
+        list: Backend names in order of preference.
+    """
+    names = []
+    for name in AUTO_BACKENDS:
+        try:
+            _build(name)
+        except ImportError:
+            continue
+        names.append(name)
+    return names
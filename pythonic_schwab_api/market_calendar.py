@@ -0,0 +1,332 @@
+"""
+This module provides MarketCalendar, a local market session calendar built on MarketHours.
+
+The calendar prefetches the session hours (pre-market, regular and
+post-market) of every market for the coming days through MarketHours, one
+request per date fanned out over a small thread pool, and keeps them as
+sorted lists of epoch-second intervals. Questions such as "is the market
+open?" or "when does it next open?" are then answered locally with bisect.
+The sessions are persisted to a JSON file so a restart does not refetch them,
+and the calendar refreshes itself once per day on first use.
+
+Usage example:
+    calendar = MarketCalendar(client, path="market_calendar.json")
+    if calendar.is_open():
+        ...
+    minutes = calendar.trading_minutes(start, end)
+"""
+
+import bisect
+import datetime
+import json
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from pythonic_schwab_api.market_data import MarketHours
+
+MARKETS = ('equity', 'option', 'bond', 'future', 'forex')
+SESSIONS = ('preMarket', 'regularMarket', 'postMarket')
+SECONDS_PER_DAY = 86400
+
+
+def to_timestamp(when):
+    """Convert a datetime (naive values are local time), date or epoch seconds to epoch seconds."""
+    if when is None:
+        return time.time()
+    if isinstance(when, datetime.datetime):
+        return when.timestamp()
+    if isinstance(when, datetime.date):
+        return datetime.datetime.combine(when, datetime.time()).timestamp()
+    return float(when)
+
+
+def to_datetime(timestamp):
+    """Convert epoch seconds to a timezone-aware UTC datetime."""
+    return datetime.datetime.fromtimestamp(timestamp, tz=datetime.timezone.utc)
+
+
+def parse_sessions(response, market):
+    """
+    Extract the sessions of one market from a /markets response.
+
+    Products of the market (e.g. EQO and IND for options) are combined, so a
+    session counts as open while any product trades.
+
+    Args:
+        response (dict): The /markets response.
+        market (str): The market name.
+
+    Returns:
+        dict: Merged [start, end] epoch-second intervals keyed by session name.
+    """
+    sessions = {}
+    for product in ((response or {}).get(market) or {}).values():
+        if not product.get('isOpen', True):
+            continue
+        for session, spans in (product.get('sessionHours') or {}).items():
+            for span in spans:
+                start = datetime.datetime.fromisoformat(span['start']).timestamp()
+                end = datetime.datetime.fromisoformat(span['end']).timestamp()
+                sessions.setdefault(session, []).append([start, end])
+    return {session: merge_intervals(spans) for session, spans in sessions.items()}
+
+
+def merge_intervals(intervals):
+    """Merge overlapping [start, end] intervals."""
+    merged = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+    return merged
+
+
+class SessionIndex:
+    """
+    Sorted, non-overlapping intervals of one market and set of sessions, queried with bisect.
+
+    Attributes:
+        starts (list): Interval starts, epoch seconds.
+        ends (list): Interval ends, epoch seconds.
+        elapsed (list): Cumulative seconds of the intervals before each one.
+    """
+
+    def __init__(self, intervals):
+        intervals = merge_intervals(intervals)
+        self.starts = [start for start, _ in intervals]
+        self.ends = [end for _, end in intervals]
+        self.elapsed = [0.0]
+        for start, end in intervals:
+            self.elapsed.append(self.elapsed[-1] + end - start)
+
+    def containing(self, timestamp):
+        """Return the position of the interval containing timestamp, or None."""
+        position = bisect.bisect_right(self.starts, timestamp) - 1
+        if position >= 0 and timestamp < self.ends[position]:
+            return position
+        return None
+
+    def next_start(self, timestamp):
+        """Return the position of the first interval starting after timestamp, or None."""
+        position = bisect.bisect_right(self.starts, timestamp)
+        return position if position < len(self.starts) else None
+
+    def seconds_before(self, timestamp):
+        """Return the seconds covered by intervals before timestamp."""
+        position = bisect.bisect_right(self.starts, timestamp) - 1
+        if position < 0:
+            return 0.0
+        return self.elapsed[position] + min(timestamp, self.ends[position]) - self.starts[position]
+
+
+class MarketCalendar:
+    """
+    Local session calendar for Schwab markets.
+
+    Attributes:
+        client (APIClient): The client session hours are fetched through.
+        market_hours (MarketHours): MarketHours bound to the client.
+        path (str): JSON file the sessions are persisted to, or None to keep them in memory only.
+        markets (tuple): Markets to prefetch.
+        days (int): Days ahead to prefetch, including today.
+        max_workers (int): Dates fetched concurrently.
+        refreshed (float): time.time() of the last refresh, or None.
+    """
+
+    def __init__(self, client, path=None, markets=MARKETS, days=None, max_workers=None):
+        """
+        Initialize the MarketCalendar, loading persisted sessions if path exists.
+
+        Args:
+            client (APIClient): The client to fetch session hours through.
+            path (str, optional): JSON file to persist sessions to. Defaults to config.market_calendar['path'].
+            markets (iterable, optional): Markets to prefetch. Defaults to every market.
+            days (int, optional): Days ahead to prefetch. Defaults to config.market_calendar['days'].
+            max_workers (int, optional): Dates fetched concurrently. Defaults to config.market_calendar.
+        """
+        settings = client.config.market_calendar
+        self.client = client
+        self.market_hours = MarketHours(client)
+        self.path = path or settings['path']
+        self.markets = tuple(markets)
+        self.days = days or settings['days']
+        self.max_workers = max_workers or settings['max_workers']
+        self.refreshed = None
+        self._sessions = {}  # {date ISO: {market: {session: [[start, end], ...]}}}
+        self._indexes = {}
+        self._fresh_until = 0.0
+        self._lock = threading.Lock()
+        if self.path and os.path.exists(self.path):
+            self._load()
+
+    def _load(self):
+        with open(self.path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if set(self.markets) <= set(data.get('markets', [])):
+            self._sessions = data['sessions']
+            self.refreshed = data['refreshed']
+            self._fresh_until = self._next_refresh(self.refreshed)
+        else:
+            self.client.logger.info("Persisted market calendar lacks some of %s, refetching", self.markets)
+
+    def _save(self):
+        data = json.dumps({'markets': list(self.markets), 'refreshed': self.refreshed, 'sessions': self._sessions})
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(self.path)), suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                f.write(data)
+            os.replace(temp_path, self.path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+
+    @staticmethod
+    def _next_refresh(refreshed):
+        """Return the first local midnight after a refresh, when the calendar is due again."""
+        day = datetime.date.fromtimestamp(refreshed) + datetime.timedelta(days=1)
+        return to_timestamp(day)
+
+    def _fetch_date(self, date):
+        """Fetch one date's sessions for every market."""
+        response = self.market_hours.by_markets(list(self.markets), date.isoformat())
+        return date.isoformat(), {market: parse_sessions(response, market) for market in self.markets}
+
+    def refresh(self, force=False):
+        """
+        Fetch the sessions of the coming days unless they were already fetched today.
+
+        Dates already stored are kept; only missing dates are requested, unless force is set.
+
+        Args:
+            force (bool, optional): Refetch every date even if already stored.
+        """
+        with self._lock:
+            if not force and time.time() < self._fresh_until:
+                return
+            today = datetime.date.today()
+            dates = [today + datetime.timedelta(days=offset) for offset in range(self.days)]
+            if not force:
+                dates = [date for date in dates if date.isoformat() not in self._sessions]
+            if dates:
+                with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+                    fetched = dict(pool.map(self._fetch_date, dates))
+                self._sessions.update(fetched)
+            oldest = (today - datetime.timedelta(days=self.days)).isoformat()  # keep a window of past days
+            self._sessions = {date: markets for date, markets in self._sessions.items() if date >= oldest}
+            self.refreshed = time.time()
+            self._fresh_until = self._next_refresh(self.refreshed)
+            self._indexes = {}
+            if self.path:
+                self._save()
+            self.client.logger.info("Market calendar refreshed: %d dates fetched, %d stored",
+                                    len(dates), len(self._sessions))
+
+    def _index(self, market, sessions):
+        """Return the SessionIndex of a market and sessions, refreshing the calendar once a day."""
+        if time.time() >= self._fresh_until:
+            self.refresh()
+        if isinstance(sessions, str):
+            sessions = (sessions,)
+        key = (market, tuple(sessions))
+        index = self._indexes.get(key)
+        if index is None:
+            if market not in self.markets:
+                raise ValueError(f"Market {market!r} is not in this calendar's markets {self.markets}")
+            index = self._indexes[key] = SessionIndex([
+                span for day in self._sessions.values()
+                for session in sessions for span in day.get(market, {}).get(session, [])])
+        return index
+
+    def is_open(self, when=None, market='equity', sessions='regularMarket'):
+        """
+        Check whether a market is in session.
+
+        Args:
+            when (datetime or float, optional): The time to check. Defaults to now.
+            market (str, optional): The market. Defaults to 'equity'.
+            sessions (str or tuple, optional): Session names to count as open. Defaults to 'regularMarket'.
+
+        Returns:
+            bool: True if the market is in one of the sessions at that time.
+        """
+        return self._index(market, sessions).containing(to_timestamp(when)) is not None
+
+    def next_open(self, when=None, market='equity', sessions='regularMarket'):
+        """
+        Return when a market next opens after a time.
+
+        Args:
+            when (datetime or float, optional): The time to search from. Defaults to now.
+            market (str, optional): The market. Defaults to 'equity'.
+            sessions (str or tuple, optional): Session names to consider. Defaults to 'regularMarket'.
+
+        Returns:
+            datetime: The next session start (UTC), or None if none is known within the prefetched days.
+        """
+        index = self._index(market, sessions)
+        position = index.next_start(to_timestamp(when))
+        return None if position is None else to_datetime(index.starts[position])
+
+    def next_close(self, when=None, market='equity', sessions='regularMarket'):
+        """
+        Return when the current or next session of a market closes.
+
+        Args:
+            when (datetime or float, optional): The time to search from. Defaults to now.
+            market (str, optional): The market. Defaults to 'equity'.
+            sessions (str or tuple, optional): Session names to consider. Defaults to 'regularMarket'.
+
+        Returns:
+            datetime: The session end (UTC), or None if none is known within the prefetched days.
+        """
+        index = self._index(market, sessions)
+        timestamp = to_timestamp(when)
+        position = index.containing(timestamp)
+        if position is None:
+            position = index.next_start(timestamp)
+        return None if position is None else to_datetime(index.ends[position])
+
+    def session_bounds(self, date, market='equity', session='regularMarket'):
+        """
+        Return the start and end of a session on a date.
+
+        Args:
+            date (datetime.date, datetime.datetime or str): The date; the time of a datetime is ignored.
+            market (str, optional): The market. Defaults to 'equity'.
+            session (str, optional): The session name. Defaults to 'regularMarket'.
+
+        Returns:
+            tuple: (start, end) UTC datetimes, or None if the market has no such session that day.
+        """
+        if time.time() >= self._fresh_until:
+            self.refresh()
+        if isinstance(date, datetime.datetime):
+            date = date.date()
+        date = date if isinstance(date, str) else date.isoformat()
+        spans = self._sessions.get(date, {}).get(market, {}).get(session)
+        if not spans:
+            return None
+        return to_datetime(spans[0][0]), to_datetime(spans[-1][1])
+
+    def trading_minutes(self, start, end, market='equity', sessions='regularMarket'):
+        """
+        Return the minutes a market is in session between two times.
+
+        Args:
+            start (datetime or float): Start of the period.
+            end (datetime or float): End of the period.
+            market (str, optional): The market. Defaults to 'equity'.
+            sessions (str or tuple, optional): Session names to count. Defaults to 'regularMarket'.
+
+        Returns:
+            float: Minutes in session, counted over the prefetched days only.
+        """
+        index = self._index(market, sessions)
+        start, end = to_timestamp(start), to_timestamp(end)
+        if end <= start:
+            return 0.0
+        return (index.seconds_before(end) - index.seconds_before(start)) / 60
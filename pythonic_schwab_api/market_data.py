@@ -2,8 +2,28 @@
 This module provides classes to interact with market data endpoints of the Schwab API.
 """
 
+import asyncio
 import datetime
 import urllib.parse as urll
+from concurrent.futures import ThreadPoolExecutor
+
+
+class QuoteResult(dict):
+    """
+    Quotes keyed by symbol, merged from one or more chunked /quotes requests.
+
+    :ivar errors: Exception raised by each failed chunk, keyed by the tuple of symbols in the chunk.
+    :ivar invalid_symbols: Symbols (and CUSIPs/SSIDs) the API reported as invalid.
+    """
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.errors = {}
+        self.invalid_symbols = []
+
+    @property
+    def failed_symbols(self):
+        """Symbols whose chunk failed."""
+        return [symbol for chunk in self.errors for symbol in chunk]
 
 
 class Quotes:
@@ -17,23 +37,80 @@ class Quotes:
         :param client: The client instance to make requests.
         """
         self.client = client
-        self.base_url = client.config.MARKET_DATA_BASE_URL
+        self.base_url = client.config.market_data_base_url
 
     def get_list(self, symbols=None, fields=None, indicative=False):
         """
         Get a list of quotes for the given symbols.
 
+        Lists longer than ``config.quote_batching['chunk_size']`` are split into
+        chunks that are fetched concurrently and merged. A failed chunk is
+        recorded in the result's ``errors`` instead of failing the whole call;
+        the error is raised only if every chunk fails.
+
         :param symbols: List of symbols to get quotes for.
         :param fields: Fields to include in the response.
         :param indicative: Whether to include indicative quotes.
-        :return: Response from the API.
+        :return: QuoteResult mapping each symbol to its quote.
         """
-        params = {
-            'symbols': ','.join(symbols) if symbols else None,
+        chunks = self._chunk_symbols(symbols)
+        if len(chunks) == 1:
+            return self._merge(chunks, [self._fetch_chunk(chunks[0], fields, indicative)])
+        workers = min(self.client.config.quote_batching['max_workers'], len(chunks))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            outcomes = list(pool.map(lambda chunk: self._fetch_chunk(chunk, fields, indicative), chunks))
+        return self._merge(chunks, outcomes)
+
+    def get_snapshot(self, symbols=None, fields=None, indicative=False):
+        """
+        Get quotes for the given symbols as a columnar QuoteSnapshot.
+
+        :param symbols: List of symbols to get quotes for.
+        :param fields: Fields to include in the response.
+        :param indicative: Whether to include indicative quotes.
+        :return: QuoteSnapshot with one NumPy column per quote field.
+        """
+        from pythonic_schwab_api.quote_snapshot import QuoteSnapshot  # pylint: disable=import-outside-toplevel
+        return QuoteSnapshot.from_quotes(self.get_list(symbols, fields, indicative))
+
+    def _chunk_symbols(self, symbols):
+        """Split symbols, without duplicates, into lists of at most the configured chunk size."""
+        unique = list(dict.fromkeys(symbols or []))
+        size = self.client.config.quote_batching['chunk_size']
+        return [unique[start:start + size] for start in range(0, len(unique), size)] or [[]]
+
+    def _list_params(self, chunk, fields, indicative):
+        """Build the query parameters for one chunk."""
+        return {
+            'symbols': ','.join(chunk) if chunk else None,
             'fields': fields,
             'indicative': indicative
         }
-        return self.client.make_request(f"{self.base_url}/quotes", params=params)
+
+    def _fetch_chunk(self, chunk, fields, indicative):
+        """Fetch one chunk, returning the exception instead of raising it."""
+        try:
+            return self.client.make_request(f"{self.base_url}/quotes",
+                                            params=self._list_params(chunk, fields, indicative))
+        except self.client.request_errors as e:
+            return e
+
+    def _merge(self, chunks, outcomes):
+        """Merge chunk responses into a QuoteResult, raising only if every chunk failed."""
+        result = QuoteResult()
+        for chunk, outcome in zip(chunks, outcomes):
+            if isinstance(outcome, Exception):
+                self.client.logger.warning("Quotes request for %d symbols failed: %s", len(chunk), outcome)
+                result.errors[tuple(chunk)] = outcome
+            elif outcome:
+                # The API lists unknown symbols under a top-level "errors" entry, not as a quote
+                outcome = dict(outcome)
+                for invalid in (outcome.pop('errors', None) or {}).values():
+                    result.invalid_symbols.extend(invalid)
+                result.update(outcome)
+        if len(result.errors) == len(chunks):
+            raise next(iter(result.errors.values()))
+        return result
 
     def get_single(self, symbol_id, fields=None):
         """
@@ -60,7 +137,7 @@ class Options:
         :param client: The client instance to make requests.
         """
         self.client = client
-        self.base_url = f"{client.config.MARKET_DATA_BASE_URL}/chains"
+        self.base_url = f"{client.config.market_data_base_url}/chains"
 
     def get_chains(self, symbol, **kwargs):
         """
@@ -73,19 +150,65 @@ class Options:
         params = {'symbol': symbol, **kwargs}
         return self.client.make_request(self.base_url, params=params)
 
+    def get_option_chain(self, symbol, stream=False, **kwargs):
+        """
+        Get options chains for the given symbol as a columnar OptionChain.
+
+        By default the response body is kept as bytes and only decoded into
+        columns on first access. With stream=True the body is parsed
+        contract by contract as it arrives instead, so the whole document is
+        never held in memory.
+
+        :param symbol: The symbol to get options chains for.
+        :param stream: Parse the response incrementally while it downloads.
+        :param kwargs: Additional parameters for the request.
+        :return: OptionChain with one row per contract.
+        """
+        from pythonic_schwab_api.option_chain import OptionChain  # pylint: disable=import-outside-toplevel
+        if stream:
+            underlying = {}
+            return OptionChain.from_contracts(underlying, self.iter_contracts(symbol, underlying, **kwargs))
+        params = {'symbol': symbol, **kwargs}
+        response = self.client.make_request(self.base_url, params=params, raw_response=True)
+        return OptionChain.from_bytes(response.content, codec=self.client.json_codec)
+
+    def iter_contracts(self, symbol, underlying=None, **kwargs):
+        """
+        Stream the options chain for the given symbol, yielding contracts as they are downloaded.
+
+        :param symbol: The symbol to get options chains for.
+        :param underlying: Optional dict filled with the chain's top-level fields.
+        :param kwargs: Additional parameters for the request.
+        :return: Generator of (expiration key, is call, contract dict) tuples.
+        """
+        from pythonic_schwab_api import option_chain  # pylint: disable=import-outside-toplevel
+        params = {'symbol': symbol, **kwargs}
+        response = self.client.make_request(self.base_url, params=params, raw_response=True, stream=True)
+        with response:
+            yield from option_chain.iter_chain_contracts(response.iter_content(option_chain.STREAM_CHUNK_SIZE),
+                                                         underlying)
+
 
 class PriceHistory:
     """
     A class to retrieve price history.
+
+    With a CandleStore, requests that give a ``startDate`` are served from
+    disk and only the ranges the store has not covered yet are fetched.
     """
-    def __init__(self, client):
+    # frequencyType the API uses for each periodType when none is given
+    DEFAULT_FREQUENCY_TYPES = {'day': 'minute', 'month': 'weekly', 'year': 'monthly', 'ytd': 'weekly'}
+
+    def __init__(self, client, store=None):
         """
         Initialize the PriceHistory class with a client instance.
 
         :param client: The client instance to make requests.
+        :param store: Optional CandleStore to cache candles in.
         """
         self.client = client
-        self.base_url = f"{client.config.MARKET_DATA_BASE_URL}/pricehistory"
+        self.base_url = f"{client.config.market_data_base_url}/pricehistory"
+        self.store = store
 
     def by_symbol(self, symbol, **kwargs):
         """
@@ -95,8 +218,61 @@ class PriceHistory:
         :param kwargs: Additional parameters for the request.
         :return: Response from the API.
         """
-        params = {'symbol': symbol, **kwargs}
-        return self.client.make_request(self.base_url, params=params)
+        plan = self._plan(symbol, kwargs)
+        if plan is None:
+            params = {'symbol': symbol, **kwargs}
+            return self.client.make_request(self.base_url, params=params)
+        for gap in plan['gaps']:
+            self._store_gap(symbol, plan, gap, self.client.make_request(self.base_url, params=plan['params'](gap)))
+        return self._from_store(symbol, plan)
+
+    def read_candles(self, symbol, **kwargs):
+        """
+        Get price history for the given symbol as a memory-mapped candle array.
+
+        Requires a store and a ``startDate``; missing ranges are fetched first.
+
+        :param symbol: The symbol to get price history for.
+        :param kwargs: Request parameters, including startDate (and optionally endDate) in epoch milliseconds.
+        :return: Read-only CANDLE_DTYPE array sorted by time.
+        """
+        plan = self._plan(symbol, kwargs)
+        if plan is None:
+            raise ValueError("read_candles requires a CandleStore and a startDate")
+        for gap in plan['gaps']:
+            self._store_gap(symbol, plan, gap, self.client.make_request(self.base_url, params=plan['params'](gap)))
+        return self.store.read(symbol, plan['key'], plan['start'], plan['end'])
+
+    def _plan(self, symbol, kwargs):
+        """Work out the store key, range and missing gaps of a request, or None if the store does not apply."""
+        if self.store is None or kwargs.get('startDate') is None:
+            return None
+        from pythonic_schwab_api.candle_store import BAR_MS, frequency_key  # pylint: disable=import-outside-toplevel
+        now = int(datetime.datetime.now().timestamp() * 1000)
+        frequency_type = kwargs.get('frequencyType') or self.DEFAULT_FREQUENCY_TYPES[kwargs.get('periodType', 'day')]
+        frequency = int(kwargs.get('frequency') or 1)
+        key = frequency_key(frequency_type, frequency, bool(kwargs.get('needExtendedHoursData')))
+        start = int(kwargs['startDate'])
+        end = int(kwargs.get('endDate') or now)
+        request = {name: value for name, value in kwargs.items() if name not in ('startDate', 'endDate')}
+        return {
+            'key': key, 'start': start, 'end': end,
+            # Bars that may still be forming are not marked as covered, so they are fetched again
+            'settled': now - BAR_MS[frequency_type] * frequency,
+            'gaps': self.store.missing(symbol, key, start, end),
+            'params': lambda gap: {'symbol': symbol, **request, 'startDate': gap[0], 'endDate': gap[1]}
+        }
+
+    def _store_gap(self, symbol, plan, gap, response):
+        """Write the candles fetched for one gap to the store."""
+        candles = (response or {}).get('candles') or []
+        self.store.write(symbol, plan['key'], candles, gap[0], min(gap[1], plan['settled']))
+
+    def _from_store(self, symbol, plan):
+        """Build a /pricehistory shaped response from the store."""
+        from pythonic_schwab_api.candle_store import to_candles  # pylint: disable=import-outside-toplevel
+        candles = to_candles(self.store.read(symbol, plan['key'], plan['start'], plan['end']))
+        return {'symbol': symbol, 'empty': not candles, 'candles': candles}
 
 
 class Movers:
@@ -110,7 +286,7 @@ class Movers:
         :param client: The client instance to make requests.
         """
         self.client = client
-        self.base_url = f"{client.config.MARKET_DATA_BASE_URL}/movers"
+        self.base_url = f"{client.config.market_data_base_url}/movers"
 
     def get_movers(self, index, **kwargs):
         """
@@ -135,7 +311,7 @@ class MarketHours:
         :param client: The client instance to make requests.
         """
         self.client = client
-        self.base_url = f"{client.config.MARKET_DATA_BASE_URL}/markets"
+        self.base_url = f"{client.config.market_data_base_url}/markets"
 
     def by_markets(self, markets, date=None):
         """
@@ -175,7 +351,7 @@ class Instruments:
         :param client: The client instance to make requests.
         """
         self.client = client
-        self.base_url = f"{client.config.MARKET_DATA_BASE_URL}/instruments"
+        self.base_url = f"{client.config.market_data_base_url}/instruments"
 
     def by_symbol(self, symbol, projection):
         """
@@ -196,3 +372,121 @@ class Instruments:
         :return: Response from the API.
         """
         return self.client.make_request(f"{self.base_url}/{cusip_id}")
+
+
+class AsyncQuotes(Quotes):
+    """
+    Asynchronous variant of Quotes for use with an AsyncAPIClient.
+    """
+    # pylint: disable=invalid-overridden-method  # coroutine overrides are what makes this the async variant
+    async def get_list(self, symbols=None, fields=None, indicative=False):
+        """Get a list of quotes for the given symbols, fetching chunks concurrently. See Quotes.get_list."""
+        chunks = self._chunk_symbols(symbols)
+        semaphore = asyncio.Semaphore(self.client.config.quote_batching['max_workers'])
+
+        async def fetch(chunk):
+            async with semaphore:
+                try:
+                    return await self.client.make_request(f"{self.base_url}/quotes",
+                                                          params=self._list_params(chunk, fields, indicative))
+                except self.client.request_errors as e:
+                    return e
+
+        return self._merge(chunks, await asyncio.gather(*(fetch(chunk) for chunk in chunks)))
+
+    async def get_snapshot(self, symbols=None, fields=None, indicative=False):
+        """Get quotes for the given symbols as a columnar QuoteSnapshot. See Quotes.get_snapshot."""
+        from pythonic_schwab_api.quote_snapshot import QuoteSnapshot  # pylint: disable=import-outside-toplevel
+        return QuoteSnapshot.from_quotes(await self.get_list(symbols, fields, indicative))
+
+    async def get_single(self, symbol_id, fields=None):
+        """Get a single quote for the given symbol. See Quotes.get_single."""
+        return await super().get_single(symbol_id, fields)
+
+
+class AsyncOptions(Options):
+    """
+    Asynchronous variant of Options for use with an AsyncAPIClient.
+    """
+    # pylint: disable=invalid-overridden-method  # coroutine overrides are what makes this the async variant
+    async def get_chains(self, symbol, **kwargs):
+        """Get options chains for the given symbol. See Options.get_chains."""
+        return await super().get_chains(symbol, **kwargs)
+
+    async def get_option_chain(self, symbol, stream=False, **kwargs):
+        """
+        Get options chains for the given symbol as a columnar OptionChain. See Options.get_option_chain.
+
+        The response is read in full; streamed parsing is only available with APIClient.
+        """
+        if stream:
+            raise ValueError("Streamed option chain parsing is only available with APIClient")
+        from pythonic_schwab_api.option_chain import OptionChain  # pylint: disable=import-outside-toplevel
+        params = {'symbol': symbol, **kwargs}
+        body = await self.client.make_request(self.base_url, params=params, raw_response=True)
+        return OptionChain.from_bytes(body, codec=self.client.json_codec)
+
+
+class AsyncPriceHistory(PriceHistory):
+    """
+    Asynchronous variant of PriceHistory for use with an AsyncAPIClient.
+    """
+    # pylint: disable=invalid-overridden-method  # coroutine overrides are what makes this the async variant
+    async def by_symbol(self, symbol, **kwargs):
+        """Get price history for the given symbol. See PriceHistory.by_symbol."""
+        plan = self._plan(symbol, kwargs)
+        if plan is None:
+            return await super().by_symbol(symbol, **kwargs)
+        await self._fetch_gaps(symbol, plan)
+        return self._from_store(symbol, plan)
+
+    async def read_candles(self, symbol, **kwargs):
+        """Get price history for the given symbol as a candle array. See PriceHistory.read_candles."""
+        plan = self._plan(symbol, kwargs)
+        if plan is None:
+            raise ValueError("read_candles requires a CandleStore and a startDate")
+        await self._fetch_gaps(symbol, plan)
+        return self.store.read(symbol, plan['key'], plan['start'], plan['end'])
+
+    async def _fetch_gaps(self, symbol, plan):
+        for gap in plan['gaps']:
+            self._store_gap(symbol, plan, gap, await self.client.make_request(self.base_url,
+                                                                              params=plan['params'](gap)))
+
+
+class AsyncMovers(Movers):
+    """
+    Asynchronous variant of Movers for use with an AsyncAPIClient.
+    """
+    # pylint: disable=invalid-overridden-method  # coroutine overrides are what makes this the async variant
+    async def get_movers(self, index, **kwargs):
+        """Get market movers for the given index. See Movers.get_movers."""
+        return await super().get_movers(index, **kwargs)
+
+
+class AsyncMarketHours(MarketHours):
+    """
+    Asynchronous variant of MarketHours for use with an AsyncAPIClient.
+    """
+    # pylint: disable=invalid-overridden-method  # coroutine overrides are what makes this the async variant
+    async def by_markets(self, markets, date=None):
+        """Get market hours for the given markets. See MarketHours.by_markets."""
+        return await super().by_markets(markets, date)
+
+    async def by_market(self, market_id, date=None):
+        """Get market hours for a single market. See MarketHours.by_market."""
+        return await super().by_market(market_id, date)
+
+
+class AsyncInstruments(Instruments):
+    """
+    Asynchronous variant of Instruments for use with an AsyncAPIClient.
+    """
+    # pylint: disable=invalid-overridden-method  # coroutine overrides are what makes this the async variant
+    async def by_symbol(self, symbol, projection):
+        """Get instrument information by symbol. See Instruments.by_symbol."""
+        return await super().by_symbol(symbol, projection)
+
+    async def by_cusip(self, cusip_id):
+        """Get instrument information by CUSIP ID. See Instruments.by_cusip."""
+        return await super().by_cusip(cusip_id)
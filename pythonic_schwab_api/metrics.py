@@ -0,0 +1,239 @@
+"""
+This module provides RequestMetrics, the instrumentation surface of the API clients.
+
+Requests are grouped by HTTP method and endpoint template (account hashes,
+order IDs and symbols replaced by placeholders) and record counts per status
+code, transport retries, bytes received and latency histograms for the three
+phases of a request: time queued in the rate limiter, time on the wire and
+JSON decode time. Metrics are exposed as a snapshot dict or in the Prometheus
+text exposition format.
+"""
+
+import bisect
+import threading
+from collections import Counter
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+PHASES = ('queue', 'wire', 'decode')
+
+# Placeholder used for a path segment, keyed by the segment preceding it
+PLACEHOLDERS = {
+    'accounts': '{accountHash}',
+    'orders': '{orderId}',
+    'transactions': '{transactionId}',
+    'markets': '{marketId}',
+    'instruments': '{cusip}',
+    'movers': '{index}'
+}
+STATIC_SEGMENTS = {
+    'trader', 'marketdata', 'v1', 'accounts', 'accountNumbers', 'orders', 'previewOrder', 'transactions',
+    'userPreference', 'quotes', 'chains', 'expirationchain', 'pricehistory', 'movers', 'markets',
+    'instruments', 'oauth', 'token', 'authorize', 'streamer-info'
+}
+
+
+def endpoint_template(url, config):
+    """
+    Reduce a request URL to its endpoint template.
+
+    Example:
+        https://api.schwabapi.com/trader/v1/accounts/ABC123/orders/42
+        becomes /trader/v1/accounts/{accountHash}/orders/{orderId}
+
+    Args:
+        url (str): The fully qualified request URL.
+        config (APIConfig): Configuration holding the API base URL.
+
+    Returns:
+        str: The endpoint template.
+    """
+    path = url[len(config.api_base_url):] if url.startswith(config.api_base_url) else url
+    path = path.split('?', 1)[0]
+    segments = path.split('/')
+    for index in range(1, len(segments)):
+        if segments[index] and segments[index] not in STATIC_SEGMENTS:
+            segments[index] = PLACEHOLDERS.get(segments[index - 1], '{symbol}')
+    return '/'.join(segments)
+
+
+class Histogram:
+    """
+    A cumulative histogram with fixed bucket bounds, in seconds.
+
+    Attributes:
+        bounds (tuple): Upper bounds of the buckets.
+        counts (list): Observations per bucket; the last entry counts values above every bound.
+        total (float): Sum of all observations.
+        count (int): Number of observations.
+    """
+
+    def __init__(self, bounds=LATENCY_BUCKETS):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        """Record one observation."""
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.total += value
+        self.count += 1
+
+    def cumulative(self):
+        """Return (upper bound, cumulative count) pairs, ending with ('+Inf', count)."""
+        pairs = []
+        running = 0
+        for bound, count in zip(self.bounds, self.counts):
+            running += count
+            pairs.append((bound, running))
+        pairs.append(('+Inf', self.count))
+        return pairs
+
+    def snapshot(self):
+        """Return the histogram as a dict."""
+        return {'count': self.count, 'sum': self.total, 'buckets': dict(self.cumulative())}
+
+
+class EndpointStats:
+    """
+    Metrics collected for one method and endpoint template.
+
+    Attributes:
+        statuses (Counter): Responses per status code.
+        retries (int): Transport-level retries.
+        bytes_received (int): Response body bytes received.
+        latency (dict): Histogram per phase ('queue', 'wire', 'decode').
+    """
+
+    def __init__(self):
+        self.statuses = Counter()
+        self.retries = 0
+        self.bytes_received = 0
+        self.latency = {phase: Histogram() for phase in PHASES}
+
+    def snapshot(self):
+        """Return the stats as a dict."""
+        return {
+            'requests': sum(self.statuses.values()),
+            'statuses': dict(self.statuses),
+            'retries': self.retries,
+            'bytes_received': self.bytes_received,
+            'latency': {phase: histogram.snapshot() for phase, histogram in self.latency.items()}
+        }
+
+
+class RequestMetrics:
+    """
+    Thread-safe per-endpoint request metrics.
+
+    Attributes:
+        config (APIConfig): Configuration used to build endpoint templates.
+        endpoints (dict): EndpointStats keyed by (method, endpoint template).
+    """
+
+    def __init__(self, config):
+        """
+        Initialize the RequestMetrics.
+
+        Args:
+            config (APIConfig): Configuration used to build endpoint templates.
+        """
+        self.config = config
+        self.endpoints = {}
+        self._lock = threading.Lock()
+
+    def _stats(self, method, url):
+        key = (method.upper(), endpoint_template(url, self.config))
+        stats = self.endpoints.get(key)
+        if stats is None:
+            stats = self.endpoints[key] = EndpointStats()
+        return stats
+
+    def record_request(self, method, url, status, retries, nbytes, queued, wire):
+        """
+        Record one HTTP exchange.
+
+        Args:
+            method (str): The HTTP method.
+            url (str): The fully qualified request URL.
+            status (int): The response status code.
+            retries (int): Transport-level retries performed.
+            nbytes (int): Response body size in bytes.
+            queued (float): Seconds spent waiting on the rate limiter.
+            wire (float): Seconds spent sending the request and receiving the response.
+        """
+        with self._lock:
+            stats = self._stats(method, url)
+            stats.statuses[status] += 1
+            stats.retries += retries
+            stats.bytes_received += nbytes
+            stats.latency['queue'].observe(queued)
+            stats.latency['wire'].observe(wire)
+
+    def record_decode(self, method, url, seconds):
+        """
+        Record the time spent decoding a response body.
+
+        Args:
+            method (str): The HTTP method.
+            url (str): The fully qualified request URL.
+            seconds (float): Seconds spent decoding.
+        """
+        with self._lock:
+            self._stats(method, url).latency['decode'].observe(seconds)
+
+    def reset(self):
+        """Discard all collected metrics."""
+        with self._lock:
+            self.endpoints = {}
+
+    def snapshot(self):
+        """
+        Return the collected metrics.
+
+        Returns:
+            dict: Stats dicts keyed by "METHOD endpoint-template".
+        """
+        with self._lock:
+            return {f"{method} {template}": stats.snapshot()
+                    for (method, template), stats in sorted(self.endpoints.items())}
+
+    def to_prometheus(self, prefix='schwab_api'):
+        """
+        Render the collected metrics in the Prometheus text exposition format.
+
+        Args:
+            prefix (str, optional): Metric name prefix. Defaults to 'schwab_api'.
+
+        Returns:
+            str: The metrics text.
+        """
+        requests_lines, retries_lines, bytes_lines, latency_lines = [], [], [], []
+        with self._lock:
+            for (method, template), stats in sorted(self.endpoints.items()):
+                labels = f'method="{method}",endpoint="{template}"'
+                for status, count in sorted(stats.statuses.items()):
+                    requests_lines.append(f'{prefix}_requests_total{{{labels},status="{status}"}} {count}')
+                retries_lines.append(f'{prefix}_retries_total{{{labels}}} {stats.retries}')
+                bytes_lines.append(f'{prefix}_response_bytes_total{{{labels}}} {stats.bytes_received}')
+                for phase, histogram in stats.latency.items():
+                    phase_labels = f'{labels},phase="{phase}"'
+                    for bound, count in histogram.cumulative():
+                        latency_lines.append(
+                            f'{prefix}_request_duration_seconds_bucket{{{phase_labels},le="{bound}"}} {count}')
+                    latency_lines.append(f'{prefix}_request_duration_seconds_sum{{{phase_labels}}} {histogram.total}')
+                    latency_lines.append(f'{prefix}_request_duration_seconds_count{{{phase_labels}}} {histogram.count}')
+        return '\n'.join([
+            f'# HELP {prefix}_requests_total Requests sent to the Schwab API by status code.',
+            f'# TYPE {prefix}_requests_total counter',
+            *requests_lines,
+            f'# HELP {prefix}_retries_total Transport-level retries.',
+            f'# TYPE {prefix}_retries_total counter',
+            *retries_lines,
+            f'# HELP {prefix}_response_bytes_total Response body bytes received.',
+            f'# TYPE {prefix}_response_bytes_total counter',
+            *bytes_lines,
+            f'# HELP {prefix}_request_duration_seconds Request latency by phase (queue, wire, decode).',
+            f'# TYPE {prefix}_request_duration_seconds histogram',
+            *latency_lines
+        ]) + '\n'
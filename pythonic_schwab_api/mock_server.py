@@ -0,0 +1,854 @@
+"""
+This module provides MockSchwabServer, a local stand-in for the Schwab API.
+
+It serves the trader and market data routes this package calls, the OAuth
+token endpoint and a websocket streamer, on the addresses the client uses in
+sandbox mode (``config.SANDBOX = True`` points the client at
+http://localhost:4020). Responses are deterministic synthetic data derived
+from a seed, and the server can add latency and inject 401, 429 and 5xx
+errors, for offline testing and throughput benchmarks.
+
+Usage example:
+    from pythonic_schwab_api import config
+    config.SANDBOX = True
+    with MockSchwabServer(latency=0.01, error_rates={429: 0.05}) as server:
+        client = APIClient("AB", token=server.issue_token())
+        Quotes(client).get_list(["AAPL", "MSFT"])
+
+Run standalone with ``python -m pythonic_schwab_api.mock_server --help``.
+"""
+
+# Route handlers share one (query, body, *path_args) signature whether or not they use every argument
+# pylint: disable=unused-argument
+
+import argparse
+import asyncio
+import datetime
+import json
+import math
+import random
+import re
+import threading
+import time
+import urllib.parse as urll
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from zoneinfo import ZoneInfo
+
+EASTERN = ZoneInfo("America/New_York")
+DEFAULT_UNIVERSE = ("AAPL", "MSFT", "AMZN", "GOOGL", "META", "NVDA", "TSLA", "AMD", "INTC", "NFLX",
+                    "SPY", "QQQ", "IWM", "DIA", "BABA", "JPM", "BAC", "XOM", "KO", "PFE")
+MAX_TRANSACTIONS = 3000
+MAX_TRANSACTION_DAYS = 365
+
+
+def stable_seed(*parts):
+    """Return a deterministic integer seed for the given parts."""
+    return zlib.crc32("|".join(str(part) for part in parts).encode())
+
+
+def synthetic_cusip(symbol):
+    """Return a deterministic 9-character CUSIP-like identifier for a symbol."""
+    return f"{stable_seed('cusip', symbol) % 10 ** 9:09d}"
+
+
+def base_price(symbol, seed=0):
+    """Return the deterministic reference price of a symbol."""
+    return 5 + stable_seed('price', symbol, seed) % 50000 / 100
+
+
+def synthetic_quote(symbol, tick=0, seed=0):
+    """
+    Build a /quotes entry for a symbol.
+
+    Args:
+        symbol (str): The symbol.
+        tick (int, optional): Sequence number; successive ticks move the price.
+        seed (int, optional): Seed for the synthetic data.
+
+    Returns:
+        dict: A quote shaped like one value of the /quotes response.
+    """
+    rng = random.Random(stable_seed('quote', symbol, seed, tick))
+    last = round(base_price(symbol, seed) * (1 + 0.02 * math.sin(tick / 7)) + rng.uniform(-0.05, 0.05), 2)
+    spread = round(max(0.01, last * 0.0005), 2)
+    close = round(base_price(symbol, seed), 2)
+    now_ms = int(time.time() * 1000)
+    return {
+        "assetMainType": "EQUITY",
+        "symbol": symbol,
+        "quoteType": "NBBO",
+        "realtime": True,
+        "ssid": stable_seed('ssid', symbol) % 10 ** 9,
+        "quote": {
+            "52WeekHigh": round(close * 1.3, 2), "52WeekLow": round(close * 0.7, 2),
+            "askPrice": round(last + spread / 2, 2), "askSize": rng.randint(1, 20) * 100, "askTime": now_ms,
+            "bidPrice": round(last - spread / 2, 2), "bidSize": rng.randint(1, 20) * 100, "bidTime": now_ms,
+            "closePrice": close, "highPrice": round(max(last, close) * 1.01, 2),
+            "lastPrice": last, "lastSize": rng.randint(1, 5) * 100, "lowPrice": round(min(last, close) * 0.99, 2),
+            "mark": last, "markChange": round(last - close, 2),
+            "markPercentChange": round((last - close) / close * 100, 4),
+            "netChange": round(last - close, 2), "netPercentChange": round((last - close) / close * 100, 4),
+            "openPrice": close, "quoteTime": now_ms, "securityStatus": "Normal",
+            "totalVolume": 1000000 + tick * 1000 + rng.randint(0, 999), "tradeTime": now_ms
+        },
+        "regular": {
+            "regularMarketLastPrice": last, "regularMarketLastSize": rng.randint(1, 5) * 100,
+            "regularMarketNetChange": round(last - close, 2),
+            "regularMarketPercentChange": round((last - close) / close * 100, 4),
+            "regularMarketTradeTime": now_ms
+        },
+        "reference": {
+            "cusip": synthetic_cusip(symbol), "description": f"{symbol} Synthetic Corp",
+            "exchange": "Q", "exchangeName": "NASDAQ"
+        }
+    }
+
+
+def level_one_content(quote):
+    """
+    Convert a /quotes entry into a LEVELONE_EQUITIES streamer content item.
+
+    Args:
+        quote (dict): A quote built by synthetic_quote().
+
+    Returns:
+        dict: The content item, keyed by the streamer's numeric field IDs.
+    """
+    fields = quote["quote"]
+    return {"key": quote["symbol"], "1": fields["bidPrice"], "2": fields["askPrice"], "3": fields["lastPrice"],
+            "4": fields["bidSize"], "5": fields["askSize"], "8": fields["totalVolume"], "9": fields["lastSize"],
+            "35": fields["tradeTime"]}
+
+
+def synthetic_chain(symbol="SPX", expirations=40, strikes=150, seed=0, contract_type="ALL", today=None):
+    """
+    Build a synthetic /chains response.
+
+    Args:
+        symbol (str, optional): The underlying symbol.
+        expirations (int, optional): Number of weekly expiration dates.
+        strikes (int, optional): Number of strikes per expiration.
+        seed (int, optional): Seed for the synthetic data.
+        contract_type (str, optional): 'CALL', 'PUT' or 'ALL'.
+        today (datetime.date, optional): Date the expirations count from.
+
+    Returns:
+        dict: A chain shaped like the /chains response.
+    """
+    today = today or datetime.date(2030, 1, 1)
+    underlying = round(base_price(symbol, seed) * 10, 2)
+    step = max(1.0, round(underlying / strikes / 2))
+    first_strike = round(underlying - step * (strikes // 2))
+    chain = {"symbol": symbol, "status": "SUCCESS", "strategy": "SINGLE", "isDelayed": False,
+             "isIndex": False, "interestRate": 4.5, "underlyingPrice": underlying, "volatility": 29.0,
+             "daysToExpiration": 0.0, "numberOfContracts": 0, "callExpDateMap": {}, "putExpDateMap": {}}
+    sides = [side for side in ("CALL", "PUT") if contract_type in ("ALL", side)]
+    for expiry in range(expirations):
+        days = 7 * (expiry + 1)
+        expiration = today + datetime.timedelta(days=days)
+        expiry_key = f"{expiration.isoformat()}:{days}"
+        for put_call in sides:
+            exp_map = chain["callExpDateMap" if put_call == "CALL" else "putExpDateMap"]
+            strike_map = exp_map.setdefault(expiry_key, {})
+            for index in range(strikes):
+                strike = first_strike + index * step
+                moneyness = (underlying - strike) if put_call == "CALL" else (strike - underlying)
+                intrinsic = max(0.0, moneyness)
+                time_value = underlying * 0.01 * math.sqrt(days) * math.exp(-abs(moneyness) / underlying * 8)
+                mark = round(intrinsic + time_value + 0.05, 2)
+                delta = 1 / (1 + math.exp(-moneyness / (underlying * 0.02 * math.sqrt(days / 7))))
+                strike_map[f"{strike:.1f}"] = [{
+                    "putCall": put_call, "symbol": f"{symbol:<6}{expiration:%y%m%d}{put_call[0]}{int(strike * 1000):08d}",
+                    "description": f"{symbol} {expiration:%b %d %Y} {strike:g} {put_call.title()}",
+                    "exchangeName": "OPR", "bid": round(mark - 0.05, 2), "ask": round(mark + 0.05, 2),
+                    "last": mark, "mark": mark, "bidSize": 10 + index % 7, "askSize": 12 + index % 5,
+                    "lastSize": 1, "highPrice": round(mark * 1.1, 2), "lowPrice": round(mark * 0.9, 2),
+                    "openPrice": mark, "closePrice": mark, "totalVolume": stable_seed(symbol, expiry, index, put_call) % 5000,
+                    "tradeTimeInLong": 1893499200000, "quoteTimeInLong": 1893499200000,
+                    "netChange": 0.0, "volatility": 29.0,
+                    "delta": round(delta if put_call == "CALL" else -delta, 4),
+                    "gamma": round(delta * (1 - delta) / underlying, 5), "theta": round(-time_value / days, 4),
+                    "vega": round(time_value / 10, 4), "rho": 0.01,
+                    "openInterest": stable_seed('oi', symbol, expiry, index, put_call) % 20000,
+                    "timeValue": round(time_value, 2), "theoreticalOptionValue": mark,
+                    "theoreticalVolatility": 29.0, "strikePrice": strike,
+                    "expirationDate": f"{expiration.isoformat()}T20:00:00.000+00:00",
+                    "daysToExpiration": days, "expirationType": "W", "lastTradingDay": 1893499200000,
+                    "multiplier": 100.0, "settlementType": "P", "deliverableNote": "100 " + symbol,
+                    "percentChange": 0.0, "markChange": 0.0, "markPercentChange": 0.0,
+                    "intrinsicValue": round(intrinsic, 2), "extrinsicValue": round(time_value, 2),
+                    "optionRoot": symbol, "exerciseType": "A", "high52Week": round(mark * 2, 2),
+                    "low52Week": round(mark / 2, 2), "inTheMoney": intrinsic > 0, "mini": False,
+                    "nonStandard": False, "pennyPilot": True
+                }]
+                chain["numberOfContracts"] += 1
+    return chain
+
+
+def session_hours(date, market="equity"):
+    """
+    Return the session hours of a market on a date, or None when it is closed.
+
+    Args:
+        date (datetime.date): The date.
+        market (str, optional): The market name.
+
+    Returns:
+        dict: ISO start/end pairs per session, keyed like the /markets response.
+    """
+    if date.weekday() >= 5:
+        return None
+
+    def span(start, end):
+        return [{
+            "start": datetime.datetime.combine(date, start, tzinfo=EASTERN).isoformat(),
+            "end": datetime.datetime.combine(date, end, tzinfo=EASTERN).isoformat()
+        }]
+    if market == "option":
+        return {"regularMarket": span(datetime.time(9, 30), datetime.time(16, 0))}
+    if market in ("future", "forex"):
+        return {"regularMarket": span(datetime.time(0, 0), datetime.time(17, 0))}
+    if market == "bond":
+        return {"preMarket": span(datetime.time(7, 0), datetime.time(8, 0)),
+                "regularMarket": span(datetime.time(8, 0), datetime.time(17, 0))}
+    return {"preMarket": span(datetime.time(7, 0), datetime.time(9, 30)),
+            "regularMarket": span(datetime.time(9, 30), datetime.time(16, 0)),
+            "postMarket": span(datetime.time(16, 0), datetime.time(20, 0))}
+
+
+MARKET_PRODUCTS = {"equity": "EQ", "option": "EQO", "future": "FUT", "forex": "FOREX", "bond": "BOND"}
+
+
+def synthetic_market_hours(market, date):
+    """Return the /markets entry of a market on a date."""
+    product = MARKET_PRODUCTS.get(market, market.upper())
+    hours = session_hours(date, market)
+    entry = {"date": date.isoformat(), "marketType": market.upper(), "product": product,
+             "productName": market, "isOpen": hours is not None}
+    if hours:
+        entry["sessionHours"] = hours
+    return {market: {product: entry}}
+
+
+def synthetic_candles(symbol, start_ms, end_ms, frequency_type="daily", frequency=1, seed=0):
+    """
+    Build candles for a symbol between two epoch-millisecond timestamps.
+
+    Each candle depends only on the symbol, seed and its own timestamp, so
+    overlapping requests return identical candles.
+
+    Args:
+        symbol (str): The symbol.
+        start_ms (int): Start of the range, epoch milliseconds (inclusive).
+        end_ms (int): End of the range, epoch milliseconds (inclusive).
+        frequency_type (str, optional): 'minute', 'daily', 'weekly' or 'monthly'.
+        frequency (int, optional): Number of frequency units per candle.
+        seed (int, optional): Seed for the synthetic data.
+
+    Returns:
+        list: Candle dicts with open, high, low, close, volume and datetime.
+    """
+    candles = []
+    price = base_price(symbol, seed)
+    start = datetime.datetime.fromtimestamp(start_ms / 1000, EASTERN)
+    end = datetime.datetime.fromtimestamp(end_ms / 1000, EASTERN)
+    day = start.date()
+    while day <= end.date():
+        if day.weekday() < 5:
+            if frequency_type == "minute":
+                stamps = [datetime.datetime.combine(day, datetime.time(9, 30), tzinfo=EASTERN)
+                          + datetime.timedelta(minutes=minute) for minute in range(0, 390, frequency)]
+            elif frequency_type == "weekly" and day.weekday() != 0 or \
+                    frequency_type == "monthly" and (day.day > 7 or day.weekday() != 0):
+                stamps = []
+            else:
+                stamps = [datetime.datetime.combine(day, datetime.time(0, 0), tzinfo=EASTERN)]
+            for stamp in stamps:
+                stamp_ms = int(stamp.timestamp() * 1000)
+                if start_ms <= stamp_ms <= end_ms:
+                    rng = random.Random(stable_seed('candle', symbol, seed, stamp_ms))
+                    center = price * (1 + 0.1 * math.sin(stamp_ms / 8.64e7 / 30))
+                    open_price = round(center * (1 + rng.uniform(-0.01, 0.01)), 2)
+                    close_price = round(center * (1 + rng.uniform(-0.01, 0.01)), 2)
+                    candles.append({
+                        "open": open_price, "high": round(max(open_price, close_price) * 1.005, 2),
+                        "low": round(min(open_price, close_price) * 0.995, 2), "close": close_price,
+                        "volume": rng.randint(1000, 1000000), "datetime": stamp_ms
+                    })
+        day += datetime.timedelta(days=1)
+    return candles
+
+
+def synthetic_transactions(account_number, start, end, seed=0, symbols=DEFAULT_UNIVERSE[:8]):
+    """
+    Build the transactions of an account between two datetimes.
+
+    Every weekday holds a deterministic set of trades, alternating opening
+    buys and closing sells per symbol, plus the occasional dividend.
+
+    Args:
+        account_number (str): The account number.
+        start (datetime.datetime): Start of the range (inclusive, timezone-aware).
+        end (datetime.datetime): End of the range (inclusive, timezone-aware).
+        seed (int, optional): Seed for the synthetic data.
+        symbols (tuple, optional): Symbols the account trades.
+
+    Returns:
+        list: Transactions sorted by time.
+    """
+    transactions = []
+    day = start.astimezone(datetime.timezone.utc).date()
+    while day <= end.astimezone(datetime.timezone.utc).date():
+        ordinal = day.toordinal()
+        rng = random.Random(stable_seed('transactions', account_number, seed, ordinal))
+        if day.weekday() < 5:
+            for slot in range(rng.randint(0, 4)):
+                symbol = rng.choice(symbols)
+                stamp = datetime.datetime.combine(day, datetime.time(14, 30 + slot * 5), tzinfo=datetime.timezone.utc)
+                quantity = rng.randint(1, 10) * 10
+                price = round(base_price(symbol, seed) * (1 + rng.uniform(-0.05, 0.05)), 2)
+                opening = (ordinal + slot + stable_seed(symbol)) % 2 == 0
+                fee = round(rng.choice((0.0, 0.0, 0.65, 1.0)), 2)
+                cost = round(quantity * price, 2)
+                transactions.append({
+                    "activityId": stable_seed('activity', account_number, ordinal, slot) % 10 ** 11,
+                    "time": stamp.strftime("%Y-%m-%dT%H:%M:%S+0000"),
+                    "accountNumber": account_number, "type": "TRADE", "status": "VALID", "subAccount": "CASH",
+                    "tradeDate": stamp.strftime("%Y-%m-%dT%H:%M:%S+0000"),
+                    "orderId": stable_seed('order', account_number, ordinal, slot) % 10 ** 10,
+                    "netAmount": round((-cost if opening else cost) - fee, 2),
+                    "transferItems": [
+                        {"instrument": {"assetType": "EQUITY", "symbol": symbol, "cusip": synthetic_cusip(symbol)},
+                         "amount": quantity if opening else -quantity, "cost": -cost if opening else cost,
+                         "price": price, "positionEffect": "OPENING" if opening else "CLOSING"},
+                        {"instrument": {"assetType": "CURRENCY", "symbol": "CURRENCY_USD"},
+                         "amount": 0.0, "cost": -fee, "feeType": "COMMISSION"}
+                    ]
+                })
+            if rng.random() < 0.05:
+                symbol = rng.choice(symbols)
+                stamp = datetime.datetime.combine(day, datetime.time(12, 0), tzinfo=datetime.timezone.utc)
+                amount = round(rng.uniform(1, 50), 2)
+                transactions.append({
+                    "activityId": stable_seed('dividend', account_number, ordinal) % 10 ** 11,
+                    "time": stamp.strftime("%Y-%m-%dT%H:%M:%S+0000"),
+                    "accountNumber": account_number, "type": "DIVIDEND_OR_INTEREST", "status": "VALID",
+                    "subAccount": "CASH", "netAmount": amount,
+                    "transferItems": [{"instrument": {"assetType": "EQUITY", "symbol": symbol},
+                                       "amount": amount, "cost": 0.0}]
+                })
+        day += datetime.timedelta(days=1)
+    transactions = [t for t in transactions
+                    if start <= datetime.datetime.strptime(t["time"], "%Y-%m-%dT%H:%M:%S%z") <= end]
+    return sorted(transactions, key=lambda t: (t["time"], t["activityId"]))
+
+
+def parse_datetime(value):
+    """Parse an ISO-8601 timestamp from a query string into an aware datetime."""
+    parsed = datetime.datetime.fromisoformat(value.replace("Z", "+00:00"))
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=datetime.timezone.utc)
+
+
+class MockRequestHandler(BaseHTTPRequestHandler):
+    """Request handler dispatching the Schwab routes to MockSchwabServer."""
+    protocol_version = "HTTP/1.1"
+    server_version = "MockSchwab/1.0"
+    disable_nagle_algorithm = True  # headers and body are written separately
+
+    def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+        if self.server.mock.verbose:
+            super().log_message(format, *args)
+
+    def do_GET(self):  # pylint: disable=invalid-name
+        """Handle GET requests."""
+        self.server.mock.dispatch(self, "GET")
+
+    def do_POST(self):  # pylint: disable=invalid-name
+        """Handle POST requests."""
+        self.server.mock.dispatch(self, "POST")
+
+    def do_PUT(self):  # pylint: disable=invalid-name
+        """Handle PUT requests."""
+        self.server.mock.dispatch(self, "PUT")
+
+    def do_DELETE(self):  # pylint: disable=invalid-name
+        """Handle DELETE requests."""
+        self.server.mock.dispatch(self, "DELETE")
+
+    def send_json(self, status, payload=None, headers=None):
+        """Send a JSON (or empty) response with a Content-Length header."""
+        body = b"" if payload is None else json.dumps(payload).encode()
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        if body:
+            self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class MockSchwabServer:
+    """
+    A local stand-in for the Schwab REST API and streamer.
+
+    Attributes:
+        host (str): Interface to listen on.
+        port (int): REST port (the sandbox client expects 4020).
+        stream_port (int): Websocket streamer port, or None to disable the streamer.
+        latency (float): Seconds added to every REST response.
+        jitter (float): Maximum random seconds added on top of latency.
+        error_rates (dict): Probability of answering with each injected status (401, 429, 500, 503).
+        retry_after (int): Retry-After header value sent with injected 429s.
+        seed (int): Seed for the synthetic data and error injection.
+        stream_interval (float): Seconds between streamed data frames.
+        request_count (int): Number of REST requests served.
+    """
+
+    def __init__(self, host="localhost", port=4020, stream_port=4021, latency=0.0, jitter=0.0,
+                 error_rates=None, retry_after=1, seed=0, stream_interval=0.5, verbose=False):
+        """
+        Initialize the MockSchwabServer. Call start() or use it as a context manager.
+
+        Args:
+            host (str, optional): Interface to listen on.
+            port (int, optional): REST port; 0 picks a free port.
+            stream_port (int, optional): Websocket streamer port; None disables the streamer.
+            latency (float, optional): Seconds added to every REST response.
+            jitter (float, optional): Maximum random seconds added on top of latency.
+            error_rates (dict, optional): Probability per injected status code, e.g. {429: 0.05}.
+            retry_after (int, optional): Retry-After header value sent with injected 429s.
+            seed (int, optional): Seed for the synthetic data and error injection.
+            stream_interval (float, optional): Seconds between streamed data frames.
+            verbose (bool, optional): Log every request to stderr.
+        """
+        self.host = host
+        self.port = port
+        self.stream_port = stream_port
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rates = dict(error_rates or {})
+        self.retry_after = retry_after
+        self.seed = seed
+        self.stream_interval = stream_interval
+        self.verbose = verbose
+        self.request_count = 0
+        self.accounts = {f"HASH{index:04d}{seed:04d}": f"{10000000 + index * 1111 + seed}" for index in range(2)}
+        self.orders = {account_hash: {} for account_hash in self.accounts}
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._ticks = {}
+        self._next_order_id = 1000
+        self._tokens_issued = 0
+        self._httpd = None
+        self._http_thread = None
+        self._stream_loop = None
+        self._stream_thread = None
+        self._stream_server = None
+        self._routes = [
+            ("POST", re.compile(r"^/v1/oauth/token$"), self.oauth_token),
+            ("GET", re.compile(r"^/userPreference$"), self.user_preference),
+            ("GET", re.compile(r"^/accounts/accountNumbers$"), self.account_numbers),
+            ("GET", re.compile(r"^/accounts$"), self.all_accounts),
+            ("GET", re.compile(r"^/accounts/(?P<account_hash>[^/]+)$"), self.account),
+            ("GET", re.compile(r"^/accounts/(?P<account_hash>[^/]+)/transactions$"), self.transactions),
+            ("GET", re.compile(r"^/accounts/(?P<account_hash>[^/]+)/orders$"), self.list_orders),
+            ("POST", re.compile(r"^/accounts/(?P<account_hash>[^/]+)/orders$"), self.place_order),
+            ("GET", re.compile(r"^/accounts/(?P<account_hash>[^/]+)/orders/(?P<order_id>\d+)$"), self.get_order),
+            ("PUT", re.compile(r"^/accounts/(?P<account_hash>[^/]+)/orders/(?P<order_id>\d+)$"), self.replace_order),
+            ("DELETE", re.compile(r"^/accounts/(?P<account_hash>[^/]+)/orders/(?P<order_id>\d+)$"), self.cancel_order),
+            ("GET", re.compile(r"^/marketdata/quotes$"), self.quotes),
+            ("GET", re.compile(r"^/marketdata/chains$"), self.chains),
+            ("GET", re.compile(r"^/marketdata/pricehistory$"), self.price_history),
+            ("GET", re.compile(r"^/marketdata/movers(/(?P<index>[^/]+))?$"), self.movers),
+            ("GET", re.compile(r"^/marketdata/markets$"), self.markets),
+            ("GET", re.compile(r"^/marketdata/markets/(?P<market_id>[^/]+)$"), self.market),
+            ("GET", re.compile(r"^/marketdata/instruments$"), self.instruments),
+            ("GET", re.compile(r"^/marketdata/instruments/(?P<cusip>[^/]+)$"), self.instrument_by_cusip),
+            ("GET", re.compile(r"^/marketdata/(?P<symbol>[^/]+)/quotes$"), self.single_quote)
+        ]
+        self.universe = {synthetic_cusip(symbol): symbol for symbol in DEFAULT_UNIVERSE}
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+    @property
+    def base_url(self):
+        """str: Base URL of the REST API."""
+        return f"http://{self.host}:{self.port}"
+
+    @property
+    def stream_url(self):
+        """str: URL of the websocket streamer."""
+        return f"ws://{self.host}:{self.stream_port}"
+
+    def start(self):
+        """Start serving REST requests (and the streamer) on background threads."""
+        self._httpd = ThreadingHTTPServer((self.host, self.port), MockRequestHandler)
+        self._httpd.daemon_threads = True
+        self._httpd.mock = self
+        self.port = self._httpd.server_address[1]
+        self._http_thread = threading.Thread(target=self._httpd.serve_forever, name="MockSchwabHTTP", daemon=True)
+        self._http_thread.start()
+        if self.stream_port is not None:
+            ready = threading.Event()
+            self._stream_thread = threading.Thread(target=self._run_streamer, args=(ready,),
+                                                   name="MockSchwabStream", daemon=True)
+            self._stream_thread.start()
+            ready.wait(10)
+
+    def stop(self):
+        """Stop the REST server and the streamer."""
+        if self._httpd is not None:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._httpd = None
+        if self._stream_loop is not None:
+            self._stream_loop.call_soon_threadsafe(self._stream_loop.stop)
+            self._stream_thread.join(5)
+            self._stream_loop = None
+
+    def issue_token(self, expires_in=1800):
+        """
+        Issue token data the way /v1/oauth/token does, including ``expires_at``.
+
+        Returns:
+            dict: Token data ready to seed an APIClient or a token store.
+        """
+        token = self._token_payload(expires_in)
+        token["expires_at"] = (datetime.datetime.now() + datetime.timedelta(seconds=expires_in)).isoformat()
+        return token
+
+    def _token_payload(self, expires_in=1800):
+        with self._lock:
+            self._tokens_issued += 1
+            number = self._tokens_issued
+        return {"access_token": f"mock-access-{self.seed}-{number}", "refresh_token": f"mock-refresh-{self.seed}",
+                "id_token": "mock-id", "token_type": "Bearer", "scope": "api", "expires_in": expires_in}
+
+    def dispatch(self, handler, method):
+        """Route one request, applying latency and error injection."""
+        with self._lock:
+            self.request_count += 1
+            draw = self._rng.random()
+            delay = self.latency + (self._rng.uniform(0, self.jitter) if self.jitter else 0)
+        if delay:
+            time.sleep(delay)
+        parsed = urll.urlsplit(handler.path)
+        query = {key: ",".join(values) for key, values in urll.parse_qs(parsed.query).items()}
+        body = handler.rfile.read(int(handler.headers.get("Content-Length") or 0))
+        path = urll.unquote(parsed.path)
+        if path != "/v1/oauth/token":
+            if not handler.headers.get("Authorization", "").startswith("Bearer "):
+                handler.send_json(401, {"errors": [{"title": "Unauthorized"}]})
+                return
+            for status, rate in sorted(self.error_rates.items()):
+                if draw < rate:
+                    headers = {"Retry-After": str(self.retry_after)} if status == 429 else None
+                    handler.send_json(status, {"errors": [{"title": f"Injected {status}"}]}, headers)
+                    return
+                draw -= rate
+        for route_method, pattern, route in self._routes:
+            match = pattern.match(path)
+            if match and route_method == method:
+                try:
+                    status, payload, headers = route(query=query, body=body, **match.groupdict())
+                except (KeyError, ValueError) as e:
+                    status, payload, headers = 400, {"errors": [{"title": "Bad Request", "detail": str(e)}]}, None
+                handler.send_json(status, payload, headers)
+                return
+        handler.send_json(404, {"errors": [{"title": "Not Found", "detail": path}]})
+
+    # Routes return (status, payload, headers)
+
+    def oauth_token(self, query, body):
+        """POST /v1/oauth/token"""
+        form = urll.parse_qs(body.decode())
+        if form.get("grant_type", [""])[0] not in ("authorization_code", "refresh_token"):
+            return 400, {"error": "unsupported_grant_type"}, None
+        return 200, self._token_payload(), None
+
+    def user_preference(self, query, body):
+        """GET /userPreference"""
+        return 200, {
+            "accounts": [{"accountNumber": number, "primaryAccount": index == 0, "type": "BROKERAGE",
+                          "nickName": f"Mock {index}", "displayAcctId": f"...{number[-3:]}"}
+                         for index, number in enumerate(self.accounts.values())],
+            "streamerInfo": [{"streamerSocketUrl": self.stream_url, "schwabClientCustomerId": "mock-customer",
+                              "schwabClientCorrelId": "mock-correl", "schwabClientChannel": "N9",
+                              "schwabClientFunctionId": "APIAPP"}],
+            "offers": [{"level2Permissions": True, "mktDataPermission": "NP"}]
+        }, None
+
+    def account_numbers(self, query, body):
+        """GET /accounts/accountNumbers"""
+        return 200, [{"accountNumber": number, "hashValue": account_hash}
+                     for account_hash, number in self.accounts.items()], None
+
+    def _account_payload(self, account_hash, fields):
+        number = self.accounts[account_hash]
+        account = {"type": "CASH", "accountNumber": number, "roundTrips": 0, "isDayTrader": False,
+                   "isClosingOnlyRestricted": False,
+                   "currentBalances": {"cashBalance": 100000.0, "liquidationValue": 150000.0},
+                   "initialBalances": {"cashBalance": 100000.0}}
+        if fields and "positions" in fields:
+            account["positions"] = [{
+                "instrument": {"assetType": "EQUITY", "symbol": symbol, "cusip": synthetic_cusip(symbol)},
+                "longQuantity": 10.0, "shortQuantity": 0.0, "averagePrice": base_price(symbol, self.seed),
+                "marketValue": round(10 * base_price(symbol, self.seed), 2)
+            } for symbol in DEFAULT_UNIVERSE[:3]]
+        return {"securitiesAccount": account}
+
+    def all_accounts(self, query, body):
+        """GET /accounts"""
+        return 200, [self._account_payload(account_hash, query.get("fields")) for account_hash in self.accounts], None
+
+    def account(self, query, body, account_hash):
+        """GET /accounts/{accountHash}"""
+        if account_hash not in self.accounts:
+            return 404, {"errors": [{"title": "Account not found"}]}, None
+        return 200, self._account_payload(account_hash, query.get("fields")), None
+
+    def transactions(self, query, body, account_hash):
+        """GET /accounts/{accountHash}/transactions"""
+        if account_hash not in self.accounts:
+            return 404, {"errors": [{"title": "Account not found"}]}, None
+        start, end = parse_datetime(query["startDate"]), parse_datetime(query["endDate"])
+        if end < start or (end - start).days > MAX_TRANSACTION_DAYS:
+            return 400, {"errors": [{"title": "Date range must be positive and at most one year"}]}, None
+        result = synthetic_transactions(self.accounts[account_hash], start, end, self.seed)
+        if query.get("types"):
+            types = set(query["types"].split(","))
+            result = [t for t in result if t["type"] in types]
+        if query.get("symbol"):
+            result = [t for t in result
+                      if any(item["instrument"].get("symbol") == query["symbol"] for item in t["transferItems"])]
+        return 200, result[:MAX_TRANSACTIONS], None
+
+    def list_orders(self, query, body, account_hash):
+        """GET /accounts/{accountHash}/orders"""
+        orders = list(self.orders.get(account_hash, {}).values())
+        if query.get("status"):
+            orders = [order for order in orders if order["status"] == query["status"]]
+        return 200, orders[:int(query.get("maxResults", 3000))], None
+
+    def place_order(self, query, body, account_hash):
+        """POST /accounts/{accountHash}/orders"""
+        if account_hash not in self.accounts:
+            return 404, {"errors": [{"title": "Account not found"}]}, None
+        order = json.loads(body or b"{}")
+        with self._lock:
+            order_id = self._next_order_id
+            self._next_order_id += 1
+        order.update({"orderId": order_id, "status": "WORKING", "accountNumber": self.accounts[account_hash],
+                      "enteredTime": datetime.datetime.now(datetime.timezone.utc).strftime("%Y-%m-%dT%H:%M:%S+0000")})
+        self.orders[account_hash][order_id] = order
+        return 201, None, {"Location": f"{self.base_url}/accounts/{account_hash}/orders/{order_id}"}
+
+    def get_order(self, query, body, account_hash, order_id):
+        """GET /accounts/{accountHash}/orders/{orderId}"""
+        order = self.orders.get(account_hash, {}).get(int(order_id))
+        if order is None:
+            return 404, {"errors": [{"title": "Order not found"}]}, None
+        return 200, order, None
+
+    def replace_order(self, query, body, account_hash, order_id):
+        """PUT /accounts/{accountHash}/orders/{orderId}"""
+        status, order, _ = self.get_order(query, body, account_hash, order_id)
+        if status != 200:
+            return status, order, None
+        order["status"] = "REPLACED"
+        return self.place_order(query, body, account_hash)
+
+    def cancel_order(self, query, body, account_hash, order_id):
+        """DELETE /accounts/{accountHash}/orders/{orderId}"""
+        status, order, _ = self.get_order(query, body, account_hash, order_id)
+        if status != 200:
+            return status, order, None
+        order["status"] = "CANCELED"
+        return 200, None, None
+
+    def _next_quote(self, symbol):
+        with self._lock:
+            tick = self._ticks.get(symbol, 0)
+            self._ticks[symbol] = tick + 1
+        return synthetic_quote(symbol, tick, self.seed)
+
+    def quotes(self, query, body):
+        """GET /marketdata/quotes"""
+        symbols = [symbol for symbol in query.get("symbols", "").split(",") if symbol]
+        return 200, {symbol: self._next_quote(symbol) for symbol in symbols}, None
+
+    def single_quote(self, query, body, symbol):
+        """GET /marketdata/{symbol}/quotes"""
+        return 200, {symbol: self._next_quote(symbol)}, None
+
+    def chains(self, query, body):
+        """GET /marketdata/chains"""
+        strikes = int(query.get("strikeCount", 40))
+        expirations = int(query.get("expirations", 12))
+        return 200, synthetic_chain(query["symbol"], expirations, strikes, self.seed,
+                                    query.get("contractType", "ALL"), datetime.date.today()), None
+
+    def price_history(self, query, body):
+        """GET /marketdata/pricehistory"""
+        symbol = query["symbol"]
+        frequency_type = query.get("frequencyType", "daily")
+        end_ms = int(query.get("endDate", time.time() * 1000))
+        if "startDate" in query:
+            start_ms = int(query["startDate"])
+        else:
+            days = {"day": 1, "month": 30, "year": 365, "ytd": 365}[query.get("periodType", "day")]
+            start_ms = end_ms - int(query.get("period", 10 if query.get("periodType", "day") == "day" else 1)) * days * 86400000
+        candles = synthetic_candles(symbol, start_ms, end_ms, frequency_type, int(query.get("frequency", 1)), self.seed)
+        return 200, {"symbol": symbol, "empty": not candles, "candles": candles}, None
+
+    def movers(self, query, body, index=None):
+        """GET /marketdata/movers/{index}, also accepting the index as a query parameter"""
+        screeners = [{
+            "symbol": symbol, "description": f"{symbol} Synthetic Corp", "volume": 1000000 + rank * 1000,
+            "lastPrice": base_price(symbol, self.seed), "netChange": round(1.5 - rank * 0.1, 2),
+            "netPercentChange": round(0.03 - rank * 0.001, 4), "totalVolume": 5000000, "trades": 1000
+        } for rank, symbol in enumerate(DEFAULT_UNIVERSE[:10])]
+        return 200, {"screeners": screeners}, None
+
+    def markets(self, query, body):
+        """GET /marketdata/markets"""
+        date = datetime.date.fromisoformat(query.get("date") or datetime.date.today().isoformat())
+        payload = {}
+        for market in query["markets"].split(","):
+            payload.update(synthetic_market_hours(market.strip(), date))
+        return 200, payload, None
+
+    def market(self, query, body, market_id):
+        """GET /marketdata/markets/{market_id}"""
+        date = datetime.date.fromisoformat(query.get("date") or datetime.date.today().isoformat())
+        return 200, synthetic_market_hours(market_id, date), None
+
+    def _instrument(self, symbol):
+        return {"cusip": synthetic_cusip(symbol), "symbol": symbol, "description": f"{symbol} Synthetic Corp",
+                "exchange": "NASDAQ", "assetType": "EQUITY"}
+
+    def instruments(self, query, body):
+        """GET /marketdata/instruments"""
+        projection = query.get("projection", "symbol-search")
+        terms = query["symbol"]
+        if projection in ("desc-search", "desc-regex"):
+            pattern = re.compile(terms if projection == "desc-regex" else re.escape(terms), re.IGNORECASE)
+            symbols = [symbol for symbol in self.universe.values() if pattern.search(f"{symbol} Synthetic Corp")]
+        elif projection == "symbol-regex":
+            symbols = [symbol for symbol in self.universe.values() if re.fullmatch(terms, symbol)]
+        else:
+            symbols = [symbol for symbol in terms.split(",") if symbol]
+        for symbol in symbols:
+            self.universe.setdefault(synthetic_cusip(symbol), symbol)
+        return 200, {"instruments": [self._instrument(symbol) for symbol in symbols]}, None
+
+    def instrument_by_cusip(self, query, body, cusip):
+        """GET /marketdata/instruments/{cusip_id}"""
+        symbol = self.universe.get(cusip)
+        if symbol is None:
+            return 404, {"errors": [{"title": "Instrument not found"}]}, None
+        return 200, {"instruments": [self._instrument(symbol)]}, None
+
+    # Streamer
+
+    def _run_streamer(self, ready):
+        import websockets  # pylint: disable=import-outside-toplevel
+        self._stream_loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self._stream_loop)
+
+        async def serve():
+            self._stream_server = await websockets.serve(self._stream_session, self.host, self.stream_port)
+            if self.stream_port == 0:
+                self.stream_port = next(iter(self._stream_server.sockets)).getsockname()[1]
+            ready.set()
+
+        self._stream_loop.run_until_complete(serve())
+        try:
+            self._stream_loop.run_forever()
+        finally:
+            self._stream_server.close()
+            self._stream_loop.run_until_complete(self._stream_server.wait_closed())
+            self._stream_loop.close()
+
+    async def _stream_session(self, websocket):
+        """Serve one streamer connection: LOGIN, SUBS/ADD/UNSUBS and periodic data frames."""
+        subscriptions = {}
+        pusher = asyncio.ensure_future(self._push_data(websocket, subscriptions))
+        try:
+            async for raw in websocket:
+                message = json.loads(raw)
+                for request in message.get("requests", [message]):
+                    service = request.get("service", "").upper()
+                    command = request.get("command", "").upper()
+                    keys = request.get("parameters", {}).get("keys", "")
+                    if command in ("SUBS", "ADD"):
+                        current = subscriptions.setdefault(service, set()) if command == "ADD" else set()
+                        current.update(key for key in keys.split(",") if key)
+                        subscriptions[service] = current
+                    elif command == "UNSUBS":
+                        subscriptions.get(service, set()).difference_update(keys.split(","))
+                    elif command == "LOGOUT":
+                        subscriptions.clear()
+                    await websocket.send(json.dumps({"response": [{
+                        "service": service, "command": command, "requestid": request.get("requestid"),
+                        "SchwabClientCorrelId": request.get("SchwabClientCorrelId"),
+                        "timestamp": int(time.time() * 1000),
+                        "content": {"code": 0, "msg": f"{command} command succeeded"}
+                    }]}))
+        except Exception:  # connection closed or bad frame
+            pass
+        finally:
+            pusher.cancel()
+
+    async def _push_data(self, websocket, subscriptions):
+        """Send one data frame per subscribed service every stream_interval seconds."""
+        while True:
+            await asyncio.sleep(self.stream_interval)
+            frames = []
+            for service, keys in subscriptions.items():
+                content = []
+                for key in sorted(keys):
+                    content.append(level_one_content(self._next_quote(key)))
+                if content:
+                    frames.append({"service": service, "timestamp": int(time.time() * 1000),
+                                   "command": "SUBS", "content": content})
+            if frames:
+                await websocket.send(json.dumps({"data": frames}))
+
+
+def main():
+    """Run the mock server from the command line until interrupted."""
+    parser = argparse.ArgumentParser(description="Local stand-in for the Schwab API.")
+    parser.add_argument("--host", default="localhost")
+    parser.add_argument("--port", type=int, default=4020)
+    parser.add_argument("--stream-port", type=int, default=4021)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every response")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Maximum random extra seconds per response")
+    parser.add_argument("--error-401", type=float, default=0.0, help="Probability of an injected 401")
+    parser.add_argument("--error-429", type=float, default=0.0, help="Probability of an injected 429")
+    parser.add_argument("--error-500", type=float, default=0.0, help="Probability of an injected 500")
+    parser.add_argument("--error-503", type=float, default=0.0, help="Probability of an injected 503")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--verbose", action="store_true")
+    args = parser.parse_args()
+    error_rates = {401: args.error_401, 429: args.error_429, 500: args.error_500, 503: args.error_503}
+    server = MockSchwabServer(args.host, args.port, args.stream_port, args.latency, args.jitter,
+                              {status: rate for status, rate in error_rates.items() if rate}, seed=args.seed,
+                              verbose=args.verbose)
+    server.start()
+    print(f"Mock Schwab API on {server.base_url}, streamer on {server.stream_url}. Ctrl+C to stop.")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,444 @@
+"""
+This module provides OptionChain, a columnar representation of a /chains response.
+
+The nested callExpDateMap/putExpDateMap structure is flattened into one row
+per contract, sorted by expiration, strike and put/call, and stored as typed
+NumPy arrays: a float64 block for prices, sizes and greeks, an int64 block of
+epoch-millisecond timestamps, and per-contract symbol, expiration and call
+flag arrays. Built from raw response bytes, the chain is only decoded on
+first access. Built from a streamed response, contracts are parsed one at a
+time as the body arrives (see iter_chain_contracts), so the full document is
+never held in memory.
+
+Usage example:
+    chain = Options(client).get_option_chain("SPX")
+    dte = chain['daysToExpiration']
+    puts = chain.select(~chain.is_call & (dte >= 30) & (dte <= 45) & (chain['delta'] > -0.2))
+    frame = puts.to_pandas()
+"""
+
+import codecs
+import json
+import re
+
+import numpy as np
+
+from pythonic_schwab_api.json_codec import get_codec
+
+NUMERIC_FIELDS = (
+    'strikePrice', 'bid', 'ask', 'last', 'mark', 'bidSize', 'askSize', 'lastSize', 'highPrice', 'lowPrice',
+    'openPrice', 'closePrice', 'netChange', 'percentChange', 'markChange', 'markPercentChange', 'totalVolume',
+    'openInterest', 'volatility', 'delta', 'gamma', 'theta', 'vega', 'rho', 'timeValue',
+    'theoreticalOptionValue', 'theoreticalVolatility', 'intrinsicValue', 'extrinsicValue',
+    'daysToExpiration', 'multiplier'
+)
+TIME_FIELDS = ('quoteTimeInLong', 'tradeTimeInLong', 'lastTradingDay')
+EXPIRATION_MAPS = (('callExpDateMap', True), ('putExpDateMap', False))
+NAT = np.iinfo(np.int64).min  # int64 value that reads as NaT once viewed as datetime64
+STREAM_CHUNK_SIZE = 64 * 1024  # Bytes read from a streamed response at a time
+WHITESPACE = re.compile(r'[ \t\n\r]*')
+NUMBER_TAIL = re.compile(r'[0-9.eE+-]*')
+
+
+class _StreamReader:
+    """Pull-based cursor over JSON text arriving in byte chunks, holding only the unconsumed part."""
+
+    def __init__(self, chunks):
+        self.chunks = iter(chunks)
+        self.utf8 = codecs.getincrementaldecoder('utf-8')()
+        self.decoder = json.JSONDecoder()
+        self.text = ''
+        self.pos = 0
+
+    def fill(self):
+        """Append the next chunk to the buffer. Returns False once the stream is exhausted."""
+        for chunk in self.chunks:
+            if chunk:
+                self.text = self.text[self.pos:] + self.utf8.decode(chunk)
+                self.pos = 0
+                return True
+        return False
+
+    def peek(self):
+        """Return the next non-whitespace character without consuming it."""
+        while True:
+            self.pos = WHITESPACE.match(self.text, self.pos).end()
+            if self.pos < len(self.text):
+                return self.text[self.pos]
+            if not self.fill():
+                raise ValueError("Unexpected end of option chain stream")
+
+    def expect(self, char):
+        """Consume the next non-whitespace character, which must be char."""
+        if self.peek() != char:
+            raise ValueError(f"Expected {char!r} at {self.text[self.pos:self.pos + 40]!r}")
+        self.pos += 1
+
+    def next_member(self, close):
+        """Consume a separator; return False once the container's close character is consumed."""
+        char = self.peek()
+        if char == close:
+            self.pos += 1
+            return False
+        if char == ',':
+            self.pos += 1
+        return True
+
+    def value(self):
+        """Decode the next complete JSON value, reading more chunks until it is whole."""
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.text, self.pos)
+            except json.JSONDecodeError:
+                if not self.fill():
+                    raise
+                continue
+            # A number cut off by the end of the buffer (e.g. "12." of "12.5") decodes early, so read on
+            if NUMBER_TAIL.match(self.text, end).end() < len(self.text) or not self.fill():
+                self.pos = end
+                return value
+
+    def key(self):
+        """Decode an object key and its colon."""
+        key = self.value()
+        self.expect(':')
+        return key
+
+
+def iter_chain_contracts(chunks, underlying=None):
+    """
+    Incrementally parse a /chains response body, yielding contracts as they arrive.
+
+    Only the contract being parsed and the unconsumed part of the current
+    chunk are held in memory, never the whole document.
+
+    Args:
+        chunks (iterable): The response body in byte chunks, e.g. response.iter_content(STREAM_CHUNK_SIZE).
+        underlying (dict, optional): Filled with the top-level chain fields as they are parsed.
+
+    Yields:
+        tuple: (expiration key, e.g. "2024-06-21:30", True for a call, contract dict).
+    """
+    if underlying is None:
+        underlying = {}
+    maps = dict(EXPIRATION_MAPS)
+    reader = _StreamReader(chunks)
+    reader.expect('{')
+    while reader.next_member('}'):
+        name = reader.key()
+        if name not in maps or reader.peek() != '{':
+            underlying[name] = reader.value()
+            continue
+        is_call = maps[name]
+        reader.expect('{')
+        while reader.next_member('}'):
+            expiry_key = reader.key()
+            reader.expect('{')
+            while reader.next_member('}'):
+                reader.key()
+                reader.expect('[')
+                while reader.next_member(']'):
+                    yield expiry_key, is_call, reader.value()
+
+
+def flatten_chain(response):
+    """Yield (expiration key, is call, contract) for every contract of a decoded /chains response."""
+    for map_name, is_call in EXPIRATION_MAPS:
+        for expiry_key, strikes in (response.get(map_name) or {}).items():
+            for contracts in strikes.values():
+                for contract in contracts:
+                    yield expiry_key, is_call, contract
+
+
+class OptionChain:
+    """
+    Columnar option contracts for one underlying.
+
+    Attributes:
+        underlying (dict): Top-level chain fields (symbol, underlyingPrice, interestRate, ...).
+        symbols (np.ndarray): Contract symbols.
+        expiration (np.ndarray): Expiration dates, datetime64[D].
+        is_call (np.ndarray): True for calls, False for puts.
+        in_the_money (np.ndarray): Whether each contract is in the money.
+        numeric (np.ndarray): float64 block of shape (len(NUMERIC_FIELDS), contracts).
+        times (np.ndarray): int64 block of epoch milliseconds, shape (len(TIME_FIELDS), contracts).
+    """
+    columns = NUMERIC_FIELDS
+    time_columns = TIME_FIELDS
+    _positions = {field: position for position, field in enumerate(NUMERIC_FIELDS)}
+    _time_positions = {field: position for position, field in enumerate(TIME_FIELDS)}
+
+    def __init__(self, raw=None, codec=None):
+        """
+        Initialize an OptionChain that decodes raw response bytes on first access.
+
+        Use from_response() to build one from an already decoded response.
+
+        Args:
+            raw (bytes, optional): The /chains response body.
+            codec (JSONCodec, optional): Codec to decode it with. Defaults to the fastest installed one.
+        """
+        self._raw = raw
+        self._codec = codec
+        self._loaded = raw is None
+        self._expiry_slices = None
+        self._underlying = {}
+        self._symbols = self._expiration = self._is_call = self._in_the_money = None
+        self._numeric = self._times = None
+
+    @classmethod
+    def from_bytes(cls, raw, codec=None):
+        """
+        Build a lazily decoded chain from a /chains response body.
+
+        Args:
+            raw (bytes): The response body.
+            codec (JSONCodec, optional): Codec to decode it with.
+
+        Returns:
+            OptionChain: The chain; decoding happens on first access.
+        """
+        return cls(raw, codec)
+
+    @classmethod
+    def from_response(cls, response):
+        """
+        Build a chain from a decoded /chains response.
+
+        Args:
+            response (dict): The decoded response, as returned by Options.get_chains.
+
+        Returns:
+            OptionChain: The chain.
+        """
+        chain = cls()
+        chain._build(response, flatten_chain(response))
+        return chain
+
+    @classmethod
+    def from_stream(cls, chunks):
+        """
+        Build a chain from a streamed /chains response body, parsing contracts as they arrive.
+
+        Args:
+            chunks (iterable): The response body in byte chunks.
+
+        Returns:
+            OptionChain: The chain.
+        """
+        underlying = {}
+        return cls.from_contracts(underlying, iter_chain_contracts(chunks, underlying))
+
+    @classmethod
+    def from_contracts(cls, underlying, contracts):
+        """
+        Build a chain from parsed contracts, as yielded by iter_chain_contracts.
+
+        Args:
+            underlying (dict): Top-level chain fields; may be filled while contracts are consumed.
+            contracts (iterable): (expiration key, is call, contract dict) tuples.
+
+        Returns:
+            OptionChain: The chain.
+        """
+        chain = cls()
+        chain._build(underlying, contracts)
+        return chain
+
+    @classmethod
+    def from_arrays(cls, underlying, symbols, expiration, is_call, in_the_money, numeric, times):
+        """Build a chain from prepared arrays, already sorted by expiration, strike and put/call."""
+        chain = cls()
+        chain._underlying = underlying
+        chain._symbols, chain._expiration, chain._is_call = symbols, expiration, is_call
+        chain._in_the_money, chain._numeric, chain._times = in_the_money, numeric, times
+        return chain
+
+    def _load(self):
+        if not self._loaded:
+            response = (self._codec or get_codec()).loads(self._raw)
+            self._build(response, flatten_chain(response))
+            self._raw = None
+            self._loaded = True
+
+    def _build(self, underlying, contracts):
+        """Fill sorted columns from (expiration key, is call, contract) tuples."""
+        numbers, stamps, symbols, expirations, calls, itm = [], [], [], [], [], []
+        for expiry_key, is_call, contract in contracts:
+            numbers.extend(contract.get(field) for field in NUMERIC_FIELDS)
+            for field in TIME_FIELDS:
+                stamp = contract.get(field)
+                stamps.append(NAT if stamp is None else stamp)
+            symbols.append(contract.get('symbol'))
+            expirations.append(expiry_key[:10])
+            calls.append(is_call)
+            itm.append(bool(contract.get('inTheMoney')))
+        count = len(symbols)
+        numeric = np.array(numbers, dtype=np.float64).reshape(count, len(NUMERIC_FIELDS)).T
+        times = np.array(stamps, dtype=np.int64).reshape(count, len(TIME_FIELDS)).T
+        expiration = np.array(expirations, dtype='datetime64[D]')
+        is_call = np.array(calls, dtype=bool)
+        order = np.lexsort((~is_call, numeric[self._positions['strikePrice']], expiration))
+        self._underlying = {name: value for name, value in underlying.items()
+                            if name not in ('callExpDateMap', 'putExpDateMap')}
+        self._symbols = np.array(symbols, dtype=object)[order]
+        self._expiration = expiration[order]
+        self._is_call = is_call[order]
+        self._in_the_money = np.array(itm, dtype=bool)[order]
+        self._numeric = np.ascontiguousarray(numeric[:, order])
+        self._times = np.ascontiguousarray(times[:, order])
+
+    @property
+    def underlying(self):
+        """dict: Top-level chain fields, such as symbol, underlyingPrice and volatility."""
+        self._load()
+        return self._underlying
+
+    @property
+    def symbols(self):
+        """np.ndarray: Contract symbols (object dtype)."""
+        self._load()
+        return self._symbols
+
+    @property
+    def expiration(self):
+        """np.ndarray: Contract expiration dates (datetime64[D])."""
+        self._load()
+        return self._expiration
+
+    @property
+    def is_call(self):
+        """np.ndarray: True for calls, False for puts."""
+        self._load()
+        return self._is_call
+
+    @property
+    def in_the_money(self):
+        """np.ndarray: Whether each contract is in the money."""
+        self._load()
+        return self._in_the_money
+
+    @property
+    def numeric(self):
+        """np.ndarray: float64 block of NUMERIC_FIELDS, one row per field and one column per contract."""
+        self._load()
+        return self._numeric
+
+    @property
+    def times(self):
+        """np.ndarray: int64 block of TIME_FIELDS in epoch milliseconds, NAT where missing."""
+        self._load()
+        return self._times
+
+    def __len__(self):
+        return len(self.symbols)
+
+    def __getitem__(self, field):
+        """
+        Return a column.
+
+        Args:
+            field (str): A numeric field, a time field (as datetime64[ms]), 'symbol',
+                'expiration', 'isCall' or 'inTheMoney'.
+
+        Returns:
+            np.ndarray: The column.
+        """
+        if field in self._positions:
+            return self.numeric[self._positions[field]]
+        if field in self._time_positions:
+            return self.times[self._time_positions[field]].view('datetime64[ms]')
+        special = {'symbol': 'symbols', 'expiration': 'expiration', 'isCall': 'is_call', 'inTheMoney': 'in_the_money'}
+        if field in special:
+            return getattr(self, special[field])
+        raise KeyError(field)
+
+    @property
+    def expirations(self):
+        """np.ndarray: Sorted unique expiration dates."""
+        return np.unique(self.expiration)
+
+    @property
+    def strikes(self):
+        """np.ndarray: Sorted unique strike prices."""
+        return np.unique(self['strikePrice'])
+
+    @property
+    def calls(self):
+        """OptionChain: The call contracts."""
+        return self.select(self.is_call)
+
+    @property
+    def puts(self):
+        """OptionChain: The put contracts."""
+        return self.select(~self.is_call)
+
+    def for_expiration(self, date):
+        """
+        Return the contracts expiring on a date, as a view of this chain.
+
+        Args:
+            date (str or datetime.date or np.datetime64): The expiration date.
+
+        Returns:
+            OptionChain: The contracts, sorted by strike.
+        """
+        if self._expiry_slices is None:
+            dates, starts, counts = np.unique(self.expiration, return_index=True, return_counts=True)
+            self._expiry_slices = {date_: slice(start, start + count)
+                                   for date_, start, count in zip(dates.tolist(), starts, counts)}
+        window = self._expiry_slices.get(np.datetime64(date, 'D').tolist(), slice(0, 0))
+        return self._slice(window)
+
+    def for_strike(self, strike):
+        """
+        Return the contracts at a strike price, across expirations.
+
+        Args:
+            strike (float): The strike price.
+
+        Returns:
+            OptionChain: The contracts, sorted by expiration.
+        """
+        return self.select(self['strikePrice'] == strike)
+
+    def _slice(self, rows):
+        return OptionChain.from_arrays(self.underlying, self.symbols[rows], self.expiration[rows], self.is_call[rows],
+                                       self.in_the_money[rows], self.numeric[:, rows], self.times[:, rows])
+
+    def select(self, mask):
+        """
+        Return the contracts where mask is True (or at the given positions).
+
+        Args:
+            mask (np.ndarray): Boolean mask or integer positions.
+
+        Returns:
+            OptionChain: The selected contracts.
+        """
+        return self._slice(mask)
+
+    def to_pandas(self):
+        """
+        Return the contracts as a pandas DataFrame indexed by contract symbol.
+
+        Returns:
+            pd.DataFrame: One row per contract, with putCall and expiration columns.
+        """
+        import pandas as pd  # pylint: disable=import-outside-toplevel
+        frame = pd.DataFrame(self.numeric.T, index=pd.Index(self.symbols, name='symbol'),
+                             columns=list(self.columns), copy=False)
+        frame.insert(0, 'expiration', self.expiration)
+        frame.insert(1, 'putCall', np.where(self.is_call, 'CALL', 'PUT'))
+        frame['inTheMoney'] = self.in_the_money
+        stamps = self.times.view('datetime64[ms]')
+        for position, field in enumerate(self.time_columns):
+            frame[field] = stamps[position]
+        return frame
+
+    @property
+    def nbytes(self):
+        """int: Bytes held by the columns, excluding the contract symbol strings."""
+        return sum(array.nbytes for array in (self.symbols, self.expiration, self.is_call, self.in_the_money,
+                                              self.numeric, self.times))
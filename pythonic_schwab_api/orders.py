@@ -30,7 +30,7 @@ class Orders:
             client: A configured client instance used to make API requests.
         """
         self.client = client
-        self.base_url = client.config.ORDERS_BASE_URL
+        self.base_url = client.config.orders_base_url
 
     def create_order_schema(self, symbol, side, quantity, order_type='MARKET',
                             limit_price=None, time_in_force='DAY', session='NORMAL'):
@@ -175,3 +175,37 @@ class Orders:
         """
         endpoint = f"{self.base_url}/{account_hash}/orders/{order_id}"
         return self.client.make_request(endpoint, method='PUT', data=new_order_details)
+
+
+class AsyncOrders(Orders):
+    """
+    Asynchronous variant of Orders for use with an AsyncAPIClient.
+
+    Request methods are coroutines with the same arguments and return values
+    as their Orders counterparts; create_order_schema stays synchronous.
+    """
+    # pylint: disable=invalid-overridden-method  # coroutine overrides are what makes this the async variant
+    async def get_orders(self, account_hash, max_results=100, from_entered_time=None, to_entered_time=None, status=None):
+        """Retrieve a list of orders for a specified account. See Orders.get_orders."""
+        return await super().get_orders(account_hash, max_results, from_entered_time, to_entered_time, status)
+
+    async def preview_order(self, account_hash, order_details):
+        """Preview a new order for an account. See Orders.preview_order."""
+        # Orders.preview_order returns a placeholder until the endpoint is available
+        return super().preview_order(account_hash, order_details)
+
+    async def place_order(self, account_hash, order_details):
+        """Place a new order for an account. See Orders.place_order."""
+        return await super().place_order(account_hash, order_details)
+
+    async def get_order(self, account_hash, order_id):
+        """Retrieve details for a specific order. See Orders.get_order."""
+        return await super().get_order(account_hash, order_id)
+
+    async def cancel_order(self, account_hash, order_id):
+        """Cancel a specific order. See Orders.cancel_order."""
+        return await super().cancel_order(account_hash, order_id)
+
+    async def replace_order(self, account_hash, order_id, new_order_details):
+        """Replace an existing order with new details. See Orders.replace_order."""
+        return await super().replace_order(account_hash, order_id, new_order_details)
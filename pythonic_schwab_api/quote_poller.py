@@ -0,0 +1,248 @@
+"""
+This module provides QuotePoller, a change-detecting polling loop over Quotes.
+
+The poller keeps a set of symbols refreshed through Quotes.get_list (which
+chunks large lists), compares each quote with the previous one field by field
+and emits only the symbols that changed, with the changed fields. With a
+MarketCalendar the cadence adapts to the session: fast during regular hours,
+slower in pre/post-market and slowest while the market is closed.
+
+Changes are delivered to an on_change callback from run()/start(), or
+through the async iterator changes(), which works with both APIClient and
+AsyncAPIClient.
+
+Usage example:
+    poller = QuotePoller(client, ["AAPL", "MSFT"], calendar=MarketCalendar(client), on_change=print)
+    poller.start()
+    ...
+    poller.stop()
+
+    async for change in QuotePoller(async_client, symbols).changes():
+        print(change.symbol, change.fields)
+"""
+
+import asyncio
+import threading
+import time
+from collections import namedtuple
+
+from pythonic_schwab_api.market_data import AsyncQuotes, Quotes
+
+QuoteChange = namedtuple('QuoteChange', ['symbol', 'fields', 'quote'])
+QuoteChange.__doc__ = """
+One symbol's changes between two polls.
+
+Attributes:
+    symbol (str): The symbol.
+    fields (dict): (previous, current) values keyed by "section.field", e.g. "quote.bidPrice".
+        Every field is listed on the symbol's first poll, with None as the previous value.
+    quote (dict): The symbol's full current /quotes entry.
+"""
+
+
+def flatten_quote(entry):
+    """Flatten a /quotes entry into a dict keyed by "section.field"."""
+    flat = {}
+    for section, values in entry.items():
+        if isinstance(values, dict):
+            for field, value in values.items():
+                flat[f"{section}.{field}"] = value
+        else:
+            flat[section] = values
+    return flat
+
+
+class QuotePoller:
+    """
+    Polls quotes for a set of symbols and reports only what changed.
+
+    Attributes:
+        client (APIClient): The client quotes are fetched through.
+        quotes (Quotes): Quotes (or AsyncQuotes) bound to the client.
+        symbols (list): Symbols polled.
+        fields (str): Quote sections requested, e.g. "quote" or "quote,fundamental".
+        calendar (MarketCalendar): Calendar the cadence adapts to, or None for a fixed cadence.
+        market (str): Calendar market whose sessions set the cadence.
+        intervals (dict): Seconds between polls keyed by 'regular', 'extended' and 'closed'.
+        ignore_fields (set): "section.field" keys not compared, e.g. timestamps.
+        on_change (callable): Called with the list of QuoteChange of each poll that changed something.
+        polls (int): Polls made.
+    """
+
+    def __init__(self, client, symbols, fields='quote', calendar=None, market='equity', intervals=None,
+                 ignore_fields=(), on_change=None):
+        """
+        Initialize the QuotePoller.
+
+        Args:
+            client (APIClient): The client to fetch quotes through; an AsyncAPIClient is polled asynchronously.
+            symbols (iterable): Symbols to poll.
+            fields (str, optional): Quote sections to request. Defaults to 'quote'.
+            calendar (MarketCalendar, optional): Calendar to adapt the cadence to.
+            market (str, optional): Calendar market setting the cadence. Defaults to 'equity'.
+            intervals (dict, optional): Seconds between polls per session. Defaults to config.quote_polling.
+            ignore_fields (iterable, optional): "section.field" keys to leave out of comparisons.
+            on_change (callable, optional): Called with each poll's list of QuoteChange.
+        """
+        self.client = client
+        quotes_class = AsyncQuotes if asyncio.iscoroutinefunction(client.make_request) else Quotes
+        self.quotes = quotes_class(client)
+        self.symbols = list(dict.fromkeys(symbols))
+        self.fields = fields
+        self.calendar = calendar
+        self.market = market
+        self.intervals = {**client.config.quote_polling['intervals'], **(intervals or {})}
+        self.ignore_fields = set(ignore_fields)
+        self.on_change = on_change
+        self.polls = 0
+        self._previous = {}
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def add(self, symbols):
+        """Start polling more symbols."""
+        self.symbols = list(dict.fromkeys(self.symbols + list(symbols)))
+
+    def remove(self, symbols):
+        """Stop polling symbols and forget their last quotes."""
+        removed = set(symbols)
+        self.symbols = [symbol for symbol in self.symbols if symbol not in removed]
+        for symbol in removed:
+            self._previous.pop(symbol, None)
+
+    def interval(self, when=None):
+        """
+        Return the seconds to wait between polls at a time.
+
+        Args:
+            when (datetime or float, optional): The time. Defaults to now.
+
+        Returns:
+            float: The 'regular', 'extended' or 'closed' interval, depending on the market's session.
+        """
+        if self.calendar is None:
+            return self.intervals['regular']
+        if self.calendar.is_open(when, self.market, 'regularMarket'):
+            return self.intervals['regular']
+        if self.calendar.is_open(when, self.market, ('preMarket', 'postMarket')):
+            return self.intervals['extended']
+        return self.intervals['closed']
+
+    def _safe_interval(self):
+        """Return interval(), or the 'closed' interval if the calendar could not be refreshed."""
+        try:
+            return self.interval()
+        except self.client.request_errors as e:
+            self.client.logger.error("Market calendar refresh failed: %s", e)
+            return self.intervals['closed']
+
+    def diff(self, quotes):
+        """
+        Compare quotes with the previous poll's and remember them.
+
+        Args:
+            quotes (dict): /quotes entries keyed by symbol.
+
+        Returns:
+            list: QuoteChange for each symbol with at least one changed field.
+        """
+        changes = []
+        for symbol, entry in quotes.items():
+            current = flatten_quote(entry)
+            for field in self.ignore_fields:
+                current.pop(field, None)
+            previous = self._previous.get(symbol, {})
+            changed = {field: (previous.get(field), value) for field, value in current.items()
+                       if field not in previous or previous[field] != value}
+            changed.update((field, (value, None)) for field, value in previous.items() if field not in current)
+            if changed:
+                changes.append(QuoteChange(symbol, changed, entry))
+            self._previous[symbol] = current
+        return changes
+
+    def _collect(self, quotes):
+        self.polls += 1
+        if quotes.errors:
+            self.client.logger.warning("Quote poll missed %d chunks", len(quotes.errors))
+        wanted = set(self.symbols)  # drop symbols removed while the request was in flight
+        return self.diff({symbol: entry for symbol, entry in quotes.items() if symbol in wanted})
+
+    def poll(self):
+        """
+        Fetch the quotes once and return what changed since the last poll.
+
+        Returns:
+            list: QuoteChange for each changed symbol.
+        """
+        return self._collect(self.quotes.get_list(self.symbols, self.fields))
+
+    def run(self, duration=None):
+        """
+        Poll until stop() is called (or for duration seconds), calling on_change with each poll's changes.
+
+        A failed poll is logged and retried at the next interval; if the calendar cannot be
+        refreshed, the 'closed' interval is used.
+
+        Args:
+            duration (float, optional): Seconds to run for. Defaults to running until stopped.
+        """
+        deadline = None if duration is None else time.monotonic() + duration
+        self._stop_event.clear()
+        while not self._stop_event.is_set():
+            started = time.monotonic()
+            try:
+                changes = self.poll() if self.symbols else []
+                if changes and self.on_change is not None:
+                    self.on_change(changes)
+            except self.client.request_errors as e:
+                self.client.logger.error("Quote poll failed: %s", e)
+            wait = self._safe_interval() - (time.monotonic() - started)
+            if deadline is not None:
+                wait = min(wait, deadline - time.monotonic())
+                if wait <= 0:
+                    break
+            self._stop_event.wait(max(wait, 0))
+
+    def start(self):
+        """Run the polling loop in a background thread."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self.run, daemon=True, name="QuotePoller")
+        self._thread.start()
+
+    def stop(self):
+        """Stop the polling loop and wait for a background thread to finish."""
+        self._stop_event.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+            self._thread = None
+
+    async def changes(self):
+        """
+        Poll until stop() is called, yielding each changed symbol as a QuoteChange.
+
+        Works with an AsyncAPIClient, or with an APIClient whose requests are run in a worker thread.
+
+        Yields:
+            QuoteChange: One change per symbol and poll.
+        """
+        self._stop_event.clear()
+        while not self._stop_event.is_set():
+            started = time.monotonic()
+            changes = []
+            try:
+                if self.symbols:
+                    if isinstance(self.quotes, AsyncQuotes):
+                        quotes = await self.quotes.get_list(self.symbols, self.fields)
+                    else:
+                        quotes = await asyncio.get_running_loop().run_in_executor(
+                            None, self.quotes.get_list, self.symbols, self.fields)
+                    changes = self._collect(quotes)
+            except self.client.request_errors as e:
+                self.client.logger.error("Quote poll failed: %s", e)
+            for change in changes:
+                yield change
+            # The calendar may refresh itself over HTTP, so keep it off the event loop
+            interval = await asyncio.get_running_loop().run_in_executor(None, self._safe_interval)
+            await asyncio.sleep(max(interval - (time.monotonic() - started), 0))
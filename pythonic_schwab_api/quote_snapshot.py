@@ -0,0 +1,161 @@
+"""
+This module provides QuoteSnapshot, a columnar view of a /quotes response.
+
+A snapshot holds one NumPy array per quote field, with one row per symbol,
+built in a single pass over the decoded JSON. Numeric fields share one
+float64 block (missing values are NaN) and timestamps one int64 block of
+epoch milliseconds (missing values are NaT), so screening a universe is a
+vectorized expression over columns and to_pandas() wraps the blocks
+without copying them.
+
+Usage example:
+    snapshot = Quotes(client).get_snapshot(symbols)
+    spread = snapshot['askPrice'] - snapshot['bidPrice']
+    tight = snapshot.select(spread < 0.05).to_pandas()
+"""
+
+import numpy as np
+
+# (response section, field) per numeric column; columns are named after the field
+NUMERIC_FIELDS = (
+    ('quote', 'bidPrice'), ('quote', 'askPrice'), ('quote', 'lastPrice'), ('quote', 'mark'),
+    ('quote', 'openPrice'), ('quote', 'highPrice'), ('quote', 'lowPrice'), ('quote', 'closePrice'),
+    ('quote', 'netChange'), ('quote', 'netPercentChange'), ('quote', 'bidSize'), ('quote', 'askSize'),
+    ('quote', 'lastSize'), ('quote', 'totalVolume'), ('quote', '52WeekHigh'), ('quote', '52WeekLow'),
+    ('regular', 'regularMarketLastPrice'), ('regular', 'regularMarketLastSize'),
+    ('regular', 'regularMarketNetChange'), ('regular', 'regularMarketPercentChange')
+)
+TIME_FIELDS = (
+    ('quote', 'quoteTime'), ('quote', 'tradeTime'), ('quote', 'bidTime'), ('quote', 'askTime'),
+    ('regular', 'regularMarketTradeTime')
+)
+NAT = np.iinfo(np.int64).min  # int64 value that reads as NaT once viewed as datetime64
+
+
+class QuoteSnapshot:
+    """
+    Columnar quotes for a universe of symbols.
+
+    Attributes:
+        symbols (np.ndarray): Symbols, in row order.
+        numeric (np.ndarray): float64 block of shape (len(NUMERIC_FIELDS), len(symbols)).
+        times (np.ndarray): int64 block of epoch milliseconds, shape (len(TIME_FIELDS), len(symbols)).
+        index (dict): Row number keyed by symbol.
+        errors (dict): Failed request chunks carried over from QuoteResult.errors.
+    """
+    columns = tuple(field for _, field in NUMERIC_FIELDS)
+    time_columns = tuple(field for _, field in TIME_FIELDS)
+    _positions = {field: position for position, field in enumerate(columns)}
+    _time_positions = {field: position for position, field in enumerate(time_columns)}
+
+    def __init__(self, symbols, numeric, times, errors=None):
+        """
+        Initialize the QuoteSnapshot from prepared arrays. Use from_quotes() to build one from a response.
+
+        Args:
+            symbols (np.ndarray): Symbols, in row order.
+            numeric (np.ndarray): float64 block, one row per numeric field.
+            times (np.ndarray): int64 block of epoch milliseconds, one row per time field.
+            errors (dict, optional): Failed request chunks.
+        """
+        self.symbols = symbols
+        self.numeric = numeric
+        self.times = times
+        self.index = {symbol: row for row, symbol in enumerate(symbols.tolist())}
+        self.errors = errors or {}
+
+    @classmethod
+    def from_quotes(cls, quotes):
+        """
+        Build a snapshot from a /quotes response in one pass.
+
+        Args:
+            quotes (dict): Quote entries keyed by symbol, as returned by Quotes.get_list.
+
+        Returns:
+            QuoteSnapshot: The snapshot, with rows in the response's order.
+        """
+        numbers, stamps, symbols = [], [], []
+        empty = {}
+        for symbol, entry in quotes.items():
+            sections = {'quote': entry.get('quote') or empty, 'regular': entry.get('regular') or empty}
+            symbols.append(symbol)
+            numbers.extend(sections[section].get(field) for section, field in NUMERIC_FIELDS)
+            for section, field in TIME_FIELDS:
+                stamp = sections[section].get(field)
+                stamps.append(NAT if stamp is None else stamp)
+        count = len(symbols)
+        numeric = np.array(numbers, dtype=np.float64).reshape(count, len(NUMERIC_FIELDS)).T.copy()
+        times = np.array(stamps, dtype=np.int64).reshape(count, len(TIME_FIELDS)).T.copy()
+        return cls(np.array(symbols, dtype=object), numeric, times, getattr(quotes, 'errors', None))
+
+    def __len__(self):
+        return len(self.symbols)
+
+    def __contains__(self, symbol):
+        return symbol in self.index
+
+    def __getitem__(self, field):
+        """
+        Return a column as a read-only view.
+
+        Args:
+            field (str): A numeric field (float64) or a time field (datetime64[ms]).
+
+        Returns:
+            np.ndarray: The column.
+        """
+        if field in self._positions:
+            column = self.numeric[self._positions[field]]
+        elif field in self._time_positions:
+            column = self.times[self._time_positions[field]].view('datetime64[ms]')
+        else:
+            raise KeyError(field)
+        column = column.view()
+        column.flags.writeable = False
+        return column
+
+    def row(self, symbol):
+        """
+        Return one symbol's fields.
+
+        Args:
+            symbol (str): The symbol.
+
+        Returns:
+            dict: Field values keyed by column name.
+        """
+        position = self.index[symbol]
+        values = dict(zip(self.columns, self.numeric[:, position].tolist()))
+        values.update(zip(self.time_columns, self.times[:, position].view('datetime64[ms]')))
+        return values
+
+    def select(self, mask):
+        """
+        Return the rows where mask is True (or at the given positions) as a new snapshot.
+
+        Args:
+            mask (np.ndarray): Boolean mask or integer positions.
+
+        Returns:
+            QuoteSnapshot: The selected rows.
+        """
+        return QuoteSnapshot(self.symbols[mask], self.numeric[:, mask], self.times[:, mask], self.errors)
+
+    def to_pandas(self):
+        """
+        Return the snapshot as a pandas DataFrame indexed by symbol.
+
+        The numeric and time blocks are wrapped without copying where pandas
+        allows it, so the DataFrame shares memory with the snapshot.
+
+        Returns:
+            pd.DataFrame: One column per field.
+        """
+        import pandas as pd  # pylint: disable=import-outside-toplevel
+        index = pd.Index(self.symbols, name='symbol')
+        frame = pd.DataFrame(self.numeric.T, index=index, columns=list(self.columns), copy=False)
+        stamps = self.times.view('datetime64[ms]')
+        for position, field in enumerate(self.time_columns):
+            frame[field] = stamps[position]
+        return frame
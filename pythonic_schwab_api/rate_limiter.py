@@ -0,0 +1,190 @@
+"""
+This module provides client-side rate limiting for the Schwab API.
+
+Requests are paced with token buckets: one bucket sized to the app-wide
+request budget and optional buckets per endpoint family (trader, marketdata,
+orders). Buckets are thread-safe and shared by every client in the process
+that uses the same app key, so a burst of calls runs at the allowed rate
+without adding latency while budget remains.
+"""
+
+import threading
+import time
+
+
+def endpoint_family(url, config):
+    """
+    Classify a request URL into an endpoint family.
+
+    Args:
+        url (str): The fully qualified request URL.
+        config (APIConfig): Configuration holding the API base URLs.
+
+    Returns:
+        str: One of 'marketdata', 'orders' or 'trader'.
+    """
+    if url.startswith(config.market_data_base_url):
+        return 'marketdata'
+    if url.startswith(config.orders_base_url) and '/orders' in url[len(config.orders_base_url):]:
+        return 'orders'
+    return 'trader'
+
+
+class TokenBucket:
+    """
+    A thread-safe token bucket.
+
+    Tokens refill continuously at ``capacity / period`` per second up to
+    ``capacity``. Callers that find the bucket empty reserve a token in the
+    future and are told how long to wait, so waiters are served in order.
+
+    Attributes:
+        capacity (float): Maximum number of tokens the bucket can hold.
+        rate (float): Tokens added per second.
+    """
+
+    def __init__(self, capacity, period):
+        """
+        Initialize a full token bucket.
+
+        Args:
+            capacity (int): Number of requests allowed per period (burst size).
+            period (float): Length of the period in seconds.
+        """
+        if capacity <= 0 or period <= 0:
+            raise ValueError("Token bucket capacity and period must be positive.")
+        self.capacity = float(capacity)
+        self.rate = capacity / period
+        self._tokens = self.capacity
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_settings(cls, settings):
+        """
+        Build a bucket from a ``{'requests': int, 'period': float}`` dict.
+
+        Args:
+            settings (dict): Rate limit settings, or None for no limit.
+
+        Returns:
+            TokenBucket: The configured bucket, or None if settings are empty or 'requests' is None.
+        """
+        if not settings or settings.get('requests') is None:
+            return None
+        return cls(settings['requests'], settings.get('period', 60))
+
+    def reserve(self, tokens=1):
+        """
+        Take tokens from the bucket, borrowing against future refills if needed.
+
+        Args:
+            tokens (int, optional): Number of tokens to take. Defaults to 1.
+
+        Returns:
+            float: Seconds the caller must wait before using the tokens (0 if available now).
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+            self._last = now
+            self._tokens -= tokens
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+    def acquire(self, tokens=1):
+        """
+        Take tokens from the bucket, sleeping until they are available.
+
+        Args:
+            tokens (int, optional): Number of tokens to take. Defaults to 1.
+
+        Returns:
+            float: Seconds spent waiting.
+        """
+        delay = self.reserve(tokens)
+        if delay:
+            time.sleep(delay)
+        return delay
+
+
+class RateLimiter:
+    """
+    RateLimiter paces requests against the app-wide and per-family budgets.
+
+    Attributes:
+        config (APIConfig): Configuration the limiter was built from.
+        global_bucket (TokenBucket): Bucket for the app-wide budget, or None.
+        family_buckets (dict): Buckets keyed by endpoint family.
+    """
+    _shared = {}
+    _shared_lock = threading.Lock()
+
+    def __init__(self, config):
+        """
+        Initialize the RateLimiter from an APIConfig.
+
+        Args:
+            config (APIConfig): Configuration with ``rate_limit`` and ``endpoint_rate_limits``.
+        """
+        self.config = config
+        self.global_bucket = TokenBucket.from_settings(config.rate_limit)
+        self.family_buckets = {}
+        for family, settings in (config.endpoint_rate_limits or {}).items():
+            bucket = TokenBucket.from_settings(settings)
+            if bucket:
+                self.family_buckets[family] = bucket
+
+    @classmethod
+    def shared(cls, config):
+        """
+        Return the process-wide limiter for the config's app key, creating it if needed.
+
+        All clients of the same Schwab app draw from the same budget, so they
+        must share one set of buckets.
+
+        Args:
+            config (APIConfig): Configuration identifying the app.
+
+        Returns:
+            RateLimiter: The shared limiter.
+        """
+        key = config.app_key or config.initials
+        with cls._shared_lock:
+            limiter = cls._shared.get(key)
+            if limiter is None:
+                limiter = cls(config)
+                cls._shared[key] = limiter
+            return limiter
+
+    def reserve(self, url):
+        """
+        Reserve budget for a request to the given URL.
+
+        Args:
+            url (str): The fully qualified request URL.
+
+        Returns:
+            float: Seconds the caller must wait before sending the request.
+        """
+        delay = self.global_bucket.reserve() if self.global_bucket else 0.0
+        bucket = self.family_buckets.get(endpoint_family(url, self.config))
+        if bucket:
+            delay = max(delay, bucket.reserve())
+        return delay
+
+    def acquire(self, url):
+        """
+        Block until a request to the given URL fits in the budget.
+
+        Args:
+            url (str): The fully qualified request URL.
+
+        Returns:
+            float: Seconds spent waiting.
+        """
+        delay = self.reserve(url)
+        if delay:
+            time.sleep(delay)
+        return delay
@@ -0,0 +1,114 @@
+"""
+This module provides request coalescing for identical concurrent GET requests.
+
+While a request is in flight, callers issuing the same request (same method,
+URL and normalized parameters) wait for it and receive its result instead of
+sending their own. Results are shared between callers and must be treated as
+read-only.
+
+Classes:
+    - RequestCoalescer: Coalesces calls made from several threads.
+    - AsyncRequestCoalescer: Coalesces calls made from coroutines on one event loop.
+"""
+
+import asyncio
+import threading
+
+
+class _Call:
+    """A request in flight and its eventual outcome."""
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class RequestCoalescer:
+    """
+    Coalesces identical concurrent calls made from several threads.
+
+    Attributes:
+        coalesced (int): Number of calls that reused another call's result.
+    """
+
+    def __init__(self):
+        """Initialize the RequestCoalescer."""
+        self.coalesced = 0
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, func):
+        """
+        Run func, or wait for the in-flight call with the same key and share its result.
+
+        Args:
+            key (tuple): The request key.
+            func (callable): Performs the request when no identical call is in flight.
+
+        Returns:
+            The result of the call.
+
+        Raises:
+            Exception: Whatever the call raised, re-raised to every waiting caller.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                self._calls[key] = call
+            else:
+                self.coalesced += 1
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+        try:
+            call.result = func()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.event.set()
+
+
+class AsyncRequestCoalescer:
+    """
+    Coalesces identical concurrent calls made from coroutines on one event loop.
+
+    The shared call runs as a task, so cancelling one waiter does not cancel
+    the request for the others.
+
+    Attributes:
+        coalesced (int): Number of calls that reused another call's result.
+    """
+
+    def __init__(self):
+        """Initialize the AsyncRequestCoalescer."""
+        self.coalesced = 0
+        self._calls = {}
+
+    async def do(self, key, func):
+        """
+        Await func(), or the in-flight call with the same key, and return its result.
+
+        Args:
+            key (tuple): The request key.
+            func (callable): Returns a coroutine performing the request.
+
+        Returns:
+            The result of the call.
+        """
+        task = self._calls.get(key)
+        if task is None:
+            task = asyncio.ensure_future(func())
+            self._calls[key] = task
+            task.add_done_callback(lambda done: self._calls.pop(key, None) if self._calls.get(key) is done else None)
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(task)
@@ -0,0 +1,190 @@
+"""
+This module provides ResponseCache, an in-memory cache for slow-changing GET
+responses such as market hours, instruments and user preferences.
+
+Entries expire after a per-endpoint TTL and the cache is a bounded LRU,
+evicting the least recently used entries once the entry count or the total
+response size exceeds its limits.
+"""
+
+import re
+import threading
+import time
+from collections import OrderedDict
+
+
+def request_key(method, url, params=None):
+    """
+    Build a hashable key identifying a request.
+
+    Parameters with a None value are dropped (requests does not send them)
+    and the rest are sorted, so equivalent requests share a key.
+
+    Args:
+        method (str): The HTTP method.
+        url (str): The fully qualified request URL.
+        params (dict, optional): The query parameters.
+
+    Returns:
+        tuple: The request key.
+    """
+    normalized = ()
+    if params:
+        normalized = tuple(sorted(
+            (key, tuple(str(item) for item in value) if isinstance(value, (list, tuple)) else str(value))
+            for key, value in params.items() if value is not None
+        ))
+    return method.upper(), url, normalized
+
+
+class ResponseCache:
+    """
+    A thread-safe, bounded LRU cache of parsed responses with per-endpoint TTLs.
+
+    Cached values are shared between callers and must be treated as read-only.
+
+    Attributes:
+        ttls (list): (compiled regex, seconds) pairs matched against request URLs.
+        max_entries (int): Maximum number of cached responses.
+        max_bytes (int): Maximum total size of cached response bodies.
+        hits (int): Number of lookups served from the cache.
+        misses (int): Number of lookups that were not cached or had expired.
+        evictions (int): Number of entries evicted to respect the size limits.
+    """
+
+    def __init__(self, ttls, max_entries=1024, max_bytes=32 * 1024 * 1024):
+        """
+        Initialize the ResponseCache.
+
+        Args:
+            ttls (dict): Seconds to cache responses for, keyed by regex matched against the URL.
+            max_entries (int, optional): Maximum number of cached responses.
+            max_bytes (int, optional): Maximum total size of cached response bodies.
+        """
+        self.ttls = [(re.compile(pattern), ttl) for pattern, ttl in ttls.items()]
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config):
+        """
+        Build the cache described by ``config.response_cache``.
+
+        Args:
+            config (APIConfig): Configuration with the cache settings.
+
+        Returns:
+            ResponseCache: The cache, or None if caching is disabled.
+        """
+        settings = config.response_cache
+        if not settings.get('enabled'):
+            return None
+        return cls(settings.get('ttls', {}),
+                   max_entries=settings.get('max_entries', 1024),
+                   max_bytes=settings.get('max_bytes', 32 * 1024 * 1024))
+
+    def ttl_for(self, url):
+        """
+        Return the TTL configured for a URL.
+
+        Args:
+            url (str): The fully qualified request URL.
+
+        Returns:
+            float: Seconds to cache the response for, or 0 if it is not cacheable.
+        """
+        for pattern, ttl in self.ttls:
+            if pattern.search(url):
+                return ttl
+        return 0
+
+    def get(self, key):
+        """
+        Look up a cached response.
+
+        Args:
+            key (tuple): The request key.
+
+        Returns:
+            tuple: (True, value) on a hit, (False, None) on a miss.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, size, value = entry
+                if time.monotonic() < expires_at:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return True, value
+                del self._entries[key]
+                self._bytes -= size
+            self.misses += 1
+            return False, None
+
+    def put(self, key, value, ttl, size=0):
+        """
+        Cache a response, evicting least recently used entries as needed.
+
+        Args:
+            key (tuple): The request key.
+            value: The parsed response.
+            ttl (float): Seconds to keep the response for.
+            size (int, optional): Size of the response body in bytes.
+        """
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous[1]
+            self._entries[key] = (time.monotonic() + ttl, size, value)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                _, (_, evicted_size, _) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+                self.evictions += 1
+
+    def invalidate(self, pattern=None):
+        """
+        Drop cached responses.
+
+        Args:
+            pattern (str, optional): Regex matched against the request URL;
+                if omitted, the whole cache is cleared.
+
+        Returns:
+            int: Number of entries dropped.
+        """
+        with self._lock:
+            if pattern is None:
+                dropped = len(self._entries)
+                self._entries.clear()
+                self._bytes = 0
+                return dropped
+            regex = re.compile(pattern)
+            keys = [key for key in self._entries if regex.search(key[1])]
+            for key in keys:
+                self._bytes -= self._entries.pop(key)[1]
+            return len(keys)
+
+    def stats(self):
+        """
+        Return the cache counters.
+
+        Returns:
+            dict: Hits, misses, evictions, current entry count and size in bytes.
+        """
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'entries': len(self._entries),
+                'bytes': self._bytes
+            }
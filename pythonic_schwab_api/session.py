@@ -0,0 +1,89 @@
+"""
+This module provides SchwabSession, the requests session used by APIClient.
+
+The session mounts one connection-pooling adapter per endpoint family
+(trader, marketdata, orders), each with its own pool size, timeout and
+retry/backoff policy taken from APIConfig.
+"""
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from pythonic_schwab_api.rate_limiter import endpoint_family
+
+ENDPOINT_FAMILIES = ('trader', 'marketdata', 'orders')
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+def build_retry(retry_strategy):
+    """
+    Build a urllib3 Retry from an APIConfig retry strategy dict.
+
+    Retries apply to connection errors and to 429 and 5xx responses, honoring
+    the Retry-After header. Non-idempotent methods such as POST are not retried.
+
+    Args:
+        retry_strategy (dict): ``{'total': int, 'backoff_factor': float}``, or None to disable.
+
+    Returns:
+        Retry: The retry policy.
+    """
+    if not retry_strategy:
+        return Retry(total=0, raise_on_status=False)
+    return Retry(
+        total=retry_strategy.get('total', 3),
+        backoff_factor=retry_strategy.get('backoff_factor', 1),
+        status_forcelist=RETRY_STATUSES,
+        respect_retry_after_header=True,
+        raise_on_status=False
+    )
+
+
+class SchwabSession(requests.Session):
+    """
+    A requests session that routes each request to its endpoint family's adapter.
+
+    Attributes:
+        config (APIConfig): Configuration the adapters were built from.
+        family_adapters (dict): HTTPAdapter per endpoint family.
+        family_timeouts (dict): Request timeout in seconds per endpoint family.
+    """
+
+    def __init__(self, config):
+        """
+        Initialize the session and mount the per-family adapters.
+
+        Args:
+            config (APIConfig): Configuration with the connection settings.
+        """
+        super().__init__()
+        self.config = config
+        self.family_adapters = {}
+        self.family_timeouts = {}
+        for family in ENDPOINT_FAMILIES:
+            settings = config.endpoint_settings(family)
+            self.family_adapters[family] = HTTPAdapter(
+                pool_connections=settings['pool_connections'],
+                pool_maxsize=settings['pool_maxsize'],
+                max_retries=build_retry(settings['retry_strategy'])
+            )
+            self.family_timeouts[family] = settings['timeout']
+
+    def get_adapter(self, url):
+        """Return the adapter for the URL's endpoint family, falling back to prefix matching."""
+        if url.startswith(self.config.api_base_url):
+            return self.family_adapters[endpoint_family(url, self.config)]
+        return super().get_adapter(url)
+
+    def request(self, method, url, *args, **kwargs):
+        """Send a request, applying the endpoint family's timeout unless one is given."""
+        if kwargs.get('timeout') is None and url.startswith(self.config.api_base_url):
+            kwargs['timeout'] = self.family_timeouts[endpoint_family(url, self.config)]
+        return super().request(method, url, *args, **kwargs)
+
+    def close(self):
+        """Close the session and its per-family adapters."""
+        for adapter in self.family_adapters.values():
+            adapter.close()
+        super().close()
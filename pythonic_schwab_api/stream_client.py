@@ -3,7 +3,8 @@ StreamClient module for handling WebSocket connections to a streaming API.
 
 This module provides the StreamClient class which manages the connection,
 sending, and receiving of messages through a WebSocket. It also handles
-reconnection logic and error handling.
+reconnection logic and error handling. It runs headless by default; the
+Tkinter output window is only imported and opened on request.
 """
 
 import json
@@ -12,7 +13,6 @@ from datetime import datetime
 import sys
 import websockets
 
-from pythonic_schwab_api.multi_terminal import MultiTerminal
 from pythonic_schwab_api.api_client import APIClient
 from pythonic_schwab_api.stream_utilities import basic_request
 from pythonic_schwab_api.color_print import ColorPrint
@@ -24,28 +24,35 @@ class StreamClient:
 
     Attributes:
         client (APIClient): The API client instance for making requests.
+        json_codec (JSONCodec): Codec used to encode and decode stream frames.
         websocket (WebSocket): The WebSocket connection instance.
         streamer_info (dict): Information about the streamer.
         start_timestamp (datetime): Timestamp when the stream started.
-        terminal (MultiTerminal): Terminal instance for output.
+        terminal (MultiTerminal): Terminal window for output, or None when headless.
         color_print (ColorPrint): Instance for colored printing.
         active (bool): Indicates if the connection is active.
         login_successful (bool): Indicates if login was successful.
         request_id (int): ID for tracking requests.
     """
 
-    def __init__(self, client: APIClient):
+    def __init__(self, client: APIClient, show_terminal=False):
         """
         Initialize the StreamClient with an API client.
 
         Args:
             client (APIClient): The API client instance.
+            show_terminal (bool, optional): Open a Tkinter window for stream output.
+                Defaults to False, which prints to the console instead.
         """
         self.client = client
+        self.json_codec = client.json_codec
         self.websocket = None
         self.streamer_info = None
         self.start_timestamp = None
-        self.terminal = MultiTerminal(title="Stream Output")
+        self.terminal = None
+        if show_terminal:
+            from pythonic_schwab_api.multi_terminal import MultiTerminal  # pylint: disable=import-outside-toplevel
+            self.terminal = MultiTerminal(title="Stream Output")
         self.color_print = ColorPrint()
         self.active = False
         self.login_successful = False
@@ -92,8 +99,9 @@ class StreamClient:
         if not self.active:
             await self.connect()
         try:
-            await self.websocket.send(json.dumps(message))
-            self.color_print.print("info", f"Message sent: {json.dumps(message)}")
+            payload = self.json_codec.dumps(message)
+            await self.websocket.send(payload)
+            self.color_print.print("info", f"Message sent: {payload}")
             response = await self.websocket.recv()
             await self.handle_response(response)
         except websockets.exceptions.ConnectionClosed as e:
@@ -112,7 +120,7 @@ class StreamClient:
         Args:
             message (str): The message received from the WebSocket.
         """
-        message = json.loads(message)
+        message = self.json_codec.loads(message)
         self.color_print.print("info", f"Received: {message}")
         if "Login" in message.get('command', '') and message.get('content', {}).get('code') == 0:
             self.login_successful = True
@@ -171,10 +179,10 @@ class StreamClient:
         try:
             async with websockets.connect(self.streamer_info.get('streamerSocketUrl')) as websocket:
                 self.websocket = websocket
-                await websocket.send(json.dumps(login))
+                await websocket.send(self.json_codec.dumps(login))
                 while True:
                     message = await websocket.recv()
-                    await self.handle_message(json.loads(message))
+                    await self.handle_message(self.json_codec.loads(message))
         except websockets.exceptions.ConnectionClosedOK:
             self.color_print.print("info", "Stream has closed.")
         except websockets.exceptions.ConnectionClosedError as e:
@@ -207,19 +215,32 @@ class StreamClient:
         Returns:
             bool: True if reconnection was successful, False otherwise.
         """
-        self.terminal.print("[INFO]: Attempting to reconnect...")
+        self._output("info", "Attempting to reconnect...")
         try:
             await asyncio.sleep(10)  # Wait before attempting to reconnect
             login = self._construct_login_message()  # Reconstruct login info
             await self._connect_and_stream(login)  # Attempt to reconnect
             return True
         except (websockets.exceptions.WebSocketException, asyncio.TimeoutError) as e:
-            self.terminal.print(f"Reconnect failed: {e}")
+            self._output("error", f"Reconnect failed: {e}")
             return False
         except Exception as e:
-            self.terminal.print(f"Reconnect failed: {e}")
+            self._output("error", f"Reconnect failed: {e}")
             return False
 
+    def _output(self, message_type, message):
+        """
+        Write a status message to the terminal window if one is open, else to the console.
+
+        Args:
+            message_type (str): The message type, e.g. 'info', 'warning' or 'error'.
+            message (str): The message to write.
+        """
+        if self.terminal is not None:
+            self.terminal.print(f"[{message_type.upper()}]: {message}")
+        else:
+            self.color_print.print(message_type, message)
+
     def _handle_stream_error(self, error):
         """
         Handle errors that occur during streaming.
@@ -231,12 +252,12 @@ class StreamClient:
         if isinstance(error, RuntimeError) and str(error) == "Streaming window has been closed":
             self.color_print.print("warning", "Streaming window has been closed.")
         elif isinstance(error, (websockets.exceptions.WebSocketException, asyncio.TimeoutError)):
-            self.terminal.print("[WARNING]: Connection lost to server, reconnecting...")
+            self._output("warning", "Connection lost to server, reconnecting...")
         else:
             if (datetime.now() - self.start_timestamp).seconds < 70:
                 self.color_print.print("error", "Stream not alive for more than 1 minute, exiting...")
             else:
-                self.terminal.print("[WARNING]: Connection lost to server, reconnecting...")
+                self._output("warning", "Connection lost to server, reconnecting...")
 
     def stop(self):
         """
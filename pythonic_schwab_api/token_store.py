@@ -0,0 +1,242 @@
+"""
+This module provides token stores that let several processes share one set of
+Schwab OAuth tokens.
+
+Stores expose a cross-process lock, atomic saves and a cheap version marker.
+APIClient holds the lock while refreshing, so only one process performs the
+OAuth round-trip; the others notice the version change and load the new token.
+
+Classes:
+    - TokenStore: Base class describing the store interface.
+    - JSONFileTokenStore: A JSON file with a lock file and atomic rename.
+    - SQLiteTokenStore: A row per initials in a SQLite database.
+"""
+
+import abc
+import contextlib
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+
+try:
+    import fcntl
+    msvcrt = None
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+class TokenStore(abc.ABC):
+    """
+    Base class for token stores.
+
+    Subclasses implement load, save, version and lock. save must be atomic:
+    readers see either the old or the new token, never a partial write.
+    """
+
+    @abc.abstractmethod
+    def load(self):
+        """
+        Load the stored token data.
+
+        Returns:
+            dict: The token data, or None if nothing is stored.
+        """
+
+    @abc.abstractmethod
+    def save(self, token_data):
+        """
+        Atomically replace the stored token data.
+
+        Args:
+            token_data (dict): The token data to store.
+        """
+
+    @abc.abstractmethod
+    def version(self):
+        """
+        Return a cheap marker that changes whenever the stored token changes.
+
+        Returns:
+            object: A comparable version marker, or None if nothing is stored.
+        """
+
+    @abc.abstractmethod
+    def lock(self):
+        """
+        Return a context manager holding an exclusive cross-process lock on the store.
+
+        Returns:
+            contextlib.AbstractContextManager: The lock context.
+        """
+
+
+class JSONFileTokenStore(TokenStore):
+    """
+    Token store backed by a JSON file.
+
+    Writes go to a temporary file that is renamed over the token file, and a
+    separate ``.lock`` file serializes refreshes across processes.
+
+    Attributes:
+        path (str): Path of the JSON token file.
+        lock_path (str): Path of the lock file.
+    """
+
+    def __init__(self, path):
+        """
+        Initialize the JSONFileTokenStore.
+
+        Args:
+            path (str): Path of the JSON token file.
+        """
+        self.path = path
+        self.lock_path = f"{path}.lock"
+
+    def load(self):
+        """Load the stored token data, or None if the file is missing."""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def save(self, token_data):
+        """Atomically replace the token file."""
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, temp_path = tempfile.mkstemp(dir=directory, prefix='.schwab_token_', suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(token_data, f)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, self.path)
+        except BaseException:
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(temp_path)
+            raise
+
+    def version(self):
+        """Return the token file's modification time and inode, or None if missing."""
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_ino
+
+    @contextlib.contextmanager
+    def lock(self):
+        """Hold an exclusive lock on the lock file."""
+        with open(self.lock_path, 'a+b') as f:
+            if fcntl:
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+            try:
+                yield
+            finally:
+                if fcntl:
+                    fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+                else:
+                    f.seek(0)
+                    msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+class SQLiteTokenStore(TokenStore):
+    """
+    Token store backed by a SQLite database, one row per key.
+
+    The lock is a ``BEGIN IMMEDIATE`` write transaction; loads and saves made
+    by the thread holding it run inside that transaction.
+
+    Attributes:
+        path (str): Path of the SQLite database.
+        key (str): Row key, usually the user initials.
+    """
+
+    def __init__(self, path, key):
+        """
+        Initialize the SQLiteTokenStore and create its table if needed.
+
+        Args:
+            path (str): Path of the SQLite database.
+            key (str): Row key, usually the user initials.
+        """
+        self.path = path
+        self.key = key
+        self._local = threading.local()
+        with contextlib.closing(self._connect()) as conn:
+            conn.execute("CREATE TABLE IF NOT EXISTS tokens "
+                         "(key TEXT PRIMARY KEY, data TEXT NOT NULL, version INTEGER NOT NULL)")
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    @contextlib.contextmanager
+    def _connection(self):
+        """Yield the lock-holding connection of this thread, or a short-lived one."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            yield conn
+            return
+        with contextlib.closing(self._connect()) as conn:
+            yield conn
+
+    def load(self):
+        """Load the stored token data, or None if no row exists."""
+        with self._connection() as conn:
+            row = conn.execute("SELECT data FROM tokens WHERE key = ?", (self.key,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def save(self, token_data):
+        """Replace the stored token data and bump its version."""
+        with self._connection() as conn:
+            conn.execute("INSERT INTO tokens (key, data, version) VALUES (?, ?, 1) "
+                         "ON CONFLICT(key) DO UPDATE SET data = excluded.data, version = tokens.version + 1",
+                         (self.key, json.dumps(token_data)))
+
+    def version(self):
+        """Return the row's version counter, or None if no row exists."""
+        with self._connection() as conn:
+            row = conn.execute("SELECT version FROM tokens WHERE key = ?", (self.key,)).fetchone()
+        return row[0] if row else None
+
+    @contextlib.contextmanager
+    def lock(self):
+        """Hold an immediate write transaction on the database."""
+        with contextlib.closing(self._connect()) as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            self._local.conn = conn
+            try:
+                yield
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            else:
+                conn.execute("COMMIT")
+            finally:
+                self._local.conn = None
+
+
+def create_token_store(config):
+    """
+    Build the token store described by ``config.token_store``.
+
+    Args:
+        config (APIConfig): Configuration with the token store settings.
+
+    Returns:
+        TokenStore: The configured store.
+    """
+    settings = config.token_store
+    backend = settings.get('backend', 'json')
+    if backend == 'json':
+        return JSONFileTokenStore(settings.get('path') or f'schwab_token_data_{config.initials}.json')
+    if backend == 'sqlite':
+        return SQLiteTokenStore(settings.get('path') or 'schwab_tokens.db', config.initials)
+    raise ValueError(f"Unknown token store backend: {backend}")
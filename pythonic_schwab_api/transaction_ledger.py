@@ -0,0 +1,340 @@
+"""
+This module provides TransactionLedger, a persistent local copy of account transactions backed by SQLite.
+
+Each account hash has a watermark: the end of its last successful sync.
+sync() fetches only the transactions after the watermark (less a small
+overlap for activity posted late) through Accounts.iter_transactions, and
+upserts them by activity ID, so daily reconciliation downloads just the new
+day's activity. Transactions are indexed by account, symbol, type and time,
+and their instrument legs are stored alongside so realized P&L per symbol
+(FIFO lots) and fees per day are computed locally.
+
+Usage example:
+    ledger = TransactionLedger(client, path="ledger.db")
+    ledger.sync()
+    pnl = ledger.realized_pnl()  # {symbol: realized P&L}
+    fees = ledger.fees_per_day(start=datetime.date(2024, 1, 1))
+"""
+
+import contextlib
+import datetime
+import json
+import sqlite3
+import threading
+from collections import defaultdict, deque
+
+from pythonic_schwab_api.accounts import Accounts
+
+SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS transactions (account_hash TEXT NOT NULL, activity_id INTEGER NOT NULL, "
+    "time_ms INTEGER NOT NULL, day TEXT NOT NULL, type TEXT, symbol TEXT, net_amount REAL, fees REAL NOT NULL, "
+    "data TEXT NOT NULL, PRIMARY KEY (account_hash, activity_id))",
+    "CREATE INDEX IF NOT EXISTS transactions_time ON transactions (account_hash, time_ms)",
+    "CREATE INDEX IF NOT EXISTS transactions_symbol ON transactions (account_hash, symbol, time_ms)",
+    "CREATE INDEX IF NOT EXISTS transactions_type ON transactions (account_hash, type, time_ms)",
+    "CREATE INDEX IF NOT EXISTS transactions_day ON transactions (day)",
+    "CREATE TABLE IF NOT EXISTS legs (account_hash TEXT NOT NULL, activity_id INTEGER NOT NULL, "
+    "time_ms INTEGER NOT NULL, symbol TEXT NOT NULL, asset_type TEXT, amount REAL, price REAL, cost REAL, "
+    "position_effect TEXT)",
+    "CREATE INDEX IF NOT EXISTS legs_activity ON legs (account_hash, activity_id)",
+    "CREATE INDEX IF NOT EXISTS legs_symbol ON legs (symbol, time_ms)",
+    "CREATE TABLE IF NOT EXISTS watermarks (account_hash TEXT PRIMARY KEY, synced_until INTEGER NOT NULL)"
+)
+BATCH_SIZE = 500  # Transactions written per SQLite transaction during a sync
+
+
+def parse_time(value):
+    """Parse a transaction timestamp such as "2024-01-02T14:30:00+0000" into an aware datetime."""
+    for pattern in ("%Y-%m-%dT%H:%M:%S%z", "%Y-%m-%dT%H:%M:%S.%f%z"):
+        try:
+            return datetime.datetime.strptime(value, pattern)
+        except ValueError:
+            continue
+    return datetime.datetime.fromisoformat(value.replace('Z', '+00:00'))
+
+
+def epoch_ms(value):
+    """Convert an aware datetime, or a date (midnight UTC), to epoch milliseconds."""
+    if not isinstance(value, datetime.datetime):
+        value = datetime.datetime.combine(value, datetime.time(), tzinfo=datetime.timezone.utc)
+    return int(value.timestamp() * 1000)
+
+
+def transaction_rows(account_hash, transaction):
+    """
+    Build the transactions row and the legs rows of one transaction.
+
+    Args:
+        account_hash (str): The account hash the transaction belongs to.
+        transaction (dict): The transaction, as returned by the transactions endpoint.
+
+    Returns:
+        tuple: (transactions row, list of legs rows).
+    """
+    stamp = parse_time(transaction.get('time') or transaction['tradeDate'])
+    time_ms = epoch_ms(stamp)
+    activity_id = transaction['activityId']
+    legs, fees, symbol = [], 0.0, None
+    for item in transaction.get('transferItems') or []:
+        instrument = item.get('instrument') or {}
+        if item.get('feeType'):
+            fees -= item.get('cost') or 0.0
+        elif instrument.get('symbol') and instrument.get('assetType') != 'CURRENCY':
+            symbol = symbol or instrument['symbol']
+            legs.append((account_hash, activity_id, time_ms, instrument['symbol'], instrument.get('assetType'),
+                         item.get('amount'), item.get('price'), item.get('cost'), item.get('positionEffect')))
+    row = (account_hash, activity_id, time_ms, stamp.astimezone(datetime.timezone.utc).date().isoformat(),
+           transaction.get('type'), symbol, transaction.get('netAmount'), round(fees, 10), json.dumps(transaction))
+    return row, legs
+
+
+class TransactionLedger:
+    """
+    Local, incrementally synced transaction history of one or more accounts.
+
+    Attributes:
+        client (APIClient): The client transactions are fetched through.
+        accounts (Accounts): Accounts bound to the client.
+        path (str): Path of the SQLite database.
+        initial_days (int): Days of history fetched the first time an account is synced.
+        overlap_days (int): Days before the watermark fetched again on each sync.
+    """
+
+    def __init__(self, client, path=None, initial_days=None, overlap_days=None):
+        """
+        Initialize the TransactionLedger and create its tables if needed.
+
+        Args:
+            client (APIClient): The client to fetch transactions through.
+            path (str, optional): Path of the SQLite database. Defaults to config.transaction_ledger['path'].
+            initial_days (int, optional): Days fetched on an account's first sync.
+                Defaults to config.transaction_ledger['initial_days'].
+            overlap_days (int, optional): Days refetched before the watermark.
+                Defaults to config.transaction_ledger['overlap_days'].
+        """
+        settings = client.config.transaction_ledger
+        self.client = client
+        self.accounts = Accounts(client)
+        self.path = path or settings['path']
+        self.initial_days = initial_days or settings['initial_days']
+        self.overlap_days = settings['overlap_days'] if overlap_days is None else overlap_days
+        self._local = threading.local()
+        with self._transaction() as conn:
+            for statement in SCHEMA:
+                conn.execute(statement)
+
+    def _connection(self):
+        """Return this thread's connection to the database."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = self._local.conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    @contextlib.contextmanager
+    def _transaction(self):
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    def close(self):
+        """Close this thread's connection to the database."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    def watermark(self, account_hash):
+        """
+        Return the end of an account's last successful sync.
+
+        Args:
+            account_hash (str): The account hash.
+
+        Returns:
+            datetime.datetime: The watermark (UTC), or None if the account was never synced.
+        """
+        row = self._connection().execute("SELECT synced_until FROM watermarks WHERE account_hash = ?",
+                                         (account_hash,)).fetchone()
+        return None if row is None else datetime.datetime.fromtimestamp(row[0] / 1000, tz=datetime.timezone.utc)
+
+    def store(self, account_hash, transactions):
+        """
+        Upsert transactions of an account, replacing stored ones with the same activity ID.
+
+        Args:
+            account_hash (str): The account hash.
+            transactions (list): Transactions as returned by the transactions endpoint.
+
+        Returns:
+            int: Number of transactions written.
+        """
+        rows, legs = [], []
+        for transaction in transactions:
+            if transaction.get('activityId') is None:
+                continue
+            row, transaction_legs = transaction_rows(account_hash, transaction)
+            rows.append(row)
+            legs.extend(transaction_legs)
+        if rows:
+            with self._transaction() as conn:
+                conn.executemany("DELETE FROM legs WHERE account_hash = ? AND activity_id = ?",
+                                 [(row[0], row[1]) for row in rows])
+                conn.executemany("INSERT OR REPLACE INTO transactions VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+                conn.executemany("INSERT INTO legs VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", legs)
+        return len(rows)
+
+    def sync(self, account_hashes=None, until=None):
+        """
+        Fetch the transactions each account has had since its watermark and store them.
+
+        Accounts synced before are fetched from their watermark less overlap_days;
+        new accounts from initial_days ago. Accounts sharing a start are fetched
+        together, concurrently, by Accounts.iter_transactions. A watermark only
+        advances once every window of its account has been fetched and stored;
+        if the account list cannot be fetched nothing is synced.
+
+        Args:
+            account_hashes (iterable, optional): The account hashes to sync. Defaults to every linked account.
+            until (datetime.datetime, optional): End of the sync (timezone-aware). Defaults to now.
+
+        Returns:
+            dict: Number of transactions written per account hash.
+        """
+        if account_hashes is None:
+            numbers = self.accounts.get_account_numbers()
+            if numbers is None:
+                self.client.logger.error("Transaction ledger sync skipped: account numbers could not be fetched")
+                return {}
+            account_hashes = [account['hashValue'] for account in numbers]
+        until = until or datetime.datetime.now(datetime.timezone.utc)
+        starts = defaultdict(list)
+        for account_hash in account_hashes:
+            watermark = self.watermark(account_hash)
+            if watermark is None:
+                start = until - datetime.timedelta(days=self.initial_days)
+            else:
+                start = min(watermark, until) - datetime.timedelta(days=self.overlap_days)
+            starts[start].append(account_hash)
+
+        written = dict.fromkeys(account_hashes, 0)
+        for start, hashes in starts.items():
+            batches = defaultdict(list)
+            for account_hash, transaction in self.accounts.iter_transactions(start, until, account_hashes=hashes):
+                batch = batches[account_hash]
+                batch.append(transaction)
+                if len(batch) >= BATCH_SIZE:
+                    written[account_hash] += self.store(account_hash, batch)
+                    batch.clear()
+            for account_hash, batch in batches.items():
+                written[account_hash] += self.store(account_hash, batch)
+            with self._transaction() as conn:
+                conn.executemany("INSERT OR REPLACE INTO watermarks VALUES (?, ?)",
+                                 [(account_hash, epoch_ms(until)) for account_hash in hashes])
+        self.client.logger.info("Transaction ledger synced: %s", written)
+        return written
+
+    @staticmethod
+    def _filters(account_hash=None, symbol=None, types=None, start=None, end=None, table='transactions'):
+        """Build a WHERE clause and its parameters."""
+        clauses, params = [], []
+        if account_hash is not None:
+            clauses.append(f"{table}.account_hash = ?")
+            params.append(account_hash)
+        if symbol is not None:
+            clauses.append(f"{table}.symbol = ?")
+            params.append(symbol)
+        if types:
+            types = [types] if isinstance(types, str) else list(types)
+            clauses.append(f"transactions.type IN ({','.join('?' * len(types))})")
+            params.extend(types)
+        if start is not None:
+            clauses.append(f"{table}.time_ms >= ?")
+            params.append(epoch_ms(start))
+        if end is not None:
+            clauses.append(f"{table}.time_ms < ?")
+            params.append(epoch_ms(end))
+        return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+    def transactions(self, account_hash=None, symbol=None, types=None, start=None, end=None):
+        """
+        Return stored transactions, oldest first.
+
+        Args:
+            account_hash (str, optional): Only this account's transactions.
+            symbol (str, optional): Only transactions whose first instrument leg is this symbol.
+            types (str or list, optional): Only these transaction types, e.g. 'TRADE'.
+            start (datetime or date, optional): Earliest transaction time (inclusive).
+            end (datetime or date, optional): Latest transaction time (exclusive).
+
+        Returns:
+            list: Transaction dicts.
+        """
+        where, params = self._filters(account_hash, symbol, types, start, end)
+        rows = self._connection().execute(f"SELECT data FROM transactions{where} ORDER BY time_ms, activity_id",
+                                          params)
+        return [json.loads(data) for data, in rows]
+
+    def fees_per_day(self, account_hash=None, start=None, end=None):
+        """
+        Return the fees paid per day (UTC), from the fee legs of stored transactions.
+
+        Args:
+            account_hash (str, optional): Only this account's fees.
+            start (datetime or date, optional): Earliest transaction time (inclusive).
+            end (datetime or date, optional): Latest transaction time (exclusive).
+
+        Returns:
+            dict: Total fees keyed by ISO date, in date order, for days with fees.
+        """
+        where, params = self._filters(account_hash, start=start, end=end)
+        rows = self._connection().execute(
+            f"SELECT day, SUM(fees) FROM transactions{where} GROUP BY day HAVING SUM(fees) != 0 ORDER BY day", params)
+        return {day: round(fees, 10) for day, fees in rows}
+
+    def realized_pnl(self, account_hash=None, symbol=None, end=None):
+        """
+        Return the realized profit and loss per symbol, matching closing trades against open lots FIFO.
+
+        Each leg's unit value is taken from its cost (so option multipliers are
+        included), falling back to its price. Fees are not deducted; see fees_per_day.
+
+        Args:
+            account_hash (str, optional): Only this account's trades. Lots are always matched per account.
+            symbol (str, optional): Only this symbol.
+            end (datetime or date, optional): Only trades before this time (exclusive).
+
+        Returns:
+            dict: Realized P&L keyed by symbol.
+        """
+        where, params = self._filters(account_hash, symbol, 'TRADE', end=end, table='legs')
+        rows = self._connection().execute(
+            "SELECT legs.account_hash, legs.symbol, legs.amount, legs.price, legs.cost FROM legs "
+            "JOIN transactions ON transactions.account_hash = legs.account_hash "
+            f"AND transactions.activity_id = legs.activity_id{where} "
+            "ORDER BY legs.time_ms, legs.activity_id", params)
+        lots = defaultdict(deque)  # (account hash, symbol) -> deque of [signed quantity, unit value]
+        realized = defaultdict(float)
+        for account_hash_, symbol_, amount, price, cost in rows:
+            if not amount:
+                continue
+            unit = -cost / amount if cost else price or 0.0
+            open_lots = lots[(account_hash_, symbol_)]
+            remaining = amount
+            while remaining and open_lots and (open_lots[0][0] > 0) != (remaining > 0):
+                lot = open_lots[0]
+                matched = min(abs(remaining), abs(lot[0]))
+                direction = 1 if lot[0] > 0 else -1  # long lots gain when sold higher, short lots when bought lower
+                realized[symbol_] += direction * matched * (unit - lot[1])
+                lot[0] -= direction * matched
+                remaining += direction * matched
+                if not lot[0]:
+                    open_lots.popleft()
+            if remaining:
+                open_lots.append([remaining, unit])
+        return {symbol_: round(value, 10) for symbol_, value in realized.items()}
@@ -11,7 +11,8 @@ setup(
     name='pythonic_schwab_api',
     version='1.0.0',
     packages=find_packages(),
-    install_requires=["requests", "python-dotenv", "websockets", "pandas", "tqdm"],
+    install_requires=["requests", "aiohttp", "python-dotenv", "websockets", "numpy", "pandas", "tqdm"],
+    extras_require={"fast-json": ["orjson"]},
     author='Cfomodz',
     description='This is an unofficial interface to make using the Schwab API easier.',
     long_description=long_description,
@@ -22,6 +23,6 @@ setup(
         'License :: OSI Approved :: MIT License',
         'Operating System :: OS Independent',
     ],
-    python_requires='>=3.7',
+    python_requires='>=3.9',
     license='MIT License'
 )
@@ -0,0 +1,35 @@
+"""
+Shared fixtures: a MockSchwabServer and a sandbox client wired to it.
+"""
+
+import os
+
+import pytest
+
+from pythonic_schwab_api import config
+from pythonic_schwab_api.api_client import APIClient
+from pythonic_schwab_api.mock_server import MockSchwabServer
+from pythonic_schwab_api.rate_limiter import RateLimiter
+from pythonic_schwab_api.token_store import JSONFileTokenStore
+
+
+@pytest.fixture(name="mock_server")
+def mock_server_fixture(monkeypatch):
+    """Start a MockSchwabServer on the sandbox addresses, without the websocket streamer."""
+    monkeypatch.setattr(config, 'SANDBOX', True)
+    with MockSchwabServer(stream_port=None) as server:
+        yield server
+
+
+@pytest.fixture(name="mock_client")
+def mock_client_fixture(mock_server, tmp_path):
+    """Return an APIClient with a valid token and no rate limit, talking to mock_server."""
+    token = mock_server.issue_token()
+    store = JSONFileTokenStore(os.path.join(tmp_path, "token.json"))
+    store.save(token)
+    client = APIClient("TEST", token_store=store, token=token)
+    client.config.rate_limit = {"requests": None}
+    client.config.endpoint_rate_limits = {}
+    client.rate_limiter = RateLimiter(client.config)
+    yield client
+    client.close()
@@ -0,0 +1,121 @@
+"""
+Tests for CandleStore and the incremental PriceHistory fetching built on it.
+"""
+
+import logging
+import os
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from pythonic_schwab_api.candle_store import CANDLE_DTYPE, CandleStore
+from pythonic_schwab_api.market_data import PriceHistory
+
+MINUTE = 60000
+
+
+def candles(minutes, price=None):
+    """Return API candle dicts for the given minute offsets, priced at the offset unless price is given."""
+    return [{'datetime': minute * MINUTE, 'open': minute if price is None else price, 'high': minute,
+             'low': minute, 'close': minute, 'volume': minute} for minute in minutes]
+
+
+@pytest.fixture(name="store")
+def store_fixture(tmp_path):
+    return CandleStore(str(tmp_path))
+
+
+def test_append_keeps_existing_rows_and_file(store):
+    store.write('AAPL', 'minute-1', candles(range(10)), 0, 9 * MINUTE)
+    data_path = os.path.join(store.root, 'minute-1', 'AAPL.candles')
+    inode = os.stat(data_path).st_ino
+    store.write('AAPL', 'minute-1', candles(range(10, 20)), 9 * MINUTE + 1, 19 * MINUTE)
+    assert os.stat(data_path).st_ino == inode  # appended, not swapped
+    assert store.read('AAPL', 'minute-1')['open'].tolist() == list(range(20))
+    assert store.coverage('AAPL', 'minute-1') == [[0, 19 * MINUTE]]
+    assert store.missing('AAPL', 'minute-1', 0, 25 * MINUTE) == [(19 * MINUTE + 1, 25 * MINUTE)]
+
+
+def test_overlapping_write_replaces_bars_and_keeps_later_rows(store):
+    store.write('AAPL', 'minute-1', candles(range(20)), 0, 19 * MINUTE)
+    before = store.read('AAPL', 'minute-1')
+    snapshot = before.copy()
+    store.write('AAPL', 'minute-1', candles([5, 7, 8], price=-1.0), 5 * MINUTE, 8 * MINUTE)
+    after = store.read('AAPL', 'minute-1')
+    assert after['datetime'].tolist() == [minute * MINUTE for minute in range(20)]
+    assert after['open'].tolist() == [-1.0 if minute in (5, 7, 8) else minute for minute in range(20)]
+    np.testing.assert_array_equal(before, snapshot)  # earlier reads keep their contents
+    assert store.coverage('AAPL', 'minute-1') == [[0, 19 * MINUTE]]
+
+
+def test_read_range_is_inclusive(store):
+    store.write('AAPL', 'minute-1', candles(range(10)), 0, 9 * MINUTE)
+    assert store.read('AAPL', 'minute-1', 3 * MINUTE, 6 * MINUTE)['open'].tolist() == [3, 4, 5, 6]
+    assert len(store.read('MSFT', 'minute-1')) == 0
+
+
+def test_interrupted_overlapping_write_leaves_truncated_consistent_state(store, monkeypatch):
+    store.write('AAPL', 'minute-1', candles(range(20)), 0, 19 * MINUTE)
+    replace = CandleStore._replace
+
+    def fail_on_data(path, data, mode='wb'):
+        if path.endswith('.candles'):
+            raise OSError("disk full")
+        return replace(path, data, mode)
+
+    monkeypatch.setattr(CandleStore, '_replace', staticmethod(fail_on_data))
+    with pytest.raises(OSError):
+        store.write('AAPL', 'minute-1', candles(range(10, 25)), 10 * MINUTE, 24 * MINUTE)
+    monkeypatch.undo()
+
+    # Only the interim metadata was written: the rows from the first new candle on are forgotten
+    assert store.read('AAPL', 'minute-1')['open'].tolist() == list(range(10))
+    assert store.coverage('AAPL', 'minute-1') == [[0, 10 * MINUTE - 1]]
+    assert store.missing('AAPL', 'minute-1', 0, 24 * MINUTE) == [(10 * MINUTE, 24 * MINUTE)]
+
+    store.write('AAPL', 'minute-1', candles(range(10, 25)), 10 * MINUTE, 24 * MINUTE)
+    assert store.read('AAPL', 'minute-1')['open'].tolist() == list(range(25))
+    assert store.coverage('AAPL', 'minute-1') == [[0, 24 * MINUTE]]
+
+
+def test_append_drops_bytes_of_an_interrupted_append(store):
+    store.write('AAPL', 'minute-1', candles(range(5)), 0, 4 * MINUTE)
+    data_path = os.path.join(store.root, 'minute-1', 'AAPL.candles')
+    with open(data_path, 'ab') as f:  # rows written before the metadata update was lost
+        f.write(np.zeros(3, dtype=CANDLE_DTYPE).tobytes()[:-7])
+    store.write('AAPL', 'minute-1', candles(range(5, 8)), 4 * MINUTE + 1, 7 * MINUTE)
+    assert store.read('AAPL', 'minute-1')['open'].tolist() == list(range(8))
+    assert os.path.getsize(data_path) == 8 * CANDLE_DTYPE.itemsize
+
+
+class HistoryClient:
+    """Stands in for APIClient, answering /pricehistory with one candle per minute of the requested range."""
+
+    def __init__(self):
+        self.config = SimpleNamespace(market_data_base_url='https://api.test/marketdata/v1')
+        self.logger = logging.getLogger(__name__)
+        self.requests = []
+
+    def make_request(self, _url, params=None):
+        self.requests.append((params['startDate'], params['endDate']))
+        first = -(-params['startDate'] // MINUTE)
+        return {'symbol': params['symbol'], 'candles': candles(range(first, params['endDate'] // MINUTE + 1))}
+
+
+def test_price_history_fetches_only_missing_ranges(store):
+    client = HistoryClient()
+    history = PriceHistory(client, store)
+    params = {'periodType': 'day', 'frequencyType': 'minute', 'frequency': 1}
+
+    first = history.by_symbol('AAPL', startDate=0, endDate=59 * MINUTE, **params)
+    assert client.requests == [(0, 59 * MINUTE)]
+    assert [candle['datetime'] for candle in first['candles']] == [minute * MINUTE for minute in range(60)]
+
+    history.by_symbol('AAPL', startDate=30 * MINUTE, endDate=59 * MINUTE, **params)
+    assert len(client.requests) == 1  # served from the store
+
+    extended = history.by_symbol('AAPL', startDate=30 * MINUTE, endDate=89 * MINUTE, **params)
+    assert client.requests[1:] == [(59 * MINUTE + 1, 89 * MINUTE)]
+    assert [candle['datetime'] for candle in extended['candles']] == [minute * MINUTE for minute in range(30, 90)]
+    assert store.coverage('AAPL', 'minute-1') == [[0, 89 * MINUTE]]
@@ -0,0 +1,73 @@
+"""
+Tests for the incremental /chains parser in pythonic_schwab_api.option_chain.
+"""
+
+import json
+
+import numpy as np
+import pytest
+
+from pythonic_schwab_api.mock_server import synthetic_chain
+from pythonic_schwab_api.option_chain import OptionChain, _StreamReader, flatten_chain, iter_chain_contracts
+
+CHUNK_SIZES = (1, 2, 3, 7, 64, 1 << 20)
+
+
+def chain_payload():
+    """Return a small chain with nested values, escapes, multi-byte text and exponent numbers mixed in."""
+    chain = synthetic_chain("SPX", expirations=3, strikes=5)
+    chain["underlying"] = {"symbol": "SPX", "description": 'S&P 500 "index" {cash} [spot] \\ é ☃', "close": -1.5e-3}
+    chain["intervals"] = [1, 2.5, None, True, "}]"]
+    contract = next(iter(next(iter(chain["callExpDateMap"].values())).values()))[0]
+    contract["optionDeliverablesList"] = [{"symbol": "SPX", "assetType": "INDEX", "deliverableUnits": 1e2}]
+    contract["description"] = 'brace } bracket ] quote " comma , colon : ünïcode'
+    contract["gamma"] = 12345.678e-10
+    return json.dumps(chain, ensure_ascii=False, indent=1).encode("utf-8")
+
+
+def chunked(raw, size):
+    """Split bytes into chunks of at most size bytes, cutting through multi-byte characters."""
+    return [raw[start:start + size] for start in range(0, len(raw), size)]
+
+
+@pytest.mark.parametrize("size", CHUNK_SIZES)
+def test_stream_reader_values_match_json_loads(size):
+    raw = json.dumps([0, -12.5e-3, "a\\\"}b", {"nested": [1, {"x": None}]}, 123456789, "é☃"],
+                     ensure_ascii=False).encode("utf-8")
+    reader = _StreamReader(chunked(raw, size))
+    reader.expect('[')
+    values = []
+    while reader.next_member(']'):
+        values.append(reader.value())
+    assert values == json.loads(raw)
+
+
+@pytest.mark.parametrize("size", CHUNK_SIZES)
+def test_iter_chain_contracts_matches_json_loads(size):
+    raw = chain_payload()
+    expected = json.loads(raw)
+    underlying = {}
+    contracts = list(iter_chain_contracts(chunked(raw, size), underlying))
+    assert contracts == list(flatten_chain(expected))
+    assert underlying == {name: value for name, value in expected.items()
+                          if name not in ("callExpDateMap", "putExpDateMap")}
+
+
+@pytest.mark.parametrize("size", CHUNK_SIZES)
+def test_from_stream_matches_from_response(size):
+    raw = chain_payload()
+    streamed = OptionChain.from_stream(chunked(raw, size))
+    loaded = OptionChain.from_response(json.loads(raw))
+    assert streamed.underlying == loaded.underlying
+    np.testing.assert_array_equal(streamed.symbols, loaded.symbols)
+    np.testing.assert_array_equal(streamed.expiration, loaded.expiration)
+    np.testing.assert_array_equal(streamed.is_call, loaded.is_call)
+    np.testing.assert_array_equal(streamed.in_the_money, loaded.in_the_money)
+    np.testing.assert_array_equal(streamed.numeric, loaded.numeric)
+    np.testing.assert_array_equal(streamed.times, loaded.times)
+
+
+def test_truncated_stream_raises():
+    raw = chain_payload()
+    with pytest.raises(ValueError):
+        list(iter_chain_contracts(chunked(raw[:len(raw) // 2], 7)))
@@ -0,0 +1,73 @@
+"""
+Tests for the token stores and the cross-process single-flight token refresh built on them.
+"""
+
+import multiprocessing
+import os
+
+import pytest
+
+from pythonic_schwab_api import config
+from pythonic_schwab_api.api_client import APIClient
+from pythonic_schwab_api.token_store import JSONFileTokenStore, SQLiteTokenStore
+
+BACKENDS = ('json', 'sqlite')
+
+
+def make_store(backend, directory):
+    """Build a token store of the given backend inside directory."""
+    if backend == 'json':
+        return JSONFileTokenStore(os.path.join(directory, "token.json"))
+    return SQLiteTokenStore(os.path.join(directory, "tokens.db"), "TEST")
+
+
+def refresh_in_process(backend, directory, stale_token, barrier, results):
+    """Run in a child process: refresh the shared token once the other process is ready too."""
+    config.SANDBOX = True
+    client = APIClient("TEST", token_store=make_store(backend, directory), lazy_auth=True, interactive=False)
+    client.config.background_token_refresh = False
+    try:
+        barrier.wait(30)
+        valid = client.refresh_access_token(stale_token=stale_token)
+        results.put((valid, client.token_info['access_token']))
+    except Exception as e:  # pylint: disable=broad-exception-caught
+        results.put((False, repr(e)))  # report instead of leaving the parent waiting
+    finally:
+        client.close()
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_save_load_and_version(backend, tmp_path):
+    store = make_store(backend, str(tmp_path))
+    assert store.load() is None
+    store.save({"access_token": "a", "refresh_token": "r"})
+    first = store.version()
+    assert store.load() == {"access_token": "a", "refresh_token": "r"}
+    store.save({"access_token": "b", "refresh_token": "r"})
+    assert store.version() != first
+    assert store.load()["access_token"] == "b"
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_two_processes_refresh_once(backend, mock_server, tmp_path):
+    expired = mock_server.issue_token(expires_in=-60)
+    make_store(backend, str(tmp_path)).save(expired)
+    requests_before = mock_server.request_count
+    issued_before = int(expired['access_token'].rsplit('-', 1)[1])
+
+    context = multiprocessing.get_context('spawn')
+    barrier, results = context.Barrier(2), context.Queue()
+    processes = [context.Process(target=refresh_in_process,
+                                 args=(backend, str(tmp_path), expired['access_token'], barrier, results))
+                 for _ in range(2)]
+    for process in processes:
+        process.start()
+    outcomes = [results.get(timeout=60) for _ in processes]
+    for process in processes:
+        process.join(30)
+        assert process.exitcode == 0
+
+    assert mock_server.request_count - requests_before == 1  # a single token request reached the server
+    expected_token = f"mock-access-{mock_server.seed}-{issued_before + 1}"
+    assert outcomes == [(True, expected_token), (True, expected_token)]
+    assert make_store(backend, str(tmp_path)).load()['access_token'] == expected_token
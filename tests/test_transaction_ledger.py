@@ -0,0 +1,172 @@
+"""
+Tests for TransactionLedger: watermarks, overlap refetches, upserts and FIFO lot matching.
+"""
+
+import datetime
+import logging
+import os
+from types import SimpleNamespace
+
+import pytest
+
+from pythonic_schwab_api.mock_server import synthetic_transactions
+from pythonic_schwab_api.transaction_ledger import TransactionLedger, parse_time
+
+UTC = datetime.timezone.utc
+NOW = datetime.datetime(2024, 3, 1, tzinfo=UTC)
+
+
+def trade(activity_id, day, symbol, amount, price, *, cost=None, fee=0.0, account="HASH-A"):
+    """Build a TRADE transaction with one instrument leg and an optional commission leg."""
+    cost = -amount * price if cost is None else cost
+    stamp = datetime.datetime(2024, 2, day, 15, 0, tzinfo=UTC) + datetime.timedelta(seconds=activity_id)
+    items = [{"instrument": {"assetType": "EQUITY", "symbol": symbol}, "amount": amount, "price": price,
+              "cost": cost, "positionEffect": "OPENING" if amount > 0 else "CLOSING"}]
+    if fee:
+        items.append({"instrument": {"assetType": "CURRENCY", "symbol": "CURRENCY_USD"}, "amount": 0.0,
+                      "cost": -fee, "feeType": "COMMISSION"})
+    return {"activityId": activity_id, "time": stamp.strftime("%Y-%m-%dT%H:%M:%S+0000"), "type": "TRADE",
+            "accountNumber": account, "netAmount": cost - fee, "transferItems": items}
+
+
+class FakeAccounts:
+    """Stands in for Accounts, serving transactions from memory and recording the requested ranges."""
+
+    def __init__(self, transactions=None):
+        self.transactions = transactions or {}  # account hash -> list of transactions
+        self.calls = []
+        self.fail_after = None  # raise after yielding this many transactions
+
+    def get_account_numbers(self):
+        return [{"accountNumber": f"N{index}", "hashValue": account_hash}
+                for index, account_hash in enumerate(self.transactions)]
+
+    def iter_transactions(self, start, until, account_hashes=None):
+        self.calls.append((start, until, tuple(account_hashes)))
+        if self.fail_after == 0:
+            raise ConnectionError("connection refused")
+        yielded = 0
+        for account_hash in account_hashes:
+            for transaction in self.transactions.get(account_hash, []):
+                if start <= parse_time(transaction["time"]) <= until:
+                    if self.fail_after is not None and yielded >= self.fail_after:
+                        raise ConnectionError("connection reset")
+                    yielded += 1
+                    yield account_hash, transaction
+
+
+@pytest.fixture(name="ledger")
+def ledger_fixture(tmp_path):
+    settings = {"path": os.path.join(tmp_path, "ledger.db"), "initial_days": 30, "overlap_days": 3}
+    client = SimpleNamespace(config=SimpleNamespace(accounts_base_url="https://api.test/trader/v1/accounts",
+                                                    transaction_ledger=settings),
+                             logger=logging.getLogger(__name__))
+    ledger = TransactionLedger(client)
+    ledger.accounts = FakeAccounts()
+    yield ledger
+    ledger.close()
+
+
+def test_first_sync_fetches_initial_days_and_sets_watermark(ledger):
+    ledger.accounts.transactions = {"HASH-A": [trade(1, 10, "AAPL", 10, 100.0)], "HASH-B": []}
+    assert ledger.sync(until=NOW) == {"HASH-A": 1, "HASH-B": 0}
+    assert ledger.accounts.calls == [(NOW - datetime.timedelta(days=30), NOW, ("HASH-A", "HASH-B"))]
+    assert ledger.watermark("HASH-A") == NOW
+    assert ledger.watermark("HASH-B") == NOW
+
+
+def test_next_sync_refetches_only_the_overlap(ledger):
+    ledger.accounts.transactions = {"HASH-A": [trade(1, 10, "AAPL", 10, 100.0)]}
+    ledger.sync(until=NOW)
+    later = NOW + datetime.timedelta(days=1)
+    ledger.sync(until=later)
+    assert ledger.accounts.calls[-1] == (NOW - datetime.timedelta(days=3), later, ("HASH-A",))
+    assert ledger.watermark("HASH-A") == later
+
+
+def test_reposted_activity_in_overlap_is_replaced_not_duplicated(ledger):
+    ledger.accounts.transactions = {"HASH-A": [trade(1, 28, "AAPL", 10, 100.0), trade(2, 28, "AAPL", -10, 110.0)]}
+    ledger.sync(until=NOW)
+    assert ledger.realized_pnl() == {"AAPL": 100.0}
+    # The closing trade is re-posted with a corrected price inside the overlap window
+    ledger.accounts.transactions["HASH-A"][1] = trade(2, 28, "AAPL", -10, 120.0)
+    ledger.sync(until=NOW + datetime.timedelta(days=1))
+    stored = ledger.transactions("HASH-A")
+    assert [transaction["activityId"] for transaction in stored] == [1, 2]
+    assert stored[1]["transferItems"][0]["price"] == 120.0
+    assert ledger.realized_pnl() == {"AAPL": 200.0}  # the old leg was replaced, not matched twice
+
+
+def test_watermark_does_not_advance_when_fetching_fails(ledger):
+    ledger.accounts.transactions = {"HASH-A": [trade(1, 10, "AAPL", 10, 100.0), trade(2, 11, "AAPL", 5, 101.0)]}
+    ledger.accounts.fail_after = 1
+    with pytest.raises(ConnectionError):
+        ledger.sync(until=NOW)
+    assert ledger.watermark("HASH-A") is None
+
+    ledger.accounts.fail_after = None
+    ledger.sync(until=NOW)
+    ledger.accounts.fail_after = 0
+    with pytest.raises(ConnectionError):
+        ledger.sync(until=NOW + datetime.timedelta(days=1))
+    assert ledger.watermark("HASH-A") == NOW
+    assert len(ledger.transactions("HASH-A")) == 2
+
+
+def test_sync_without_account_list_stores_nothing(ledger):
+    ledger.accounts.get_account_numbers = lambda: None
+    assert ledger.sync(until=NOW) == {}
+    assert not ledger.accounts.calls
+
+
+def test_fifo_long_lots_with_partial_closes(ledger):
+    ledger.store("HASH-A", [
+        trade(1, 1, "AAPL", 10, 100.0),
+        trade(2, 2, "AAPL", 10, 110.0),
+        trade(3, 3, "AAPL", -15, 120.0),  # closes the first lot and half the second: 10 * 20 + 5 * 10
+        trade(4, 4, "AAPL", -5, 90.0),  # closes the rest of the second lot: 5 * -20
+    ])
+    assert ledger.realized_pnl() == {"AAPL": 150.0}
+    assert ledger.realized_pnl(end=datetime.datetime(2024, 2, 4, tzinfo=UTC)) == {"AAPL": 250.0}
+
+
+def test_fifo_short_lots_and_position_flip(ledger):
+    ledger.store("HASH-A", [
+        trade(1, 1, "TSLA", -10, 50.0),  # open short
+        trade(2, 2, "TSLA", 4, 45.0),  # cover 4: 4 * 5
+        trade(3, 3, "TSLA", 10, 40.0),  # cover 6: 6 * 10, then open long 4 at 40
+        trade(4, 4, "TSLA", -4, 42.0),  # close the long: 4 * 2
+    ])
+    assert ledger.realized_pnl() == {"TSLA": 88.0}
+
+
+def test_fifo_uses_cost_for_multipliers_and_matches_per_account(ledger):
+    ledger.store("HASH-A", [trade(1, 1, "SPY_C", 1, 2.5, cost=-250.0), trade(2, 2, "SPY_C", -1, 4.0, cost=400.0)])
+    ledger.store("HASH-B", [trade(3, 1, "MSFT", 10, 300.0, account="HASH-B")])
+    ledger.store("HASH-A", [trade(4, 2, "MSFT", -10, 310.0)])  # a short in A, not a close of B's lot
+    assert ledger.realized_pnl() == {"SPY_C": 150.0}
+    assert ledger.realized_pnl(account_hash="HASH-A", symbol="SPY_C") == {"SPY_C": 150.0}
+
+
+def test_fees_per_day(ledger):
+    ledger.store("HASH-A", [trade(1, 1, "AAPL", 10, 100.0, fee=0.65), trade(2, 1, "AAPL", -10, 101.0, fee=1.0),
+                            trade(3, 2, "AAPL", 10, 100.0)])
+    assert ledger.fees_per_day() == {"2024-02-01": 1.65}
+
+
+def test_sync_against_mock_server(mock_server, mock_client, tmp_path):
+    ledger = TransactionLedger(mock_client, path=os.path.join(tmp_path, "ledger.db"), initial_days=60)
+    until = datetime.datetime.now(UTC).replace(microsecond=0)
+    written = ledger.sync(until=until)
+    assert set(written) == set(mock_server.accounts)
+    for account_hash, account_number in mock_server.accounts.items():
+        expected = synthetic_transactions(account_number, until - datetime.timedelta(days=60), until, mock_server.seed)
+        assert [t["activityId"] for t in ledger.transactions(account_hash)] == \
+            [t["activityId"] for t in sorted(expected, key=lambda t: (t["time"], t["activityId"]))]
+        assert ledger.watermark(account_hash) == until
+
+    requests_before = mock_server.request_count
+    ledger.sync(until=until + datetime.timedelta(hours=1))
+    assert mock_server.request_count - requests_before == 1 + len(mock_server.accounts)  # account list + one window each
+    assert sum(len(ledger.transactions(account_hash)) for account_hash in mock_server.accounts) == sum(written.values())
+    ledger.close()